@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Disk use of finished sessions before and after archiving, and the cost of
+reading an archived session.
+
+Builds a population of COMPLETED sessions plus one large session whose
+sources roll into several segments, counts bytes (allocated blocks) and inodes
+under RESEARCH/, archives everything with archive_completed, counts again, and
+times get_status, get_source and a full iter_sources on the large session
+before and after.
+
+Usage: python benchmarks/bench_archive.py [--sessions 500]
+           [--sources-per-session 200] [--large 50000] [--segment-mb 2]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "skills/deep-research-main/scripts")
+)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_ingest import make_source  # noqa: E402
+from orchestrator import ResearchOrchestrator, ResearchState  # noqa: E402
+from source_log import DEFAULT_CODEC  # noqa: E402
+from synthetic import BATCH_SIZE, generate_session  # noqa: E402
+
+
+def _usage(base_path: Path) -> Dict[str, int]:
+    disk = inodes = 0
+    for root, dirs, names in os.walk(base_path):
+        inodes += len(dirs) + len(names)
+        for name in names:
+            disk += os.stat(os.path.join(root, name)).st_blocks * 512
+    return {"disk_bytes": disk, "inodes": inodes}
+
+
+def _timed(run: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start
+
+
+def _large_session(base_path: Path, sources: int, segment_bytes: int) -> str:
+    state = ResearchState(str(base_path))
+    session_id = state.create_session(f"Large {sources} sources")
+    state._source_log().segment_bytes = segment_bytes
+    for start in range(0, sources, BATCH_SIZE):
+        batch = range(start, min(sources, start + BATCH_SIZE))
+        state.add_sources((make_source(i) for i in batch), dedup=False)
+    state.mark_completed()
+    state.close()
+    return session_id
+
+
+def _reads(base_path: Path, session_id: str, probe: str) -> Dict[str, float]:
+    orchestrator = ResearchOrchestrator(str(base_path))
+    _, status_seconds = _timed(lambda: orchestrator.get_status(session_id))
+    state = ResearchState(str(base_path))
+    _, load_seconds = _timed(lambda: state.load_session(session_id))
+    _, get_seconds = _timed(lambda: state.get_source(probe))
+    count, iter_seconds = _timed(lambda: sum(1 for _ in state.iter_sources()))
+    state.close()
+    return {
+        "get_status_ms": round(status_seconds * 1000, 2),
+        "load_session_ms": round(load_seconds * 1000, 2),
+        "get_source_ms": round(get_seconds * 1000, 2),
+        "iter_sources_seconds": round(iter_seconds, 3),
+        "iterated": count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--sources-per-session", type=int, default=200)
+    parser.add_argument("--large", type=int, default=50_000)
+    parser.add_argument("--segment-mb", type=float, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = Path(tmp)
+        for i in range(args.sessions):
+            generate_session(
+                base_path,
+                f"Finished {i}",
+                args.sources_per_session,
+                offset=i * args.sources_per_session,
+                completed=True,
+            )
+        large = _large_session(base_path, args.large, int(args.segment_mb * 2**20))
+        probe = make_source(args.large // 2)["id"]
+
+        before = _usage(base_path)
+        plain_reads = _reads(base_path, large, probe)
+        results, archive_seconds = _timed(
+            lambda: ResearchOrchestrator(str(base_path)).archive_completed()
+        )
+        after = _usage(base_path)
+        archived_reads = _reads(base_path, large, probe)
+
+    print(
+        json.dumps(
+            {
+                "sessions": args.sessions + 1,
+                "sources_per_session": args.sources_per_session,
+                "large_session_sources": args.large,
+                "codec": DEFAULT_CODEC,
+                "archived": sum(1 for r in results if r.get("status") == "archived"),
+                "archive_seconds": round(archive_seconds, 2),
+                "before": before,
+                "after": after,
+                "disk_ratio": round(before["disk_bytes"] / after["disk_bytes"], 1),
+                "inode_ratio": round(before["inodes"] / after["inodes"], 1),
+                "large_session_reads": {
+                    "directory": plain_reads,
+                    "archive": archived_reads,
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
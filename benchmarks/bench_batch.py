@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Batch runner throughput against worker processes, under one global budget.
+
+Writes `--specs` copies of examples/*.json (unique titles) to a temp folder and
+runs them with batch_runner.run_batch at each worker count. Agents are
+simulated: each task sleeps `--agent-ms` and fetches `--fetches-per-task`
+distinct URLs through the session's FetchCache, whose network fetch sleeps
+`--fetch-ms`. The budget peaks show that no worker count pushed more agents or
+fetches upstream than the budget allows.
+
+Usage: python benchmarks/bench_batch.py [--specs 24] [--workers 1,2,4,8]
+           [--agents 16] [--fetches 8]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+SKILL = Path(__file__).resolve().parents[1] / "skills/deep-research-main"
+sys.path.insert(0, str(SKILL / "scripts"))
+
+from batch_runner import run_batch  # noqa: E402
+from pipelines import AgentTask  # noqa: E402
+from scheduler import AgentExecutor  # noqa: E402
+
+AGENT_SECONDS = 0.05
+FETCH_SECONDS = 0.02
+FETCHES_PER_TASK = 2
+
+
+def slow_fetcher(url: str) -> Tuple[bytes, Optional[str]]:
+    time.sleep(FETCH_SECONDS)
+    return f"<html>{url}</html>".encode("utf-8"), "text/html"
+
+
+class SimulatedExecutor(AgentExecutor):
+    def __init__(self, fetch_cache):
+        self.fetch_cache = fetch_cache
+
+    async def run(self, task: AgentTask) -> str:
+        await asyncio.sleep(AGENT_SECONDS)
+        for i in range(FETCHES_PER_TASK):
+            url = f"https://example.org/{abs(hash(task.prompt))}/{i}"
+            await asyncio.to_thread(self.fetch_cache.fetch, url)
+        return f"# {task.description}"
+
+
+def _write_specs(target: Path, count: int):
+    examples = sorted((SKILL / "examples").glob("*.json"))
+    for i in range(count):
+        spec = json.loads(examples[i % len(examples)].read_text(encoding="utf-8"))
+        spec["task"]["title"] = f"{spec['task']['title'][:80]} #{i}"
+        (target / f"{i:03d}.json").write_text(json.dumps(spec), encoding="utf-8")
+
+
+def main():
+    global AGENT_SECONDS, FETCH_SECONDS, FETCHES_PER_TASK
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--specs", type=int, default=24)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--agents", type=int, default=16)
+    parser.add_argument("--fetches", type=int, default=8)
+    parser.add_argument("--max-parallel-agents", type=int, default=5)
+    parser.add_argument("--agent-ms", type=float, default=50)
+    parser.add_argument("--fetch-ms", type=float, default=20)
+    parser.add_argument("--fetches-per-task", type=int, default=2)
+    args = parser.parse_args()
+    # Module globals: forked workers inherit them.
+    AGENT_SECONDS = args.agent_ms / 1000
+    FETCH_SECONDS = args.fetch_ms / 1000
+    FETCHES_PER_TASK = args.fetches_per_task
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        spec_dir = Path(tmp) / "specs"
+        spec_dir.mkdir()
+        _write_specs(spec_dir, args.specs)
+        for workers in (int(w) for w in args.workers.split(",")):
+            start = time.perf_counter()
+            report = run_batch(
+                spec_dir,
+                SimulatedExecutor,
+                Path(tmp) / f"RESEARCH_{workers}",
+                workers=workers,
+                agents=args.agents,
+                fetches=args.fetches,
+                config={"max_parallel_agents": args.max_parallel_agents},
+                fetcher=slow_fetcher,
+            )
+            seconds = time.perf_counter() - start
+            tasks = report["totals"]["tasks"].get("completed", 0)
+            runs.append(
+                {
+                    "workers": workers,
+                    "seconds": round(seconds, 2),
+                    "sessions_completed": report["totals"]["completed"],
+                    "tasks_per_second": round(tasks / seconds, 1),
+                    "agents": report["budget"]["agents"],
+                    "fetches": report["budget"]["fetches"],
+                }
+            )
+
+    print(
+        json.dumps(
+            {
+                "specs": args.specs,
+                "agent_budget": args.agents,
+                "fetch_budget": args.fetches,
+                "max_parallel_agents": args.max_parallel_agents,
+                "runs": runs,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
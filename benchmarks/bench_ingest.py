@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Source ingestion throughput: per-source add_source vs. batched add_sources.
+
+Usage: python benchmarks/bench_ingest.py [--sources 10000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "skills/deep-research-main/scripts")
+)
+
+from orchestrator import ResearchState  # noqa: E402
+
+
+SYLLABLES = "ka lo mi re su ta ve xo ni pa de gu".split()
+WORDS = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+
+
+def make_source(i: int) -> dict:
+    rng = random.Random(i)
+    return {
+        "id": f"src_{i:06d}",
+        "url": f"https://example{i % 97}.com/article/{i}",
+        "title": f"Synthetic source {i}",
+        "author": f"Author {i % 311}",
+        "date": f"20{20 + i % 6}-0{1 + i % 9}-15",
+        "domain": f"example{i % 97}.com",
+        "type": ["academic", "news", "official", "blog"][i % 4],
+        "quality_rating": "ABCDE"[i % 5],
+        "snippet": " ".join(rng.choice(WORDS) for _ in range(24)),
+        "subtopic": f"Subtopic {i % 5}",
+        "claims": [f"claim {i}"],
+    }
+
+
+def bench(label: str, count: int, ingest) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        state = ResearchState(tmp)
+        state.create_session("Ingest benchmark")
+        sources = [make_source(i) for i in range(count)]
+        start = time.perf_counter()
+        ingest(state, sources)
+        elapsed = time.perf_counter() - start
+        assert state.state["sources_count"] == count
+    return {
+        "case": label,
+        "sources": count,
+        "seconds": round(elapsed, 4),
+        "sources_per_sec": round(count / elapsed, 1) if elapsed else None,
+    }
+
+
+def ingest_one_by_one(state: ResearchState, sources):
+    for source in sources:
+        state.add_source(source)
+
+
+def ingest_batched(state: ResearchState, sources):
+    state.add_sources(sources)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=10000)
+    args = parser.parse_args()
+
+    results = [
+        bench("add_source", args.sources, ingest_one_by_one),
+        bench("add_sources", args.sources, ingest_batched),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
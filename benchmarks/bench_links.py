@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Link checker against local stand-in servers: sequential vs. concurrent checks.
+
+Each server plays one domain and answers by path prefix: /ok (200), /missing
+(404), /limited (429 with Retry-After: 0 on the first request, then 200),
+/slow (no answer before the client timeout), /nohead (405 for HEAD, 200 for
+GET) and /moved (301 to /ok). The same URL list is then checked again to show
+the verdict cache.
+
+Usage: python benchmarks/bench_links.py [--domains 8] [--urls 400]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "skills/deep-research-main/scripts")
+)
+
+from link_checker import LinkChecker  # noqa: E402
+
+PATHS = ("ok", "ok", "ok", "ok", "missing", "limited", "nohead", "moved", "slow")
+LATENCY = 0.01
+SLOW_SECONDS = 2.0
+EXPECTED = {
+    "ok": "ok",
+    "missing": "broken",
+    "limited": "ok",
+    "nohead": "ok",
+    "moved": "ok",
+    "slow": "timeout",
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    limited_seen = set()
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, headers: dict = None, body: bytes = b""):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    def _handle(self):
+        time.sleep(LATENCY)
+        kind = self.path.strip("/").split("/")[0]
+        if kind == "ok":
+            self._reply(200, body=b"hello")
+        elif kind == "missing":
+            self._reply(404)
+        elif kind == "limited":
+            with self.lock:
+                first = self.path not in self.limited_seen
+                self.limited_seen.add(self.path)
+            if first:
+                self._reply(429, {"Retry-After": "0"})
+            else:
+                self._reply(200)
+        elif kind == "nohead" and self.command == "HEAD":
+            self._reply(405)
+        elif kind == "nohead":
+            self._reply(200, body=b"hello")
+        elif kind == "moved":
+            self._reply(301, {"Location": "/ok" + self.path[len("/moved"):]})
+        elif kind == "slow":
+            time.sleep(SLOW_SECONDS)
+            self._reply(200)
+        else:
+            self._reply(404)
+
+    do_HEAD = _handle
+    do_GET = _handle
+
+
+def start_servers(count: int):
+    servers = []
+    for _ in range(count):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def bench(label: str, urls, base_path: Path, **kwargs) -> dict:
+    checker = LinkChecker(base_path, timeout=0.5, retries=1, **kwargs)
+    start = time.perf_counter()
+    results = checker.check_urls(urls)
+    elapsed = time.perf_counter() - start
+    checker.close()
+
+    wrong = [
+        url
+        for url, result in results.items()
+        if result.status != EXPECTED[url.split("/")[3]]
+    ]
+    counts = {}
+    for result in results.values():
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return {
+        "case": label,
+        "urls": len(urls),
+        "seconds": round(elapsed, 3),
+        "urls_per_sec": round(len(urls) / elapsed, 1) if elapsed else None,
+        "by_status": counts,
+        "unexpected": len(wrong),
+        **checker.stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--domains", type=int, default=8)
+    parser.add_argument("--urls", type=int, default=400)
+    args = parser.parse_args()
+
+    StandInHandler.limited_seen = set()
+    servers = start_servers(args.domains)
+    hosts = [f"http://127.0.0.1:{server.server_address[1]}" for server in servers]
+    urls = [
+        f"{hosts[i % len(hosts)]}/{PATHS[i % len(PATHS)]}/{i}"
+        for i in range(args.urls)
+    ]
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        results.append(
+            bench(
+                "sequential",
+                urls,
+                Path(tmp) / "a",
+                max_connections=1,
+                max_per_host=1,
+                requests_per_second=0,
+            )
+        )
+        StandInHandler.limited_seen = set()
+        results.append(bench("concurrent", urls, Path(tmp) / "b"))
+        results.append(bench("concurrent, cached", urls, Path(tmp) / "b"))
+
+    for server in servers:
+        server.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
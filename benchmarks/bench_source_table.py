@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Source representation memory and counting time: list of dicts (what
+get_sources returns) vs. a list of __slots__ Source records vs. a SourceTable.
+
+Memory is the tracemalloc footprint of holding all sources decoded the way the
+store decodes them (json.loads per record). Counting is Phase 4's
+source_quality_report, per-subtopic counts at min_quality B and per-subtopic
+domain diversity, by dict iteration vs. the table's code counts.
+
+Usage: python benchmarks/bench_source_table.py [--sources 100000]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "skills/deep-research-main/scripts")
+)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_ingest import make_source  # noqa: E402
+from orchestrator import ResearchState  # noqa: E402
+from source_store import quality_rank, source_subtopics  # noqa: E402
+from source_table import Source, SourceTable, np  # noqa: E402
+from synthetic import generate_session  # noqa: E402
+from triangulation import QUALITY_GRADES  # noqa: E402
+
+
+def _footprint(build: Callable[[], Any]) -> Tuple[Any, int, float]:
+    """(result, bytes still allocated by it, build seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def _timed(run: Callable[[], Any], repeat: int = 3) -> Tuple[Any, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def dict_quality_report(sources: List[Dict]) -> Dict[str, int]:
+    report = {f"{grade}_rated": 0 for grade in QUALITY_GRADES}
+    for source in sources:
+        grade = (source.get("quality_rating") or "").strip().upper()[:1]
+        key = f"{grade}_rated" if grade and grade in QUALITY_GRADES else "unrated"
+        report[key] = report.get(key, 0) + 1
+    return report
+
+
+def dict_subtopic_counts(sources: List[Dict], min_quality: str) -> Dict[str, int]:
+    limit = quality_rank(min_quality)
+    counts: Counter = Counter()
+    for source in sources:
+        if quality_rank(source.get("quality_rating")) <= limit:
+            counts.update(source_subtopics(source))
+    return dict(counts)
+
+
+def dict_domain_diversity(sources: List[Dict]) -> Dict[str, Dict[str, Any]]:
+    per_subtopic: Dict[str, Counter] = {}
+    for source in sources:
+        domain = source.get("domain") or ""
+        for subtopic in source_subtopics(source):
+            per_subtopic.setdefault(subtopic, Counter())[domain] += 1
+    report = {}
+    for subtopic, domains in per_subtopic.items():
+        total = sum(domains.values())
+        top, top_count = min(domains.items(), key=lambda item: (-item[1], item[0]))
+        report[subtopic] = {
+            "sources": total,
+            "domains": len(domains),
+            "top_domain": top,
+            "top_domain_share": round(top_count / total, 3),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=100_000)
+    args = parser.parse_args()
+
+    lines = [json.dumps(make_source(i)) for i in range(args.sources)]
+    dicts, dict_bytes, dict_seconds = _footprint(
+        lambda: [json.loads(line) for line in lines]
+    )
+    _, record_bytes, record_seconds = _footprint(
+        lambda: [Source.from_dict(json.loads(line)) for line in lines]
+    )
+    table, table_bytes, table_seconds = _footprint(
+        lambda: SourceTable.from_sources(json.loads(line) for line in lines)
+    )
+    del lines
+
+    counting = []
+    for label, by_dict, by_table in (
+        ("quality_report", dict_quality_report, SourceTable.quality_report),
+        (
+            "subtopic_counts[min_quality=B]",
+            lambda s: dict_subtopic_counts(s, "B"),
+            lambda t: t.subtopic_counts("B"),
+        ),
+        ("domain_diversity", dict_domain_diversity, SourceTable.domain_diversity),
+    ):
+        expected, dict_time = _timed(lambda: by_dict(dicts))
+        actual, table_time = _timed(lambda: by_table(table))
+        assert actual == expected, label
+        counting.append(
+            {
+                "case": label,
+                "dicts_ms": round(dict_time * 1000, 2),
+                "table_ms": round(table_time * 1000, 2),
+                "speedup": round(dict_time / table_time, 1) if table_time else None,
+            }
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = ResearchState(tmp)
+        state.load_session(generate_session(Path(tmp), "Table", args.sources))
+        _, get_sources_seconds = _timed(state.get_sources, repeat=1)
+        _, from_store_seconds = _timed(state.source_table, repeat=1)
+        state.close()
+
+    mb = 2**20
+    print(
+        json.dumps(
+            {
+                "sources": args.sources,
+                "numpy": np is not None,
+                "memory": [
+                    {
+                        "case": label,
+                        "mb": round(size / mb, 1),
+                        "bytes_per_source": round(size / args.sources),
+                        "build_seconds": round(seconds, 3),
+                    }
+                    for label, size, seconds in (
+                        ("list of dicts", dict_bytes, dict_seconds),
+                        ("list of Source", record_bytes, record_seconds),
+                        ("SourceTable", table_bytes, table_seconds),
+                    )
+                ],
+                "counting": counting,
+                "from_store": {
+                    "get_sources_seconds": round(get_sources_seconds, 3),
+                    "source_table_seconds": round(from_store_seconds, 3),
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Orchestrator/pipelines benchmark suite.
+
+Times create_session, add_source, get_sources, list_sessions, _save_state,
+complete_phase and create_agent_tasks against sessions built by synthetic.py.
+Every case runs in a fresh process and the peak RSS mark is reset before the
+timed part where the kernel allows it (/proc/self/clear_refs), and bytes
+written are the bytes passed to write() during the timed part (/proc/self/io;
+null where that is unavailable). Results are JSON so two commits can be
+compared with --compare.
+
+Usage: python benchmarks/bench_suite.py [--sizes 1000,10000] [--sessions 2000]
+           [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "skills/deep-research-main/scripts")
+)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_ingest import make_source  # noqa: E402
+from orchestrator import ResearchOrchestrator, ResearchState  # noqa: E402
+from pipelines import create_agent_tasks  # noqa: E402
+from synthetic import (  # noqa: E402
+    generate_sessions,
+    generate_sized_sessions,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+REGRESSION_RATIO = 1.2
+
+# A case prepares its inputs (untimed) and returns (label, ops, timed callable).
+Case = Callable[..., Tuple[str, int, Callable[[], Any]]]
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS mark (Linux); False where unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_bytes() -> int:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _bytes_written() -> Optional[int]:
+    try:
+        with open("/proc/self/io", "r") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _loaded(base_path: str, session_id: str) -> ResearchState:
+    state = ResearchState(base_path)
+    state.load_session(session_id)
+    return state
+
+
+def case_create_session(base_path: str, count: int = 50):
+    target = Path(base_path) / "_create_session"
+
+    def run():
+        state = ResearchState(str(target))
+        for index in range(count):
+            state.create_session(f"Create session {index:04d}")
+
+    return "create_session", count, run
+
+
+def case_add_source(base_path: str, session_id: str, size: int, count: int = 200):
+    state = _loaded(base_path, session_id)
+    sources = [make_source(size + i) for i in range(count)]
+    for source in sources:
+        del source["id"]
+    state.get_source("src_000000")  # open the store outside the timed part
+
+    def run():
+        for source in sources:
+            state.add_source(source)
+
+    return "add_source", count, run
+
+
+def case_get_sources(base_path: str, session_id: str, size: int):
+    state = _loaded(base_path, session_id)
+
+    def run():
+        assert len(state.get_sources()) >= size
+
+    return "get_sources", 1, run
+
+
+def case_save_state(base_path: str, session_id: str, size: int, count: int = 20):
+    state = _loaded(base_path, session_id)
+
+    def run():
+        for _ in range(count):
+            state._save_state()
+
+    return "_save_state", count, run
+
+
+def case_complete_phase(base_path: str, session_id: str, size: int):
+    state = _loaded(base_path, session_id)
+
+    def run():
+        for phase in range(1, 8):
+            state.start_phase(phase)
+            state.complete_phase(phase, {f"phase_{phase}": "done"})
+
+    return "complete_phase", 7, run
+
+
+def case_list_sessions(base_path: str, limit: Optional[int] = None):
+    orchestrator = ResearchOrchestrator(base_path)
+
+    def run():
+        assert orchestrator.list_sessions(limit=limit)
+
+    label = "list_sessions" if limit is None else f"list_sessions[limit={limit}]"
+    return label, 1, run
+
+
+def case_create_agent_tasks(subtopics: int = 50, count: int = 100):
+    names = [f"Subtopic {i}" for i in range(subtopics)]
+
+    def run():
+        for _ in range(count):
+            create_agent_tasks(names, "Synthetic benchmark topic")
+
+    return f"create_agent_tasks[{subtopics} subtopics]", count, run
+
+
+def measure(case: Case, *args) -> Dict[str, Any]:
+    """Run in a child process: set the case up, then time only its callable."""
+    label, ops, run = case(*args)
+    rss_reset = _reset_peak_rss()
+    rss_before = _peak_rss_bytes()
+    written_before = _bytes_written()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    written_after = _bytes_written()
+    peak = _peak_rss_bytes()
+
+    written = None
+    if written_before is not None and written_after is not None:
+        written = written_after - written_before
+    return {
+        "case": label,
+        "ops": ops,
+        "seconds": round(elapsed, 4),
+        "ms_per_op": round(elapsed * 1000 / ops, 3),
+        "peak_rss_mb": round(peak / 2**20, 1),
+        "rss_growth_mb": round((peak - rss_before) / 2**20, 1),
+        "rss_peak_reset": rss_reset,
+        "bytes_written": written,
+        "bytes_per_op": round(written / ops) if written is not None else None,
+    }
+
+
+def run_isolated(case: Case, *args) -> Dict[str, Any]:
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(measure, case, *args).result()
+
+
+def _commit_id() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes: List[int], sessions: int, work_dir: str) -> Dict[str, Any]:
+    sized_base = str(Path(work_dir) / "sized")
+    listing_base = str(Path(work_dir) / "listing")
+    sized = generate_sized_sessions(Path(sized_base), sizes)
+    generate_sessions(Path(listing_base), sessions)
+
+    results = [
+        run_isolated(case_create_session, str(Path(work_dir) / "fresh")),
+        run_isolated(case_create_agent_tasks),
+        {**run_isolated(case_list_sessions, listing_base), "sessions": sessions},
+        {**run_isolated(case_list_sessions, listing_base, 50), "sessions": sessions},
+    ]
+    for size in sizes:
+        # add_source mutates the session, so it runs last.
+        for case in (
+            case_get_sources,
+            case_save_state,
+            case_complete_phase,
+            case_add_source,
+        ):
+            result = run_isolated(case, sized_base, sized[size], size)
+            results.append({**result, "sources": size})
+
+    return {
+        "meta": {
+            "commit": _commit_id(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "sessions": sessions,
+        },
+        "results": results,
+    }
+
+
+def _case_key(result: Dict[str, Any]) -> Tuple[str, Any]:
+    return result["case"], result.get("sources")
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict]:
+    """ms_per_op ratio (current / baseline) per case present in both runs."""
+    previous = {_case_key(result): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        old = previous.get(_case_key(result))
+        if old is None or not old["ms_per_op"]:
+            continue
+        ratio = result["ms_per_op"] / old["ms_per_op"]
+        rows.append(
+            {
+                "case": result["case"],
+                "sources": result.get("sources"),
+                "baseline_ms_per_op": old["ms_per_op"],
+                "ms_per_op": result["ms_per_op"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > REGRESSION_RATIO,
+            }
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--work-dir", help="Keep generated sessions here")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare with")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    if args.work_dir:
+        report = run_suite(sizes, args.sessions, args.work_dir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run_suite(sizes, args.sessions, tmp)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["comparison"] = compare(json.load(f), report)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    print(output)
+    if any(row["regression"] for row in report.get("comparison", [])):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
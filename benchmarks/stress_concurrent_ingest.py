@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Stress test: many processes ingesting into one session at the same time.
+
+Each worker loads the same session and mixes batched add_sources calls with
+single add_source calls and artifact saves. Afterwards the session must have
+lost no sources_count increments, no torn JSONL lines, and agree across
+state.json + journal, the sources.jsonl segments, sources.idx and sources.db.
+
+Usage: python benchmarks/stress_concurrent_ingest.py [--workers 8] [--per-worker 500]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "skills/deep-research-main/scripts"
+sys.path.insert(0, str(SCRIPTS))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_ingest import make_source  # noqa: E402
+from orchestrator import ResearchState  # noqa: E402
+
+
+def worker(args):
+    base_path, session_id, worker_id, count = args
+    state = ResearchState(base_path, snapshot_interval=25)
+    state.load_session(session_id)
+    start = worker_id * count
+    sources = [make_source(i) for i in range(start, start + count)]
+    for source in sources:
+        source.pop("id")
+
+    half = count // 2
+    state.add_sources(sources[:half], flush_every=37)
+    for i, source in enumerate(sources[half:]):
+        state.add_source(source)
+        if i % 50 == 0:
+            state.save_artifact(f"worker_{worker_id}_{i}.md", "x", "agent_results")
+    return count
+
+
+def verify(
+    base_path: str, session_id: str, expected: int, expected_artifacts: int
+) -> dict:
+    state = ResearchState(base_path)
+    state.load_session(session_id)
+    ids = [record["id"] for record in state._source_log().records()]
+
+    return {
+        "expected": expected,
+        "sources_count": state.state["sources_count"],
+        "jsonl_lines": len(ids),
+        "unique_ids": len(set(ids)),
+        "indexed_ids": len(state._source_log()),
+        "store_rows": state._source_store().count(),
+        "artifacts": len(state.state["artifacts"]),
+        "ok": len(state.state["artifacts"]) == expected_artifacts
+        and (
+            state.state["sources_count"]
+            == len(ids)
+            == len(set(ids))
+            == len(state._source_log())
+            == state._source_store().count()
+            == expected
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--per-worker", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = ResearchState(tmp)
+        session_id = state.create_session("Concurrent ingest stress")
+
+        start = time.perf_counter()
+        with Pool(args.workers) as pool:
+            total = sum(
+                pool.map(
+                    worker,
+                    [
+                        (tmp, session_id, worker_id, args.per_worker)
+                        for worker_id in range(args.workers)
+                    ],
+                )
+            )
+        elapsed = time.perf_counter() - start
+
+        artifacts_per_worker = len(range(0, args.per_worker - args.per_worker // 2, 50))
+        result = verify(tmp, session_id, total, args.workers * artifacts_per_worker)
+        result["workers"] = args.workers
+        result["seconds"] = round(elapsed, 3)
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
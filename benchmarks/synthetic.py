@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Synthetic session generator for the benchmark suite.
+
+Builds research sessions through the public ResearchState API so their layout
+matches real sessions: one session per requested source count (1k/10k/100k/1M)
+and a population of small sessions for session listing. Generation is not
+timed; the suite in bench_suite.py times operations against the result.
+
+Usage: python benchmarks/synthetic.py RESEARCH_BENCH [--sizes 1000,10000]
+           [--sessions 2000] [--sources-per-session 20]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "skills/deep-research-main/scripts")
+)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_ingest import make_source  # noqa: E402
+from orchestrator import ResearchState  # noqa: E402
+
+BATCH_SIZE = 10_000
+SUBTOPICS = [f"Subtopic {i}" for i in range(5)]
+
+
+def sized_topic(size: int) -> str:
+    return f"Synthetic {size} sources"
+
+
+def generate_session(
+    base_path: Path, topic: str, sources: int, offset: int = 0, completed: bool = False
+) -> str:
+    """Create one session holding `sources` synthetic sources; returns its id."""
+    state = ResearchState(str(base_path))
+    session_id = state.create_session(topic)
+    state.set_plan({"subtopics": SUBTOPICS})
+    for start in range(0, sources, BATCH_SIZE):
+        batch = range(offset + start, offset + min(sources, start + BATCH_SIZE))
+        # Synthetic sources are distinct by construction; skip dedup for speed.
+        state.add_sources((make_source(i) for i in batch), dedup=False)
+    if completed:
+        state.mark_completed()
+    state.close()
+    return session_id
+
+
+def generate_sized_sessions(base_path: Path, sizes: List[int]) -> Dict[int, str]:
+    return {
+        size: generate_session(base_path, sized_topic(size), size) for size in sizes
+    }
+
+
+def generate_sessions(
+    base_path: Path, count: int, sources_per_session: int = 20
+) -> List[str]:
+    """A catalog population: every third session is marked completed."""
+    return [
+        generate_session(
+            base_path,
+            f"Synthetic session {index:06d}",
+            sources_per_session,
+            offset=index * sources_per_session,
+            completed=index % 3 == 0,
+        )
+        for index in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("base_path")
+    parser.add_argument("--sizes", default="1000,10000")
+    parser.add_argument("--sessions", type=int, default=0)
+    parser.add_argument("--sources-per-session", type=int, default=20)
+    args = parser.parse_args()
+
+    base_path = Path(args.base_path)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    start = time.perf_counter()
+    sized = generate_sized_sessions(base_path, sizes)
+    population = generate_sessions(base_path, args.sessions, args.sources_per_session)
+    print(
+        json.dumps(
+            {
+                "base_path": str(base_path),
+                "sized_sessions": sized,
+                "sessions": len(population),
+                "seconds": round(time.perf_counter() - start, 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,683 @@
+#!/usr/bin/env python3
+"""
+Batch Runner - drives a directory of query specs (examples/*.json, validated
+against references/query_schema.json) as research sessions in a process pool.
+
+Each spec becomes one session: Phase 1 records the spec as requirements,
+Phase 2 plans one subtopic per secondary question, and Phase 3 runs the agent
+tasks through AgentScheduler. Sessions then wait at Phase 4 like any other.
+
+Every session shares one GlobalBudget: a cap on agents running at once and a
+cap on network fetches in flight (fetch cache hits are free), held in
+cross-process semaphores. Worker processes scale with cores while upstream
+rate limits see at most the budget. Progress goes to one consolidated report,
+RESEARCH/_batches/<batch_id>.json, rewritten as tasks finish; re-running a
+batch id resumes its unfinished sessions.
+
+Usage: python batch_runner.py validate SPEC_DIR
+       python batch_runner.py run SPEC_DIR --executor module:factory
+           [--workers N] [--agents N] [--fetches N] [--batch-id ID]
+       python batch_runner.py status BATCH_ID
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from pathlib import Path
+from queue import Empty
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+from fetch_cache import FetchCache, Fetcher, urllib_fetcher
+from orchestrator import PhaseStatus, ResearchState
+from pipelines import PipelineConfig, create_agent_tasks, plan_queries
+from scheduler import AgentExecutor, AgentScheduler, FakeExecutor, TaskOutcome
+
+SCHEMA_FILE = Path(__file__).resolve().parents[1] / "references" / "query_schema.json"
+BATCH_DIR = "_batches"
+DEFAULT_AGENTS = 8
+DEFAULT_FETCHES = 16
+REPORT_INTERVAL = 1.0
+# Async waiters poll for a slot, backing off between these bounds.
+POLL_SECONDS = (0.005, 0.1)
+
+ExecutorFactory = Callable[[FetchCache], AgentExecutor]
+
+PENDING = "pending"
+INVALID = "invalid"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class _Slots:
+    """A cross-process semaphore plus usage counters (in use, peak, waits)."""
+
+    def __init__(self, context, limit: int):
+        self.limit = limit
+        self._semaphore = context.BoundedSemaphore(limit)
+        # in_use, peak, acquired, waited_seconds
+        self._stats = context.Array("d", 4)
+
+    def _acquired(self, waited: float):
+        with self._stats.get_lock():
+            self._stats[0] += 1
+            self._stats[1] = max(self._stats[1], self._stats[0])
+            self._stats[2] += 1
+            self._stats[3] += waited
+
+    def _release(self):
+        with self._stats.get_lock():
+            self._stats[0] -= 1
+        self._semaphore.release()
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        start = time.perf_counter()
+        self._semaphore.acquire()
+        self._acquired(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def hold_async(self):
+        # Polling keeps the wait cancellable and the event loop free; a blocking
+        # acquire in a thread would take the slot after a cancelled task left.
+        start = time.perf_counter()
+        delay, max_delay = POLL_SECONDS
+        while not self._semaphore.acquire(False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+        self._acquired(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats.get_lock():
+            in_use, peak, acquired, waited = self._stats[:]
+        return {
+            "limit": self.limit,
+            "in_use": int(in_use),
+            "peak": int(peak),
+            "acquired": int(acquired),
+            "wait_seconds": round(waited, 3),
+        }
+
+
+class GlobalBudget:
+    """Agent and fetch slots shared by every session of a batch."""
+
+    def __init__(
+        self,
+        agents: int = DEFAULT_AGENTS,
+        fetches: int = DEFAULT_FETCHES,
+        context: Optional[Any] = None,
+    ):
+        context = context or multiprocessing.get_context()
+        self.agents = _Slots(context, agents)
+        self.fetches = _Slots(context, fetches)
+
+    def agent_slot(self):
+        """Async context manager held by AgentScheduler around each attempt."""
+        return self.agents.hold_async()
+
+    def fetch_slot(self):
+        return self.fetches.hold()
+
+    def fetcher(self, fetcher: Fetcher = urllib_fetcher) -> Fetcher:
+        """Wrap a FetchCache fetcher so network fetches take a fetch slot."""
+
+        def budgeted(url: str):
+            with self.fetch_slot():
+                return fetcher(url)
+
+        return budgeted
+
+    def stats(self) -> Dict[str, Any]:
+        return {"agents": self.agents.stats(), "fetches": self.fetches.stats()}
+
+
+def fake_executor(fetch_cache: FetchCache) -> AgentExecutor:
+    """Executor factory for dry runs: FakeExecutor agents, no network."""
+    return FakeExecutor(delay_seconds=0.05)
+
+
+def load_schema(path: Path = SCHEMA_FILE) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _path(parts) -> str:
+    text = ""
+    for part in parts:
+        text += f"[{part}]" if isinstance(part, int) else f".{part}"
+    return text.lstrip(".") or "$"
+
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+
+def _check(value: Any, schema: Dict[str, Any], parts: List, errors: List[str]):
+    """The draft-07 keywords query_schema.json uses; `format` is not asserted."""
+    where = _path(parts)
+    expected = schema.get("type")
+    if expected in _TYPES:
+        wrong_bool = isinstance(value, bool) and expected in ("integer", "number")
+        if not isinstance(value, _TYPES[expected]) or wrong_bool:
+            errors.append(f"{where}: {value!r} is not of type '{expected}'")
+            return
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{where}: {value!r} is not one of {schema['enum']}")
+    if isinstance(value, str):
+        if len(value) < schema.get("minLength", 0):
+            errors.append(f"{where}: shorter than {schema['minLength']} characters")
+        if "maxLength" in schema and len(value) > schema["maxLength"]:
+            errors.append(f"{where}: longer than {schema['maxLength']} characters")
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{where}: {value} is less than {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{where}: {value} is greater than {schema['maximum']}")
+    elif isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            errors.append(f"{where}: fewer than {schema['minItems']} items")
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            errors.append(f"{where}: more than {schema['maxItems']} items")
+        if "items" in schema:
+            for i, item in enumerate(value):
+                _check(item, schema["items"], parts + [i], errors)
+    elif isinstance(value, dict):
+        for name in schema.get("required", []):
+            if name not in value:
+                errors.append(f"{where}: '{name}' is a required property")
+        for name, subschema in schema.get("properties", {}).items():
+            if name in value:
+                _check(value[name], subschema, parts + [name], errors)
+
+
+def validate_spec(spec: Any, schema: Dict[str, Any]) -> List[str]:
+    """Schema violations as 'path: message' strings; jsonschema if installed."""
+    if jsonschema is not None:
+        validator = jsonschema.Draft7Validator(schema)
+        return [
+            f"{_path(error.absolute_path)}: {error.message}"
+            for error in sorted(validator.iter_errors(spec), key=lambda e: e.path)
+        ]
+    errors: List[str] = []
+    _check(spec, schema, [], errors)
+    return errors
+
+
+def load_specs(
+    spec_dir: Path, schema: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Every *.json in spec_dir as {"spec_file", "spec", "errors"}, by name."""
+    schema = schema if schema is not None else load_schema()
+    entries = []
+    for path in sorted(Path(spec_dir).glob("*.json")):
+        entry: Dict[str, Any] = {"spec_file": path.name, "spec": None, "errors": []}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry["spec"] = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            entry["errors"].append(f"$: unreadable spec: {e}")
+        else:
+            entry["errors"] = validate_spec(entry["spec"], schema)
+        entries.append(entry)
+    return entries
+
+
+def spec_requirements(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Phase 1 requirements in the session's requirements shape."""
+    constraints = spec.get("constraints", {})
+    return {
+        "focus": list(spec["questions"]["secondary"]),
+        "output_format": spec["output"]["format"],
+        "scope": {
+            "timeframe": constraints.get("timeframe", {}),
+            "geography": constraints.get("geography", {}),
+        },
+        "sources": constraints.get("sources", {}),
+        "audience": spec["context"]["audience"],
+        "special_requirements": list(spec.get("special_instructions", [])),
+        "primary_question": spec["questions"]["primary"],
+        "research_type": spec["task"]["type"],
+    }
+
+
+def spec_plan(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Phase 2 plan: one subtopic per secondary question, in the spec's order."""
+    subtopics = list(spec["questions"]["secondary"])
+    return {
+        "subtopics": subtopics,
+        "search_queries": {subtopic: [subtopic] for subtopic in subtopics},
+        "priorities": {subtopic: rank for rank, subtopic in enumerate(subtopics, 1)},
+    }
+
+
+_budget: Optional[GlobalBudget] = None
+_events: Optional[Any] = None
+
+
+def _init_worker(budget: GlobalBudget, events: Any):
+    global _budget, _events
+    _budget = budget
+    _events = events
+
+
+def _emit(spec_file: str, event: str, **fields: Any):
+    if _events is not None:
+        _events.put({"spec_file": spec_file, "event": event, **fields})
+
+
+def _resolve_factory(factory: Union[str, ExecutorFactory]) -> ExecutorFactory:
+    """'module:attribute' (importable from the scripts folder) or a callable."""
+    if callable(factory):
+        return factory
+    module, _, attribute = factory.partition(":")
+    if not attribute:
+        raise ValueError(f"Executor factory must be 'module:attribute': {factory}")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def run_spec(job: Dict[str, Any], budget: Optional[GlobalBudget] = None) -> Dict:
+    """
+    Run one spec through Phases 1-3. job holds spec_file, spec, base_path,
+    executor, config, fetcher and, to resume, session_id. Phases already
+    completed are skipped, and so are agent tasks checkpointed as completed.
+    """
+    budget = budget or _budget
+    spec_file = job["spec_file"]
+    spec = job["spec"]
+    state = ResearchState(job["base_path"])
+    session_id = job.get("session_id")
+    if not (session_id and state.load_session(session_id)):
+        session_id = state.create_session(spec["task"]["title"])
+    _emit(spec_file, "started", session_id=session_id)
+    # Errors of earlier runs stay in the session; report only this run's.
+    known_errors = len(state.state.get("errors", []))
+
+    phase = 0
+    try:
+        progress = state.state["progress"]
+        done = PhaseStatus.COMPLETED.value
+        if progress["phase_1"] != done:
+            phase = 1
+            state.start_phase(1)
+            state.set_requirements(spec_requirements(spec))
+            state.save_artifact(
+                "query.json", json.dumps(spec, indent=2, ensure_ascii=False)
+            )
+            state.complete_phase(1)
+        if progress["phase_2"] != done:
+            phase = 2
+            state.start_phase(2)
+            state.set_plan(spec_plan(spec))
+            state.complete_phase(2)
+        if progress["phase_3"] != done:
+            phase = 3
+            _run_agents(state, job, budget)
+            tasks = state.task_progress()
+            completed = tasks.get(PhaseStatus.COMPLETED.value, 0)
+            if completed < tasks["total"]:
+                state.fail_phase(
+                    3,
+                    f"{tasks['total'] - completed} of {tasks['total']} agent tasks "
+                    "did not complete",
+                )
+            else:
+                state.complete_phase(3)
+    except Exception as e:
+        if phase:
+            state.fail_phase(phase, f"{type(e).__name__}: {e}")
+        error = f"{type(e).__name__}: {e}"
+        return _session_result(state, spec_file, known_errors, error)
+    finally:
+        state.close()
+    return _session_result(state, spec_file, known_errors)
+
+
+def _run_agents(state: ResearchState, job: Dict[str, Any], budget):
+    state.start_phase(3)
+    plan = state.state["plan"]
+    tasks = create_agent_tasks(
+        plan["subtopics"], state.state["topic"], plan_queries(plan)
+    )
+    fetcher = job.get("fetcher") or urllib_fetcher
+    if budget is not None:
+        fetcher = budget.fetcher(fetcher)
+    cache = FetchCache(state.base_path, fetcher=fetcher)
+    spec_file = job["spec_file"]
+
+    def on_result(result):
+        _emit(spec_file, "task", outcome=result.outcome.value)
+
+    try:
+        executor = _resolve_factory(job["executor"])(cache)
+        scheduler = AgentScheduler(
+            executor,
+            PipelineConfig(**job.get("config", {})),
+            state,
+            on_result=on_result,
+            budget=budget,
+        )
+        results = scheduler.run_sync(tasks)
+    finally:
+        state.record_fetch_metric(cache.session_stats)
+        cache.close()
+    skipped = sum(1 for r in results if r.outcome == TaskOutcome.SKIPPED)
+    if skipped:
+        _emit(spec_file, "skipped", count=skipped)
+
+
+def _session_result(
+    state: ResearchState,
+    spec_file: str,
+    known_errors: int = 0,
+    error: Optional[str] = None,
+) -> Dict[str, Any]:
+    progress = state.state["progress"].values()
+    failed = error is not None or PhaseStatus.FAILED.value in progress
+    # A failed session resumes by running the batch again, not from Phase 4.
+    next_phase = None if failed else state.get_next_pending_phase()
+    result = {
+        "spec_file": spec_file,
+        "session_id": state.state["session_id"],
+        "topic": state.state["topic"],
+        "status": FAILED if failed else COMPLETED,
+        "tasks": state.task_progress(),
+        "sources_count": state.state["sources_count"],
+        "next_action": f"execute_phase_{next_phase}" if next_phase else None,
+        "errors": [e["error"] for e in state.state.get("errors", [])[known_errors:]],
+    }
+    if error is not None and error not in result["errors"]:
+        result["errors"].append(error)
+    return result
+
+
+def batch_report_path(base_path: Path, batch_id: str) -> Path:
+    return Path(base_path) / BATCH_DIR / f"{batch_id}.json"
+
+
+def load_batch_report(base_path: Path, batch_id: str) -> Optional[Dict[str, Any]]:
+    path = batch_report_path(base_path, batch_id)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class BatchReport:
+    """The consolidated report, kept in memory and written out atomically."""
+
+    def __init__(self, base_path: Path, batch_id: str, data: Dict[str, Any]):
+        self.path = batch_report_path(base_path, batch_id)
+        self.data = data
+        self.sessions = {entry["spec_file"]: entry for entry in data["sessions"]}
+        self._written = 0.0
+        self._dirty = True
+
+    def update(self, spec_file: str, **fields: Any):
+        self.sessions[spec_file].update(fields)
+        self._dirty = True
+
+    def apply(self, event: Dict[str, Any]):
+        entry = self.sessions[event["spec_file"]]
+        if event["event"] == "started":
+            entry["session_id"] = event["session_id"]
+            # Queued events can arrive after the session's result.
+            if entry["status"] == PENDING:
+                entry["status"] = RUNNING
+        elif event["event"] == "task":
+            live = entry.setdefault("live_tasks", {})
+            live[event["outcome"]] = live.get(event["outcome"], 0) + 1
+        elif event["event"] == "skipped":
+            live = entry.setdefault("live_tasks", {})
+            live[TaskOutcome.SKIPPED.value] = event["count"]
+        self._dirty = True
+
+    def totals(self) -> Dict[str, int]:
+        totals = dict.fromkeys((PENDING, RUNNING, COMPLETED, FAILED, INVALID), 0)
+        tasks: Dict[str, int] = {}
+        for entry in self.data["sessions"]:
+            totals[entry["status"]] += 1
+            for status, count in entry.get("tasks", {}).items():
+                tasks[status] = tasks.get(status, 0) + count
+        return {"specs": len(self.data["sessions"]), **totals, "tasks": tasks}
+
+    def write(self, force: bool = False, **fields: Any):
+        self.data.update(fields)
+        now = time.time()
+        if not (force or (self._dirty and now - self._written >= REPORT_INTERVAL)):
+            return
+        self.data["updated_at"] = datetime.now().isoformat()
+        self.data["totals"] = self.totals()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self._written = now
+        self._dirty = False
+
+
+def _progress(report: BatchReport, entry: Dict[str, Any]):
+    totals = report.totals()
+    finished = totals[COMPLETED] + totals[FAILED]
+    runnable = totals["specs"] - totals[INVALID]
+    print(
+        f"[{finished}/{runnable}] {entry['status']}: {entry['spec_file']} "
+        f"({entry.get('session_id')})",
+        file=sys.stderr,
+    )
+
+
+def run_batch(
+    spec_dir: Union[str, Path],
+    executor: Union[str, ExecutorFactory],
+    base_path: Union[str, Path] = "RESEARCH",
+    workers: Optional[int] = None,
+    agents: int = DEFAULT_AGENTS,
+    fetches: int = DEFAULT_FETCHES,
+    batch_id: Optional[str] = None,
+    config: Optional[Dict[str, Any]] = None,
+    fetcher: Optional[Fetcher] = None,
+) -> Dict[str, Any]:
+    """
+    Run every valid spec in spec_dir, at most `workers` sessions at a time,
+    under one budget of `agents` concurrent agents and `fetches` concurrent
+    network fetches. An existing batch_id resumes that batch: completed
+    sessions are kept, the others continue where they stopped.
+
+    executor and fetcher (urllib by default) are handed to worker processes,
+    so they must be importable: a 'module:attribute' string or a module-level
+    function.
+    """
+    base_path = Path(base_path)
+    batch_id = batch_id or datetime.now().strftime("batch_%Y%m%d_%H%M%S")
+    workers = workers or os.cpu_count() or 1
+    specs = load_specs(Path(spec_dir))
+    previous = {
+        entry["spec_file"]: entry
+        for entry in (load_batch_report(base_path, batch_id) or {}).get("sessions", [])
+    }
+
+    sessions = []
+    jobs = []
+    for item in specs:
+        entry = {"spec_file": item["spec_file"], "status": PENDING, "errors": []}
+        before = previous.get(item["spec_file"], {})
+        if item["errors"]:
+            entry.update(status=INVALID, errors=item["errors"])
+        elif before.get("status") == COMPLETED:
+            entry = before
+        else:
+            entry["session_id"] = before.get("session_id")
+            jobs.append(
+                {
+                    "spec_file": item["spec_file"],
+                    "spec": item["spec"],
+                    "session_id": before.get("session_id"),
+                    "base_path": str(base_path),
+                    "executor": executor,
+                    "config": config or {},
+                    "fetcher": fetcher,
+                }
+            )
+        sessions.append(entry)
+
+    budget = GlobalBudget(agents, fetches)
+    report = BatchReport(
+        base_path,
+        batch_id,
+        {
+            "batch_id": batch_id,
+            "spec_dir": str(spec_dir),
+            "started_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "workers": workers,
+            "sessions": sessions,
+        },
+    )
+    report.write(force=True, budget=budget.stats())
+
+    events = multiprocessing.get_context().Queue()
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(jobs) or 1)),
+        initializer=_init_worker,
+        initargs=(budget, events),
+    ) as pool:
+        pending: Dict[Future, str] = {
+            pool.submit(run_spec, job): job["spec_file"] for job in jobs
+        }
+        while pending:
+            done, _ = wait(
+                pending, timeout=REPORT_INTERVAL, return_when=FIRST_COMPLETED
+            )
+            _drain(events, report)
+            for future in done:
+                spec_file = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker process died (or the result did not pickle).
+                    result = {"status": FAILED, "errors": [f"{type(e).__name__}: {e}"]}
+                result.pop("spec_file", None)
+                report.sessions[spec_file].pop("live_tasks", None)
+                report.update(spec_file, **result)
+                _progress(report, report.sessions[spec_file])
+            report.write(budget=budget.stats())
+    _drain(events, report)
+
+    for entry in report.data["sessions"]:
+        entry.pop("live_tasks", None)
+    report.write(
+        force=True, finished_at=datetime.now().isoformat(), budget=budget.stats()
+    )
+    return {"report": str(report.path), **report.data}
+
+
+def _drain(events: Any, report: BatchReport):
+    while True:
+        try:
+            event = events.get_nowait()
+        except Empty:
+            return
+        report.apply(event)
+
+
+def batch_status(batch_id: str, base_path: Union[str, Path] = "RESEARCH") -> Dict:
+    """The batch report with each session's current state re-read."""
+    data = load_batch_report(Path(base_path), batch_id)
+    if data is None:
+        return {"status": "error", "message": f"Batch not found: {batch_id}"}
+    state = ResearchState(str(base_path))
+    for entry in data["sessions"]:
+        session_id = entry.get("session_id")
+        if session_id and state.load_session(session_id):
+            next_phase = state.get_next_pending_phase()
+            entry.update(
+                tasks=state.task_progress(),
+                sources_count=state.state["sources_count"],
+                next_action=f"execute_phase_{next_phase}" if next_phase else None,
+                session_status=state.state["status"],
+            )
+    state.close()
+    return data
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Deep Research batch runner")
+    parser.add_argument("--base-path", default="RESEARCH")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate_cmd = commands.add_parser("validate", help="Validate a spec directory")
+    validate_cmd.add_argument("spec_dir")
+    run_cmd = commands.add_parser("run", help="Run every spec as a session")
+    run_cmd.add_argument("spec_dir")
+    run_cmd.add_argument(
+        "--executor",
+        required=True,
+        help="module:factory returning an AgentExecutor given a FetchCache "
+        "(batch_runner:fake_executor for a dry run)",
+    )
+    run_cmd.add_argument("--workers", type=int, help="Sessions at once (CPU count)")
+    run_cmd.add_argument("--agents", type=int, default=DEFAULT_AGENTS)
+    run_cmd.add_argument("--fetches", type=int, default=DEFAULT_FETCHES)
+    run_cmd.add_argument("--max-parallel-agents", type=int, help="Per session")
+    run_cmd.add_argument("--batch-id", help="Resume this batch")
+    status_cmd = commands.add_parser("status", help="Show a batch report")
+    status_cmd.add_argument("batch_id")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "validate":
+        result = [
+            {"spec_file": entry["spec_file"], "errors": entry["errors"]}
+            for entry in load_specs(Path(args.spec_dir))
+        ]
+    elif args.command == "run":
+        config = {}
+        if args.max_parallel_agents:
+            config["max_parallel_agents"] = args.max_parallel_agents
+        result = run_batch(
+            args.spec_dir,
+            args.executor,
+            args.base_path,
+            args.workers,
+            args.agents,
+            args.fetches,
+            args.batch_id,
+            config,
+        )
+    else:
+        result = batch_status(args.batch_id, args.base_path)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
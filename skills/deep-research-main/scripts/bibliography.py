@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Bibliography Generator - streams sources.jsonl into sources/bibliography.md
+following references/citation_rules.md and assets/templates/bibliography.md.
+
+Entries are grouped into the template's sections by source `type` and ordered
+alphabetically by author (title when there is no author), then by year, with
+a/b/c suffixes for the same author and year. Sorting is an external merge sort:
+at most `max_records` entries are held in memory, sorted runs are spilled to
+temp files and merged back while the output file is streamed out.
+
+The template's Limitations bullets are filled from the source set (undated,
+unattributed and low-rated sources) plus any limitations the caller passes.
+"""
+
+import heapq
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from output_builder import TEMPLATES_DIR, render_template
+
+TEMPLATE_NAME = "bibliography.md"
+MAX_RECORDS_IN_MEMORY = 50_000
+BAR_WIDTH = 50
+
+# Template placeholder per section, in template order.
+SECTIONS = (
+    "ACADEMIC_SOURCES",
+    "INDUSTRY_SOURCES",
+    "OFFICIAL_SOURCES",
+    "NEWS_SOURCES",
+    "ONLINE_SOURCES",
+)
+SECTION_BY_TYPE = {
+    "academic": 0,
+    "journal": 0,
+    "paper": 0,
+    "preprint": 0,
+    "industry": 1,
+    "report": 1,
+    "whitepaper": 1,
+    "analyst": 1,
+    "official": 2,
+    "government": 2,
+    "documentation": 2,
+    "docs": 2,
+    "standard": 2,
+    "news": 3,
+    "media": 3,
+}
+ONLINE_SECTION = 4
+
+MONTHS = (
+    "January February March April May June July August September October "
+    "November December"
+).split()
+
+_DATE_RE = re.compile(r"((?:19|20)\d{2})(?:-(\d{1,2})(?:-(\d{1,2}))?)?")
+_SECTION_SPLIT_RE = re.compile(r"\{(" + "|".join(SECTIONS) + r")\}")
+_BAR_RE = re.compile(r"\{'(.)' \* ([A-Z]_COUNT)\}")
+_LIMITATIONS_RE = re.compile(r"(?:^- \{LIMITATION_\d+\}\n)+", re.MULTILINE)
+
+# (section, author_key, year_key, title_key, author, year, date_tail, rest)
+Entry = Tuple[int, str, str, str, str, str, str, str]
+
+
+def _date_parts(value: Any) -> Tuple[str, str]:
+    """('2024', 'January 15') from '2024-01-15'; ('n.d.', '') when unknown."""
+    match = _DATE_RE.search(str(value or ""))
+    if not match:
+        return "n.d.", ""
+    year, month, day = match.groups()
+    if month and 1 <= int(month) <= 12:
+        tail = MONTHS[int(month) - 1]
+        if day:
+            tail += f" {int(day)}"
+        return year, tail
+    return year, ""
+
+
+def _retrieved(source: Dict[str, Any], build_date: str = "") -> str:
+    # n.d. sources need a retrieval date; without fetched_at use the build date.
+    year, tail = _date_parts(source.get("fetched_at") or build_date)
+    if year == "n.d.":
+        return ""
+    return f"Retrieved {tail}, {year}, from " if tail else f"Retrieved {year}, from "
+
+
+def _sort_text(text: str) -> str:
+    text = text.strip().strip('"').lower()
+    return text[4:] if text.startswith("the ") else text
+
+
+def make_entry(source: Dict[str, Any], build_date: str = "") -> Entry:
+    section = SECTION_BY_TYPE.get((source.get("type") or "").lower(), ONLINE_SECTION)
+    author = (source.get("author") or "").strip().rstrip(".")
+    title = (source.get("title") or source.get("url") or source["id"]).strip()
+    site = source.get("publication") or source.get("domain") or ""
+    url = source.get("url") or ""
+    year, date_tail = _date_parts(source.get("date"))
+
+    if section == 2:
+        # Agency/standard format: title is not quoted.
+        body = f"{title}."
+    elif author:
+        body = f'"{title}."'
+    else:
+        body = ""
+    if site:
+        body += f" {site}."
+    if section == ONLINE_SECTION or year == "n.d.":
+        body += f" {_retrieved(source, build_date)}{url}" if url else ""
+    elif url:
+        body += f" {url}"
+
+    if not author:
+        # No author: the title leads the entry and drives its position.
+        author = title
+    year_key = "9999" if year == "n.d." else year
+    return (
+        section,
+        _sort_text(author),
+        year_key,
+        _sort_text(title),
+        author,
+        year,
+        date_tail if section == 3 else "",
+        body.strip(),
+    )
+
+
+def _spill(entries: List[Entry], directory: str) -> str:
+    entries.sort()
+    fd, path = tempfile.mkstemp(prefix="bib_run_", suffix=".jsonl", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False))
+            f.write("\n")
+    return path
+
+
+def _read_run(path: str) -> Iterator[Entry]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield tuple(json.loads(line))
+
+
+def sorted_entries(
+    sources: Iterable[Dict[str, Any]],
+    stats: Dict[str, Any],
+    max_records: int = MAX_RECORDS_IN_MEMORY,
+    spill_dir: Optional[str] = None,
+    build_date: str = "",
+) -> Iterator[Entry]:
+    """
+    Yield bibliography entries in output order. `stats` is filled with counts
+    while the input is consumed, before the first entry is yielded.
+    """
+    buffer: List[Entry] = []
+    runs: List[str] = []
+    stats.setdefault("total", 0)
+    stats.setdefault("by_quality", {})
+    stats.setdefault("undated", 0)
+    stats.setdefault("no_author", 0)
+    years: List[int] = []
+    try:
+        for source in sources:
+            stats["total"] += 1
+            grade = (source.get("quality_rating") or "").strip().upper()[:1] or "?"
+            stats["by_quality"][grade] = stats["by_quality"].get(grade, 0) + 1
+            entry = make_entry(source, build_date)
+            if entry[5] != "n.d.":
+                year = int(entry[5])
+                years = [min(years + [year]), max(years + [year])]
+            else:
+                stats["undated"] += 1
+            if not (source.get("author") or "").strip():
+                stats["no_author"] += 1
+            buffer.append(entry)
+            if len(buffer) >= max_records:
+                runs.append(_spill(buffer, spill_dir))
+                buffer = []
+        stats["runs"] = len(runs)
+        stats["years"] = years
+        buffer.sort()
+        yield from heapq.merge(buffer, *(_read_run(path) for path in runs))
+    finally:
+        for path in runs:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _year_suffix(index: int) -> str:
+    """a, b, ..., z, aa, ab, ... for the index-th work of an author in a year."""
+    suffix = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        suffix = chr(ord("a") + remainder) + suffix
+    return suffix
+
+
+def _format_group(group: List[Entry]) -> Iterator[str]:
+    """Same author and year: add a, b, c suffixes (citation_rules.md)."""
+    for index, entry in enumerate(group):
+        _, _, _, _, author, year, date_tail, body = entry
+        if len(group) > 1 and year != "n.d.":
+            year += _year_suffix(index)
+        date = f"{year}, {date_tail}" if date_tail else year
+        yield f"- {author}. ({date}). {body}\n"
+
+
+def _section_lines(entries: Iterator[Entry], section: int, pending: List[Entry]):
+    """Consume entries of one section (entries arrive sorted by section)."""
+    group: List[Entry] = []
+    while True:
+        if pending:
+            entry = pending.pop()
+        else:
+            entry = next(entries, None)
+        if entry is None or entry[0] != section:
+            if entry is not None:
+                pending.append(entry)
+            break
+        if group and (group[-1][1], group[-1][2]) != (entry[1], entry[2]):
+            yield from _format_group(group)
+            group = []
+        group.append(entry)
+    if group:
+        yield from _format_group(group)
+
+
+def _limitations(stats: Dict[str, Any], extra: Iterable[str]) -> List[str]:
+    total = stats.get("total", 0)
+    low = sum(stats.get("by_quality", {}).get(grade, 0) for grade in "DE")
+    derived = [
+        (stats.get("undated", 0), "have no publication date and are cited as n.d."),
+        (stats.get("no_author", 0), "name no author and are listed by title"),
+        (low, "are rated D or E and carry less weight"),
+    ]
+    limitations = list(extra)
+    limitations += [f"{n} of {total} sources {text}" for n, text in derived if n]
+    return limitations or ["No source-level limitations were identified"]
+
+
+def write_bibliography(
+    sources: Iterable[Dict[str, Any]],
+    output_path: Path,
+    session_id: str = "",
+    template_path: Path = TEMPLATES_DIR / TEMPLATE_NAME,
+    max_records: int = MAX_RECORDS_IN_MEMORY,
+    limitations: Iterable[str] = (),
+) -> Dict[str, Any]:
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    template = Path(template_path).read_text(encoding="utf-8")
+
+    build_date = datetime.now().strftime("%Y-%m-%d")
+    stats: Dict[str, Any] = {}
+    entries = sorted_entries(
+        sources, stats, max_records, str(output_path.parent), build_date
+    )
+    # Pull the first entry so the whole input has been read and counted.
+    first = next(entries, None)
+    pending = [first] if first is not None else []
+
+    counts = stats.get("by_quality", {})
+    years = stats.get("years") or []
+    values = {
+        "TOTAL_SOURCES": stats.get("total", 0),
+        "DATE_RANGE": f"{years[0]}-{years[1]}" if years else "n.d.",
+        "GENERATION_DATE": build_date,
+        "SESSION_ID": session_id,
+    }
+    for grade in "ABCDE":
+        values[f"{grade}_COUNT"] = counts.get(grade, 0)
+    widest = max([counts.get(grade, 0) for grade in "ABCDE"] + [1])
+
+    def bar(match):
+        count = values[match.group(2)]
+        return match.group(1) * round(count * BAR_WIDTH / widest)
+
+    limitation_lines = "".join(
+        f"- {limitation}\n" for limitation in _limitations(stats, limitations)
+    )
+    template = _LIMITATIONS_RE.sub(lambda _: limitation_lines, template)
+
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    section_counts = dict.fromkeys(SECTIONS, 0)
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        for index, piece in enumerate(_SECTION_SPLIT_RE.split(template)):
+            if index % 2 == 0:
+                out.write(render_template(_BAR_RE.sub(bar, piece), values))
+                continue
+            section = SECTIONS.index(piece)
+            written = 0
+            for line in _section_lines(entries, section, pending):
+                out.write(line)
+                written += 1
+            if not written:
+                out.write("_No sources in this category._\n")
+            section_counts[piece] = written
+    os.replace(tmp_path, output_path)
+
+    return {
+        "path": str(output_path),
+        "total": stats.get("total", 0),
+        "sections": section_counts,
+        "spilled_runs": stats.get("runs", 0),
+    }
+
+
+def write_session_bibliography(
+    state, max_records: int = MAX_RECORDS_IN_MEMORY, limitations: Iterable[str] = ()
+) -> Dict[str, Any]:
+    return write_bibliography(
+        state.iter_sources(),
+        state.session_path / "sources" / "bibliography.md",
+        session_id=state.state["session_id"],
+        max_records=max_records,
+        limitations=limitations,
+    )
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Citation Verifier - Phase 6 QA over artifacts/drafts/*.md.
+
+Inline citations of the form (Author, Year, ...) from references/citation_rules.md
+are pulled out with one compiled pattern and resolved against the session's
+sources through an (author, year) index. Sentences that state figures
+(numbers, percentages, amounts) without any citation are reported as
+missing_citation issues. The result follows the Phase 6 output contract.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+DRAFTS_DIR = "artifacts/drafts"
+REPORT_NAME = "qa_citations.json"
+
+# One parenthetical that contains a year or n.d. somewhere inside it; it may
+# hold several citations separated by ";".
+_CITATION_RE = re.compile(
+    r"\(([^()]*?\b(?:(?:19|20)\d{2}[a-z]?|n\.d\.)[^()]*)\)"
+)
+_ITEM_RE = re.compile(
+    r"^\s*(?P<author>.+?),\s*(?P<year>(?:19|20)\d{2})[a-z]?\b|"
+    r"^\s*(?P<nd_author>.+?),\s*n\.d\."
+)
+_FIGURE_RE = re.compile(
+    r"\d+(?:\.\d+)?\s?%|[$€£¥]\s?\d|\b\d[\d,]*(?:\.\d+)?\s?"
+    r"(?:percent|million|billion|trillion|thousand|users|companies|x)\b|"
+    r"\b\d{1,3}(?:,\d{3})+\b",
+    re.IGNORECASE,
+)
+# A decimal point ("$4.2B", "3.5%") does not end a sentence.
+_SENTENCE_RE = re.compile(r"(?:\d\.\d|[^.!?])+(?:[.!?]|$)")
+_YEAR_RE = re.compile(r"(19|20)\d{2}")
+_LIST_ITEM_RE = re.compile(r"(?:[-*+]|\d+[.)])\s")
+_ET_AL_RE = re.compile(r"\s+et al\.?$", re.IGNORECASE)
+
+
+def _norm(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _author_keys(author: str) -> Set[str]:
+    """Keys a source author can be cited by: full name, surname, organization."""
+    keys = set()
+    first = re.split(r";|&|\band\b", author)[0].strip()
+    if first:
+        keys.add(_norm(first))
+        if "," in first:
+            keys.add(_norm(first.split(",")[0]))
+        else:
+            keys.add(_norm(first.split()[-1]))
+    keys.add(_norm(author))
+    keys.discard("")
+    return keys
+
+
+class CitationIndex:
+    def __init__(self, sources: Iterable[Dict[str, Any]]):
+        self._by_author_year: Dict[Tuple[str, str], List[str]] = {}
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        for source in sources:
+            self.add(source)
+
+    def add(self, source: Dict[str, Any]):
+        match = _YEAR_RE.search(str(source.get("date") or ""))
+        year = match.group() if match else "n.d."
+        keys = _author_keys(source["author"]) if source.get("author") else set()
+        if source.get("title"):
+            # No-author citations use the title: ("Article Title", 2024).
+            keys.add(_norm(source["title"]))
+        self.sources[source["id"]] = {
+            "url": source.get("url"),
+            "link_status": source.get("link_status"),
+        }
+        for key in keys:
+            self._by_author_year.setdefault((key, year), []).append(source["id"])
+
+    def resolve(self, author: str, year: str) -> Optional[str]:
+        author = _ET_AL_RE.sub("", author.strip().strip('"“”'))
+        first = re.split(r"&|\band\b", author)[0].strip()
+        candidates = [_norm(author), _norm(first)]
+        if first and "," not in first:
+            candidates.append(_norm(first.split()[-1]))
+        for key in candidates:
+            ids = self._by_author_year.get((key, year))
+            if ids:
+                return ids[0]
+        return None
+
+
+def _parse_citations(parenthetical: str) -> List[Tuple[str, str]]:
+    items = []
+    for part in parenthetical.split(";"):
+        if "personal communication" in part:
+            continue
+        # "(Original, Year, as cited in Secondary, Year)": check the original.
+        part = part.split(" as cited in ")[0]
+        match = _ITEM_RE.match(part)
+        if match is None:
+            continue
+        if match.group("author"):
+            items.append((match.group("author"), match.group("year")))
+        else:
+            items.append((match.group("nd_author"), "n.d."))
+    return items
+
+
+def _blocks(text: str, document: str) -> List[Tuple[int, str, str, bool]]:
+    """Split a draft into (first line, location, text, is_prose) blocks.
+
+    Hard-wrapped prose lines are joined so a sentence whose citation sits on
+    the next line is checked as one; headings, table rows, captions and list
+    items each start a block of their own.
+    """
+    blocks: List[Tuple[int, str, str, bool]] = []
+    section = paragraph = 0
+    in_code = False
+    blank = True
+    joinable = False
+
+    for line_no, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            joinable = False
+            continue
+        if in_code:
+            continue
+        if not stripped:
+            blank = True
+            joinable = False
+            continue
+        if stripped.startswith("#"):
+            section += 1
+            paragraph = 0
+        elif blank:
+            paragraph += 1
+        blank = False
+
+        # Headings, tables and table captions carry figures without prose.
+        prose = not stripped.startswith(("#", "|", "*Source", "> ("))
+        if joinable and prose and not _LIST_ITEM_RE.match(stripped):
+            first, location, joined, _ = blocks[-1]
+            blocks[-1] = (first, location, f"{joined} {stripped}", True)
+        else:
+            location = f"{document}, section {section}, paragraph {paragraph}"
+            blocks.append((line_no, location, stripped, prose))
+        joinable = prose
+    return blocks
+
+
+def verify_text(
+    text: str, index: CitationIndex, document: str = "draft"
+) -> Tuple[Dict[str, int], List[Dict[str, Any]], Set[str]]:
+    stats = {"total_citations": 0, "verified": 0, "unresolved": 0}
+    issues: List[Dict[str, Any]] = []
+    cited: Set[str] = set()
+
+    for line_no, location, block, prose in _blocks(text, document):
+        citations = list(_CITATION_RE.finditer(block))
+        for match in citations:
+            for author, year in _parse_citations(match.group(1)):
+                stats["total_citations"] += 1
+                source_id = index.resolve(author, year)
+                if source_id is not None:
+                    stats["verified"] += 1
+                    cited.add(source_id)
+                else:
+                    stats["unresolved"] += 1
+                    issues.append(
+                        {
+                            "type": "unresolved_citation",
+                            "location": location,
+                            "line": line_no,
+                            "severity": "medium",
+                            "resolved": False,
+                            "citation": match.group(0),
+                        }
+                    )
+
+        if not prose:
+            continue
+        for sentence_match in _SENTENCE_RE.finditer(block):
+            sentence = sentence_match.group().strip()
+            if not _FIGURE_RE.search(sentence):
+                continue
+            start, end = sentence_match.span()
+            if any(start <= c.start() < end + 2 for c in citations):
+                continue
+            issues.append(
+                {
+                    "type": "missing_citation",
+                    "location": location,
+                    "line": line_no,
+                    "severity": "high",
+                    "resolved": False,
+                    "text": sentence[:200],
+                }
+            )
+    return stats, issues, cited
+
+
+def verify_drafts(
+    drafts: Iterable[Path], sources: Iterable[Dict[str, Any]]
+) -> Dict[str, Any]:
+    index = CitationIndex(sources)
+    totals = {"total_citations": 0, "verified": 0, "unresolved": 0}
+    issues: List[Dict[str, Any]] = []
+    cited: Set[str] = set()
+    scanned = 0
+
+    for path in sorted(Path(p) for p in drafts):
+        stats, draft_issues, draft_cited = verify_text(
+            path.read_text(encoding="utf-8"), index, path.name
+        )
+        scanned += 1
+        for key, value in stats.items():
+            totals[key] += value
+        issues.extend(draft_issues)
+        cited |= draft_cited
+
+    # link_status is written onto source records by the link checker.
+    totals["broken_links"] = sum(
+        1
+        for source_id in cited
+        if index.sources[source_id]["link_status"] == "broken"
+    )
+    return {
+        "qa_passed": not any(issue["severity"] == "high" for issue in issues),
+        "issues_found": issues,
+        "citation_stats": totals,
+        "drafts_scanned": scanned,
+        "sources_cited": len(cited),
+    }
+
+
+def verify_session_drafts(state) -> Dict[str, Any]:
+    """Verify every draft of the session and save artifacts/qa_citations.json."""
+    drafts = (state.session_path / DRAFTS_DIR).glob("*.md")
+    report = verify_drafts(drafts, state.iter_sources())
+    state.save_artifact(REPORT_NAME, json.dumps(report, indent=2, ensure_ascii=False))
+    return report
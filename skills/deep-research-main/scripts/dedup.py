@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Ingest-time source deduplication: canonical URLs, content hashes and MinHash
+signatures of snippets for near-duplicate (syndicated copy) detection.
+"""
+
+import hashlib
+import re
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Any
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "_hsenc",
+    "_hsmi",
+    "ref",
+    "ref_src",
+    "spm",
+}
+TRACKING_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+SKETCH_SIZE = 32
+SKETCH_ANCHORS = 4
+MAX_ANCHOR_POSTINGS = 64
+NEAR_DUPLICATE_THRESHOLD = 0.6
+MIN_SNIPPET_TOKENS = 8
+SHINGLE_SIZE = 2
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def canonicalize_url(url: str) -> str:
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    canonical = host + path
+    if query:
+        canonical += "?" + urlencode(query)
+    return canonical
+
+
+def normalize_text(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def shingles(tokens: List[str], size: int = SHINGLE_SIZE) -> List[str]:
+    if len(tokens) <= size:
+        return [" ".join(tokens)] if tokens else []
+    return [" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)]
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def minhash(text: str) -> Optional[Tuple[int, ...]]:
+    """Bottom-k MinHash sketch: the SKETCH_SIZE smallest shingle hashes."""
+    tokens = normalize_text(text)
+    if len(tokens) < MIN_SNIPPET_TOKENS:
+        return None
+    hashes = {_feature_hash(feature) for feature in shingles(tokens)}
+    return tuple(sorted(hashes)[:SKETCH_SIZE])
+
+
+def estimate_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    set_a, set_b = set(a), set(b)
+    union_sketch = sorted(set_a | set_b)[: max(len(a), len(b))]
+    shared = sum(1 for h in union_sketch if h in set_a and h in set_b)
+    return shared / len(union_sketch)
+
+
+def pack_signature(signature: Optional[Tuple[int, ...]]) -> Optional[bytes]:
+    if signature is None:
+        return None
+    return struct.pack(f"<{len(signature)}Q", *signature)
+
+
+def unpack_signature(blob: Optional[bytes]) -> Optional[Tuple[int, ...]]:
+    if not blob:
+        return None
+    return struct.unpack(f"<{len(blob) // 8}Q", blob)
+
+
+@dataclass
+class Fingerprint:
+    canonical_url: str
+    content_hash: Optional[str]
+    signature: Optional[Tuple[int, ...]]
+
+
+def fingerprint(source: Dict[str, Any]) -> Fingerprint:
+    return Fingerprint(
+        canonical_url=canonicalize_url(source.get("url", "")),
+        content_hash=source.get("content_hash") or None,
+        signature=minhash(source.get("snippet", "")),
+    )
+
+
+def merge_sources(existing: Dict[str, Any], duplicate: Dict[str, Any]) -> Dict[str, Any]:
+    merged = dict(existing)
+
+    claims = list(existing.get("claims") or [])
+    for claim in duplicate.get("claims") or []:
+        if claim not in claims:
+            claims.append(claim)
+    if claims:
+        merged["claims"] = claims
+
+    subtopics = _as_list(existing.get("subtopic"))
+    for subtopic in _as_list(duplicate.get("subtopic")):
+        if subtopic not in subtopics:
+            subtopics.append(subtopic)
+    if len(subtopics) == 1:
+        merged["subtopic"] = subtopics[0]
+    elif subtopics:
+        merged["subtopic"] = subtopics
+
+    url = duplicate.get("url")
+    if url and canonicalize_url(url) != canonicalize_url(existing.get("url", "")):
+        alternate_urls = list(existing.get("alternate_urls") or [])
+        if url not in alternate_urls:
+            alternate_urls.append(url)
+        merged["alternate_urls"] = alternate_urls
+
+    return merged
+
+
+def _as_list(value: Any) -> List[Any]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return list(value)
+    return [value]
+
+
+class Deduplicator:
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._by_url: Dict[str, str] = {}
+        self._by_hash: Dict[str, str] = {}
+        self._anchors: Dict[int, List[str]] = {}
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self.stats = {"url": 0, "content_hash": 0, "near_duplicate": 0}
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    def match(self, fp: Fingerprint) -> Optional[Tuple[str, str]]:
+        if fp.canonical_url and fp.canonical_url in self._by_url:
+            return self._by_url[fp.canonical_url], "url"
+        if fp.content_hash and fp.content_hash in self._by_hash:
+            return self._by_hash[fp.content_hash], "content_hash"
+        if fp.signature is not None:
+            # Sketches that are similar enough almost always share one of their
+            # few smallest hashes, so only those need an index. Anchors shared by
+            # many sources are boilerplate shingles and carry no signal.
+            seen = set()
+            for anchor in fp.signature[:SKETCH_ANCHORS]:
+                postings = self._anchors.get(anchor, ())
+                if len(postings) > MAX_ANCHOR_POSTINGS:
+                    continue
+                for source_id in postings:
+                    if source_id in seen:
+                        continue
+                    seen.add(source_id)
+                    similarity = estimate_similarity(
+                        self._signatures[source_id], fp.signature
+                    )
+                    if similarity >= self.threshold:
+                        return source_id, "near_duplicate"
+        return None
+
+    def add(self, source_id: str, fp: Fingerprint):
+        if fp.canonical_url:
+            self._by_url.setdefault(fp.canonical_url, source_id)
+        if fp.content_hash:
+            self._by_hash.setdefault(fp.content_hash, source_id)
+        if fp.signature is not None and source_id not in self._signatures:
+            self._signatures[source_id] = fp.signature
+            for anchor in fp.signature[:SKETCH_ANCHORS]:
+                self._anchors.setdefault(anchor, []).append(source_id)
+
+    def record(self, reason: str):
+        self.stats[reason] += 1
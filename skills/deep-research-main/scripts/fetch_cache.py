@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Shared fetch cache under RESEARCH/_cache/, reused across research sessions.
+
+Entries are keyed by canonical URL (see dedup.canonicalize_url). Bodies are
+stored once per sha256 digest under blobs/, which is the same value sources
+carry as content_hash. Entries expire per source type, and the blob store is
+held under a byte cap by evicting the least recently used bodies.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from dedup import canonicalize_url
+from tracing import span
+
+
+CACHE_DIR = "_cache"
+INDEX_FILE = "index.db"
+BLOB_DIR = "blobs"
+
+DAY = 24 * 60 * 60
+DEFAULT_TTLS = {
+    "news": 1 * DAY,
+    "blog": 7 * DAY,
+    "official": 30 * DAY,
+    "academic": 180 * DAY,
+}
+DEFAULT_TTL = 7 * DAY
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+FETCH_TIMEOUT_SECONDS = 30
+USER_AGENT = "deep-research-kit/1.0"
+
+# "fetches" counts network fetches; expired lookups are also misses.
+STAT_NAMES = ("fetches", "hits", "misses", "expired", "evictions", "bytes_fetched")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    canonical_url TEXT PRIMARY KEY,
+    url TEXT,
+    content_hash TEXT,
+    content_type TEXT,
+    source_type TEXT,
+    fetched_at REAL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_hash ON entries(content_hash);
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    size INTEGER,
+    last_access REAL
+);
+CREATE INDEX IF NOT EXISTS idx_blobs_access ON blobs(last_access);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER
+);
+"""
+
+Fetcher = Callable[[str], Tuple[bytes, Optional[str]]]
+
+
+def urllib_fetcher(url: str) -> Tuple[bytes, Optional[str]]:
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT_SECONDS) as response:
+        return response.read(), response.headers.get("Content-Type")
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    canonical_url: str
+    content_hash: str
+    content_type: Optional[str]
+    fetched_at: float
+    expires_at: float
+    from_cache: bool
+    path: Path
+
+    @property
+    def body(self) -> bytes:
+        return self.path.read_bytes()
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="replace")
+
+
+class FetchCache:
+    def __init__(
+        self,
+        base_path: Path = Path("RESEARCH"),
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Dict[str, float]] = None,
+        fetcher: Optional[Fetcher] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(base_path) / CACHE_DIR
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.fetcher = fetcher or urllib_fetcher
+        self.clock = clock
+        self.session_stats = dict.fromkeys(STAT_NAMES, 0)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            (self.path / BLOB_DIR).mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.path / INDEX_FILE), timeout=30, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def ttl_for(self, source_type: Optional[str]) -> float:
+        return self.ttls.get(source_type or "", DEFAULT_TTL)
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self.path / BLOB_DIR / content_hash[:2] / content_hash
+
+    def _count(self, conn: sqlite3.Connection, name: str, amount: int = 1):
+        self.session_stats[name] += amount
+        conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, ?) ON CONFLICT(name) "
+            "DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Fresh cached response for url, or None (counted as a miss)."""
+        canonical = canonicalize_url(url)
+        now = self.clock()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                row = conn.execute(
+                    "SELECT content_hash, content_type, fetched_at, expires_at "
+                    "FROM entries WHERE canonical_url = ?",
+                    (canonical,),
+                ).fetchone()
+                if row is not None and row[3] <= now:
+                    self._count(conn, "expired")
+                    row = None
+                if row is not None and not self._blob_path(row[0]).exists():
+                    # Blob removed behind our back; treat as a miss.
+                    conn.execute(
+                        "DELETE FROM entries WHERE canonical_url = ?", (canonical,)
+                    )
+                    row = None
+                if row is None:
+                    self._count(conn, "misses")
+                    return None
+
+                self._count(conn, "hits")
+                conn.execute(
+                    "UPDATE blobs SET last_access = ? WHERE content_hash = ?",
+                    (now, row[0]),
+                )
+        content_hash, content_type, fetched_at, expires_at = row
+        return CachedResponse(
+            url=url,
+            canonical_url=canonical,
+            content_hash=content_hash,
+            content_type=content_type,
+            fetched_at=fetched_at,
+            expires_at=expires_at,
+            from_cache=True,
+            path=self._blob_path(content_hash),
+        )
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        source_type: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> CachedResponse:
+        canonical = canonicalize_url(url)
+        content_hash = hashlib.sha256(body).hexdigest()
+        blob = self._blob_path(content_hash)
+        now = self.clock()
+        expires_at = now + self.ttl_for(source_type)
+
+        with self._lock:
+            conn = self._connection()
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp = blob.with_name(
+                    f"{blob.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+                )
+                tmp.write_bytes(body)
+                os.replace(tmp, blob)
+            with conn:
+                conn.execute(
+                    "INSERT INTO blobs (content_hash, size, last_access) "
+                    "VALUES (?, ?, ?) ON CONFLICT(content_hash) DO UPDATE SET "
+                    "last_access = excluded.last_access",
+                    (content_hash, len(body), now),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (canonical_url, url, content_hash, "
+                    "content_type, source_type, fetched_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        canonical,
+                        url,
+                        content_hash,
+                        content_type,
+                        source_type,
+                        now,
+                        expires_at,
+                    ),
+                )
+            self._evict(keep=content_hash)
+
+        return CachedResponse(
+            url=url,
+            canonical_url=canonical,
+            content_hash=content_hash,
+            content_type=content_type,
+            fetched_at=now,
+            expires_at=expires_at,
+            from_cache=False,
+            path=blob,
+        )
+
+    def fetch(self, url: str, source_type: Optional[str] = None) -> CachedResponse:
+        """Return the cached body for url, fetching and storing it on a miss."""
+        with span("fetch", "fetch", url=url) as fetch_span:
+            cached = self.get(url)
+            if fetch_span is not None:
+                fetch_span.args["from_cache"] = cached is not None
+            if cached is not None:
+                return cached
+            body, content_type = self.fetcher(url)
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    self._count(conn, "fetches")
+                    self._count(conn, "bytes_fetched", len(body))
+            if fetch_span is not None:
+                fetch_span.args["bytes"] = len(body)
+            return self.put(url, body, source_type, content_type)
+
+    def invalidate(self, url: str) -> bool:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM entries WHERE canonical_url = ?",
+                    (canonicalize_url(url),),
+                ).rowcount
+            self._drop_orphans()
+        return deleted > 0
+
+    def prune(self) -> int:
+        """Drop expired entries and any bodies no longer referenced."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                removed = conn.execute(
+                    "DELETE FROM entries WHERE expires_at <= ?", (self.clock(),)
+                ).rowcount
+            self._drop_orphans()
+        return removed
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return (
+                self._connection()
+                .execute("SELECT COALESCE(SUM(size), 0) FROM blobs")
+                .fetchone()[0]
+            )
+
+    def _remove_blobs(self, conn: sqlite3.Connection, hashes):
+        for content_hash in hashes:
+            conn.execute("DELETE FROM blobs WHERE content_hash = ?", (content_hash,))
+            conn.execute("DELETE FROM entries WHERE content_hash = ?", (content_hash,))
+            try:
+                self._blob_path(content_hash).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _drop_orphans(self):
+        conn = self._connection()
+        with conn:
+            orphans = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT content_hash FROM blobs WHERE content_hash NOT IN "
+                    "(SELECT content_hash FROM entries)"
+                )
+            ]
+            self._remove_blobs(conn, orphans)
+
+    def _evict(self, keep: Optional[str] = None):
+        conn = self._connection()
+        with conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for content_hash, size in conn.execute(
+                "SELECT content_hash, size FROM blobs ORDER BY last_access"
+            ):
+                if total <= self.max_bytes:
+                    break
+                if content_hash == keep:
+                    continue
+                victims.append(content_hash)
+                total -= size
+            self._remove_blobs(conn, victims)
+            self._count(conn, "evictions", len(victims))
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            conn = self._connection()
+            totals = dict.fromkeys(STAT_NAMES, 0)
+            totals.update(conn.execute("SELECT name, value FROM stats"))
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            blobs, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs"
+            ).fetchone()
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            **totals,
+            "hit_rate": round(totals["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "blobs": blobs,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "session": dict(self.session_stats),
+        }
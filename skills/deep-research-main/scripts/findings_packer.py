@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Findings Packer - fills a token budget for get_synthesis_prompt with the most
+useful verified claims and source snippets of one subtopic.
+
+Items are ranked by source quality, corroboration and recency. Near-duplicate
+snippets are skipped (MinHash, as in dedup), E-rated sources are left out, and
+every item that does not make it in is listed in a manifest with the reason.
+"""
+
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dedup import NEAR_DUPLICATE_THRESHOLD, estimate_similarity, minhash
+from pipelines import estimate_tokens, get_synthesis_prompt
+from triangulation import QUALITY_WEIGHTS, UNRATED_WEIGHT
+
+EXCLUDED_GRADES = ("E",)
+MAX_SNIPPET_CHARS = 800
+_YEAR_RE = re.compile(r"(19|20)\d{2}")
+
+
+@dataclass
+class PackedFindings:
+    text: str
+    budget_tokens: int
+    used_tokens: int
+    included: List[Dict[str, Any]] = field(default_factory=list)
+    dropped: List[Dict[str, Any]] = field(default_factory=list)
+
+    def manifest(self) -> Dict[str, Any]:
+        return {
+            "budget_tokens": self.budget_tokens,
+            "used_tokens": self.used_tokens,
+            "included": self.included,
+            "dropped": self.dropped,
+        }
+
+
+def _grade(source: Dict[str, Any]) -> str:
+    return (source.get("quality_rating") or "").strip().upper()[:1]
+
+
+def _recency(source: Dict[str, Any], year: int) -> float:
+    match = _YEAR_RE.search(str(source.get("date") or ""))
+    if not match:
+        return 0.5
+    age = max(0, year - int(match.group()))
+    return 1.0 / (1.0 + age / 2.0)
+
+
+def _source_line(source: Dict[str, Any]) -> str:
+    snippet = " ".join((source.get("snippet") or "").split())
+    if len(snippet) > MAX_SNIPPET_CHARS:
+        snippet = snippet[:MAX_SNIPPET_CHARS].rsplit(" ", 1)[0] + "…"
+    meta = ", ".join(
+        part for part in (_grade(source), str(source.get("date") or "")) if part
+    )
+    title = source.get("title") or source.get("url") or source["id"]
+    line = f"- [{source['id']}] ({meta}) {title}: {snippet}"
+    if source.get("url"):
+        line += f" <{source['url']}>"
+    return line
+
+
+def _claim_line(claim: Dict[str, Any]) -> str:
+    return (
+        f"- {claim['claim']} [{', '.join(claim['sources'])}] "
+        f"(confidence: {claim.get('confidence', 'unknown')})"
+    )
+
+
+def pack_findings(
+    sources: Iterable[Dict[str, Any]],
+    verified_claims: Optional[List[Dict[str, Any]]] = None,
+    budget_tokens: int = 8000,
+    now: Optional[datetime] = None,
+) -> PackedFindings:
+    year = (now or datetime.now()).year
+    sources = list(sources)
+    by_id = {source["id"]: source for source in sources}
+
+    corroboration: Dict[str, int] = {}
+    for claim in verified_claims or []:
+        for source_id in claim.get("sources") or []:
+            corroboration[source_id] = corroboration.get(source_id, 0) + 1
+
+    # (score, kind, id, line, source or None)
+    candidates: List[Tuple[float, str, str, str, Optional[Dict[str, Any]]]] = []
+    dropped: List[Dict[str, Any]] = []
+
+    for index, claim in enumerate(verified_claims or []):
+        if not claim.get("sources"):
+            # Nothing backs it, so it is not a verified claim.
+            dropped.append(
+                {"kind": "claim", "id": f"claim_{index}", "reason": "no_sources"}
+            )
+            continue
+        backing = [by_id[s] for s in claim["sources"] if s in by_id]
+        quality = max(
+            (QUALITY_WEIGHTS.get(_grade(s), UNRATED_WEIGHT) for s in backing),
+            default=UNRATED_WEIGHT,
+        )
+        recency = max((_recency(s, year) for s in backing), default=0.5)
+        score = quality * (1 + math.log2(len(claim["sources"]))) * recency
+        # Claims carry the corroborated content; rank them ahead of raw snippets.
+        line = _claim_line(claim)
+        candidates.append((score + 1.0, "claim", f"claim_{index}", line, None))
+
+    for source in sources:
+        grade = _grade(source)
+        if grade in EXCLUDED_GRADES:
+            dropped.append({"kind": "source", "id": source["id"], "reason": "quality"})
+            continue
+        if not source.get("snippet"):
+            dropped.append(
+                {"kind": "source", "id": source["id"], "reason": "no_snippet"}
+            )
+            continue
+        score = (
+            QUALITY_WEIGHTS.get(grade, UNRATED_WEIGHT)
+            * (1 + math.log2(1 + corroboration.get(source["id"], 0)))
+            * _recency(source, year)
+        )
+        line = _source_line(source)
+        candidates.append((score, "source", source["id"], line, source))
+
+    candidates.sort(key=lambda item: -item[0])
+
+    lines: List[str] = []
+    included: List[Dict[str, Any]] = []
+    kept_sketches: List[Tuple[str, Tuple[int, ...]]] = []
+    used = 0
+    for score, kind, item_id, line, source in candidates:
+        entry = {"kind": kind, "id": item_id, "score": round(score, 3)}
+        tokens = estimate_tokens(line) + 1
+        if used + tokens > budget_tokens:
+            dropped.append({**entry, "tokens": tokens, "reason": "budget"})
+            continue
+
+        # Only items that fit are compared, so this stays bounded by the budget.
+        sketch = minhash(source["snippet"]) if source is not None else None
+        if sketch is not None:
+            duplicate_of = next(
+                (
+                    kept_id
+                    for kept_id, kept in kept_sketches
+                    if estimate_similarity(sketch, kept) >= NEAR_DUPLICATE_THRESHOLD
+                ),
+                None,
+            )
+            if duplicate_of is not None:
+                dropped.append({**entry, "reason": f"duplicate_of:{duplicate_of}"})
+                continue
+
+        used += tokens
+        lines.append(line)
+        included.append({**entry, "tokens": tokens})
+        if sketch is not None:
+            kept_sketches.append((item_id, sketch))
+
+    return PackedFindings(
+        text="\n".join(lines),
+        budget_tokens=budget_tokens,
+        used_tokens=used,
+        included=included,
+        dropped=dropped,
+    )
+
+
+def pack_synthesis_prompt(
+    state,
+    subtopic: str,
+    budget_tokens: int = 8000,
+    verified_claims: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[str, PackedFindings]:
+    """
+    Build the Phase 5 prompt for one subtopic from the session store and save
+    the manifest to artifacts/synthesis/<subtopic>_manifest.json.
+    """
+    sources = state.query_sources(subtopic=subtopic)
+    source_ids = {source["id"] for source in sources}
+    claims = [
+        claim
+        for claim in verified_claims or []
+        if source_ids.intersection(claim["sources"])
+    ]
+    packed = pack_findings(sources, claims, budget_tokens)
+
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", subtopic).strip("_")[:60] or "subtopic"
+    state.save_artifact(
+        f"{slug}_manifest.json",
+        json.dumps(
+            {"subtopic": subtopic, **packed.manifest()}, indent=2, ensure_ascii=False
+        ),
+        subfolder="synthesis",
+    )
+    prompt = get_synthesis_prompt(subtopic, packed.text)
+    state.record_metric(
+        "prompt", name="synthesis", subtopic=subtopic, tokens=estimate_tokens(prompt)
+    )
+    return prompt, packed
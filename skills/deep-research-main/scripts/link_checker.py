@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Link Checker - concurrent URL accessibility checks for the Phase 6 QA item
+"All URLs are accessible and valid".
+
+Checks run on asyncio with one small connection pool per host (HTTP/1.1
+keep-alive), HEAD first and GET when HEAD is refused. Each host gets its own
+concurrency cap and request rate, 429 responses back the whole host off for
+Retry-After, and verdicts are cached with a TTL in RESEARCH/_cache/links.db so
+later sessions do not re-check the same URLs.
+"""
+
+import asyncio
+import socket
+import sqlite3
+import ssl
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from dedup import canonicalize_url
+from fetch_cache import CACHE_DIR, USER_AGENT
+
+LINKS_DB = "links.db"
+
+OK = "ok"
+BROKEN = "broken"
+RESTRICTED = "restricted"
+RATE_LIMITED = "rate_limited"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+HOUR = 60 * 60
+# Transient verdicts (rate_limited, timeout, error) are not cached.
+DEFAULT_TTLS = {
+    OK: 7 * 24 * HOUR,
+    RESTRICTED: 7 * 24 * HOUR,
+    BROKEN: 24 * HOUR,
+}
+
+MAX_REDIRECTS = 5
+MAX_RETRY_AFTER = 60.0
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    canonical_url TEXT PRIMARY KEY,
+    url TEXT,
+    status TEXT,
+    http_status INTEGER,
+    final_url TEXT,
+    checked_at REAL,
+    expires_at REAL
+);
+"""
+
+
+@dataclass
+class LinkResult:
+    url: str
+    status: str
+    http_status: Optional[int] = None
+    final_url: Optional[str] = None
+    method: Optional[str] = None
+    error: Optional[str] = None
+    checked_at: float = 0.0
+    from_cache: bool = False
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _verdict(http_status: int) -> str:
+    if http_status < 400:
+        return OK
+    if http_status == 429:
+        return RATE_LIMITED
+    if http_status in (401, 403, 407, 451):
+        # Reachable, but gated (paywall, login, bot wall).
+        return RESTRICTED
+    if http_status < 500:
+        return BROKEN
+    return ERROR
+
+
+def _retry_after(headers: Dict[str, str], default: float) -> float:
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(headers["retry-after"])))
+    except (KeyError, ValueError):
+        # HTTP-date values are rare for 429; fall back to our own backoff.
+        return default
+
+
+class _HostPool:
+    """Idle keep-alive connections, concurrency cap and request pacing of a host."""
+
+    def __init__(self, limit: int, interval: float):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.interval = interval
+        self.idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.next_slot = 0.0
+        self.opened = 0
+        self.requests = 0
+
+    async def wait_turn(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def back_off(self, seconds: float):
+        now = asyncio.get_running_loop().time()
+        self.next_slot = max(self.next_slot, now + seconds)
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+class LinkChecker:
+    def __init__(
+        self,
+        base_path: Path = Path("RESEARCH"),
+        max_connections: int = 32,
+        max_per_host: int = 2,
+        requests_per_second: float = 4.0,
+        timeout: float = 10.0,
+        retries: int = 1,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(base_path) / CACHE_DIR
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.timeout = timeout
+        self.retries = retries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.clock = clock
+        self.stats = {"checked": 0, "cached": 0, "requests": 0, "connections": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._ssl = ssl.create_default_context()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.path / LINKS_DB), timeout=30, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def cached(self, url: str) -> Optional[LinkResult]:
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT status, http_status, final_url, checked_at FROM links "
+                    "WHERE canonical_url = ? AND expires_at > ?",
+                    (canonicalize_url(url), self.clock()),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        status, http_status, final_url, checked_at = row
+        return LinkResult(
+            url=url,
+            status=status,
+            http_status=http_status,
+            final_url=final_url,
+            checked_at=checked_at,
+            from_cache=True,
+        )
+
+    def _remember(self, results: Iterable[LinkResult]):
+        rows = [
+            (
+                canonicalize_url(result.url),
+                result.url,
+                result.status,
+                result.http_status,
+                result.final_url,
+                result.checked_at,
+                result.checked_at + self.ttls[result.status],
+            )
+            for result in results
+            if not result.from_cache and result.status in self.ttls
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO links (canonical_url, url, status, "
+                    "http_status, final_url, checked_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    async def _open(self, scheme: str, host: str, port: int):
+        return await asyncio.open_connection(
+            host,
+            port,
+            ssl=self._ssl if scheme == "https" else None,
+            server_hostname=host if scheme == "https" else None,
+        )
+
+    async def _exchange(
+        self, pool: _HostPool, method: str, url: str
+    ) -> Tuple[int, Dict[str, str]]:
+        """One request on a pooled connection; returns (status, lowercased headers)."""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").encode("idna").decode("ascii")
+        port = parts.port or (443 if scheme == "https" else 80)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host_header = host if parts.port is None else f"{host}:{parts.port}"
+        request = (
+            f"{method} {target} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            f"User-Agent: {USER_AGENT}\r\n"
+            "Accept: */*\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1")
+
+        while True:
+            reused = bool(pool.idle)
+            if reused:
+                reader, writer = pool.idle.pop()
+            else:
+                reader, writer = await self._open(scheme, host, port)
+                pool.opened += 1
+                self.stats["connections"] += 1
+            try:
+                writer.write(request)
+                await writer.drain()
+                status_line = await reader.readline()
+                if not status_line:
+                    raise ConnectionResetError("connection closed by peer")
+                version, status = status_line.decode("latin-1").split()[:2]
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+            except (ConnectionError, ValueError):
+                writer.close()
+                if reused:
+                    # The server dropped an idle keep-alive connection; retry fresh.
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            break
+
+        pool.requests += 1
+        self.stats["requests"] += 1
+        # HEAD responses carry no body, so the connection can go back to the pool.
+        # GET bodies are never read; that connection is closed instead.
+        if (
+            method == "HEAD"
+            and version == "HTTP/1.1"
+            and headers.get("connection", "").lower() != "close"
+        ):
+            pool.idle.append((reader, writer))
+        else:
+            writer.close()
+        return int(status), headers
+
+    async def _status(
+        self, pools: Dict[Tuple[str, str], _HostPool], url: str
+    ) -> Tuple[int, Dict[str, str], str]:
+        """HEAD, then GET if HEAD is refused, within the host's limits."""
+        parts = urlsplit(url)
+        key = (parts.scheme.lower(), parts.netloc.lower())
+        pool = pools.get(key)
+        if pool is None:
+            pool = pools[key] = _HostPool(self.max_per_host, self.interval)
+
+        async with pool.semaphore:
+            method = "HEAD"
+            for attempt in range(self.retries + 1):
+                await pool.wait_turn()
+                status, headers = await asyncio.wait_for(
+                    self._exchange(pool, method, url), self.timeout
+                )
+                if status == 429:
+                    pool.back_off(
+                        _retry_after(headers, max(self.interval, 1.0) * 2**attempt)
+                    )
+                    continue
+                if method == "HEAD" and status >= 400:
+                    # Plenty of servers reject or mishandle HEAD; confirm with GET.
+                    method = "GET"
+                    await pool.wait_turn()
+                    status, headers = await asyncio.wait_for(
+                        self._exchange(pool, method, url), self.timeout
+                    )
+                return status, headers, method
+            return status, headers, method
+
+    async def _follow(
+        self, result: LinkResult, pools: Dict[Tuple[str, str], _HostPool]
+    ):
+        """Resolve result.url through redirects and set its verdict."""
+        current = result.url
+        for _ in range(MAX_REDIRECTS + 1):
+            if urlsplit(current).scheme.lower() not in ("http", "https"):
+                result.status = BROKEN
+                result.error = "unsupported scheme"
+                break
+            status, headers, method = await self._status(pools, current)
+            result.http_status = status
+            result.method = method
+            if status in REDIRECT_STATUSES and headers.get("location"):
+                current = urljoin(current, headers["location"])
+                continue
+            result.status = _verdict(status)
+            break
+        else:
+            result.status = BROKEN
+            result.error = "too many redirects"
+        if current != result.url:
+            result.final_url = current
+
+    async def _check(
+        self,
+        url: str,
+        pools: Dict[Tuple[str, str], _HostPool],
+        limit: asyncio.Semaphore,
+    ) -> LinkResult:
+        async with limit:
+            result = LinkResult(url=url, status=ERROR)
+            for _ in range(self.retries + 1):
+                result.error = None
+                try:
+                    await self._follow(result, pools)
+                    break
+                except asyncio.TimeoutError:
+                    result.status = TIMEOUT
+                    result.error = f"no response within {self.timeout}s"
+                except socket.gaierror as e:
+                    result.status = BROKEN
+                    result.error = f"DNS lookup failed: {e}"
+                    break
+                except (OSError, ValueError, UnicodeError) as e:
+                    result.status = ERROR
+                    result.error = f"{type(e).__name__}: {e}"
+            result.checked_at = self.clock()
+            return result
+
+    async def check_all(self, urls: Iterable[str]) -> Dict[str, LinkResult]:
+        """Check each distinct URL once; cached verdicts are returned as-is."""
+        results: Dict[str, LinkResult] = {}
+        pending: List[str] = []
+        for url in dict.fromkeys(urls):
+            cached = self.cached(url)
+            if cached is not None:
+                results[url] = cached
+                self.stats["cached"] += 1
+            else:
+                pending.append(url)
+
+        pools: Dict[Tuple[str, str], _HostPool] = {}
+        limit = asyncio.Semaphore(self.max_connections)
+        try:
+            checked = await asyncio.gather(
+                *(self._check(url, pools, limit) for url in pending)
+            )
+        finally:
+            for pool in pools.values():
+                pool.close()
+        self.stats["checked"] += len(checked)
+        self._remember(checked)
+        results.update((result.url, result) for result in checked)
+        return results
+
+    def check_urls(self, urls: Iterable[str]) -> Dict[str, LinkResult]:
+        return asyncio.run(self.check_all(urls))
+
+
+def check_session_links(state, **kwargs) -> Dict:
+    """
+    Check every source URL of the session and write link_status,
+    link_http_status and link_checked_at (plus link_final_url after redirects)
+    back onto the source records.
+    """
+    sources = [source for source in state.iter_sources() if source.get("url")]
+    checker = LinkChecker(state.base_path, **kwargs)
+    started = time.perf_counter()
+    try:
+        results = checker.check_urls(source["url"] for source in sources)
+    finally:
+        checker.close()
+
+    updated = []
+    counts: Dict[str, int] = {}
+    for source in sources:
+        result = results[source["url"]]
+        counts[result.status] = counts.get(result.status, 0) + 1
+        fields = {
+            "link_status": result.status,
+            "link_http_status": result.http_status,
+            "link_checked_at": datetime.fromtimestamp(result.checked_at).isoformat(
+                timespec="seconds"
+            ),
+        }
+        if result.final_url:
+            fields["link_final_url"] = result.final_url
+        if any(source.get(name) != value for name, value in fields.items()):
+            updated.append({**source, **fields})
+    state.add_sources(updated, dedup=False)
+
+    return {
+        "sources": len(sources),
+        "urls": len(results),
+        "by_status": counts,
+        "broken": [
+            source["id"]
+            for source in sources
+            if results[source["url"]].status == BROKEN
+        ],
+        "stats": dict(checker.stats),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
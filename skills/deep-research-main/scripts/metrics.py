@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Session Metrics - append-only artifacts/metrics.jsonl written by ResearchState
+and the agent scheduler, with summaries for README.md and a Prometheus text
+export (`orchestrator.py metrics <session_id> --prometheus`).
+
+Record kinds: phase (duration per phase run), agent (wall time, outcome and
+prompt size per AgentTask), ingest (sources per SourceWriter flush), mutations
+(journal and snapshot bytes since the last snapshot), prompt (token
+estimates of generated prompts) and fetch (network fetches and FetchCache
+hits/misses of one cache run).
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from fetch_cache import STAT_NAMES as FETCH_STATS
+
+METRICS_FILE = "artifacts/metrics.jsonl"
+PROMETHEUS_PREFIX = "deep_research"
+
+
+class MetricsLog:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def record(self, kind: str, **fields: Any):
+        line = json.dumps(
+            {"ts": datetime.now().isoformat(), "kind": kind, **fields},
+            ensure_ascii=False,
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One O_APPEND write per record keeps lines whole across processes.
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (line + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    phases: Dict[str, Dict[str, Any]] = {}
+    agent_seconds: List[float] = []
+    agents: Dict[str, Any] = {"by_outcome": {}, "by_type": {}}
+    ingest = {"batches": 0, "sources": 0, "merged": 0, "seconds": 0.0}
+    mutations = {"events": 0, "journal_bytes": 0, "snapshots": 0, "snapshot_bytes": 0}
+    prompts: Dict[str, Dict[str, int]] = {}
+    fetch: Dict[str, Any] = dict.fromkeys(FETCH_STATS, 0)
+
+    def add_prompt(name: str, tokens: int):
+        entry = prompts.setdefault(name, {"count": 0, "tokens": 0, "max_tokens": 0})
+        entry["count"] += 1
+        entry["tokens"] += tokens
+        entry["max_tokens"] = max(entry["max_tokens"], tokens)
+
+    for record in records:
+        kind = record.get("kind")
+        if kind == "phase":
+            entry = phases.setdefault(
+                str(record["phase"]),
+                {"name": record.get("name"), "runs": 0, "seconds_total": 0.0},
+            )
+            entry["runs"] += 1
+            entry["status"] = record["status"]
+            entry["seconds"] = record.get("seconds")
+            entry["seconds_total"] += record.get("seconds") or 0.0
+        elif kind == "agent":
+            seconds = record.get("seconds") or 0.0
+            agent_seconds.append(seconds)
+            outcome = record.get("outcome", "unknown")
+            agents["by_outcome"][outcome] = agents["by_outcome"].get(outcome, 0) + 1
+            by_type = agents["by_type"].setdefault(
+                record.get("agent_type", "unknown"), {"count": 0, "seconds": 0.0}
+            )
+            by_type["count"] += 1
+            by_type["seconds"] += seconds
+            if record.get("prompt_tokens"):
+                add_prompt(f"agent:{record.get('agent_type')}", record["prompt_tokens"])
+        elif kind == "ingest":
+            ingest["batches"] += 1
+            ingest["sources"] += record.get("sources", 0)
+            ingest["merged"] += record.get("merged", 0)
+            ingest["seconds"] += record.get("seconds", 0.0)
+        elif kind == "mutations":
+            for key in mutations:
+                mutations[key] += record.get(key, 0)
+        elif kind == "prompt":
+            add_prompt(record["name"], record.get("tokens", 0))
+        elif kind == "fetch":
+            for key in FETCH_STATS:
+                fetch[key] += record.get(key, 0)
+
+    agents.update(
+        {
+            "count": len(agent_seconds),
+            "seconds_total": round(sum(agent_seconds), 3),
+            "p50_seconds": round(_percentile(agent_seconds, 0.5), 3),
+            "p95_seconds": round(_percentile(agent_seconds, 0.95), 3),
+            "max_seconds": round(max(agent_seconds, default=0.0), 3),
+        }
+    )
+    ingest["seconds"] = round(ingest["seconds"], 3)
+    ingest["sources_per_sec"] = (
+        round(ingest["sources"] / ingest["seconds"], 1) if ingest["seconds"] else None
+    )
+    written = mutations["journal_bytes"] + mutations["snapshot_bytes"]
+    mutations["bytes_per_event"] = (
+        round(written / mutations["events"]) if mutations["events"] else None
+    )
+    lookups = fetch["hits"] + fetch["misses"]
+    fetch["hit_rate"] = round(fetch["hits"] / lookups, 3) if lookups else None
+    return {
+        "phases": phases,
+        "agents": agents,
+        "ingest": ingest,
+        "mutations": mutations,
+        "prompts": prompts,
+        "fetch": fetch,
+    }
+
+
+def _seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def summary_table(summary: Dict[str, Any]) -> str:
+    """Markdown table for the session README."""
+    rows = []
+    for phase, entry in sorted(summary["phases"].items(), key=lambda i: int(i[0])):
+        label = f"Phase {phase} ({entry['name']})" if entry.get("name") else phase
+        rows.append((label, f"{_seconds(entry.get('seconds'))} ({entry['status']})"))
+
+    agents = summary["agents"]
+    if agents["count"]:
+        outcomes = ", ".join(
+            f"{count} {outcome}"
+            for outcome, count in sorted(agents["by_outcome"].items())
+        )
+        rows.append(("Agent tasks", outcomes))
+        rows.append(
+            (
+                "Agent wall time",
+                f"p50 {_seconds(agents['p50_seconds'])}, "
+                f"p95 {_seconds(agents['p95_seconds'])}, "
+                f"max {_seconds(agents['max_seconds'])}",
+            )
+        )
+
+    ingest = summary["ingest"]
+    if ingest["batches"]:
+        rate = ingest["sources_per_sec"]
+        rows.append(
+            (
+                "Sources ingested",
+                f"{ingest['sources']} ({rate if rate is not None else '-'} sources/s)",
+            )
+        )
+
+    mutations = summary["mutations"]
+    if mutations["events"]:
+        rows.append(
+            (
+                "State writes",
+                f"{mutations['events']} events, {mutations['bytes_per_event']} "
+                "bytes/event incl. snapshots",
+            )
+        )
+
+    fetch = summary["fetch"]
+    if fetch["hits"] or fetch["misses"]:
+        rows.append(
+            (
+                "Fetches",
+                f"{fetch['fetches']} network, {fetch['hits']} cache hits / "
+                f"{fetch['misses']} misses ({fetch['hit_rate']:.0%} hit rate)",
+            )
+        )
+
+    for name, entry in sorted(summary["prompts"].items()):
+        rows.append(
+            (
+                f"Prompt tokens ({name})",
+                f"{entry['tokens']} over {entry['count']}, max {entry['max_tokens']}",
+            )
+        )
+
+    if not rows:
+        return "_No metrics recorded yet._"
+    lines = ["| Metric | Value |", "|--------|-------|"]
+    lines.extend(f"| {label} | {value} |" for label, value in rows)
+    return "\n".join(lines)
+
+
+def _labels(**labels: Any) -> str:
+    parts = []
+    for name, value in labels.items():
+        text = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{text}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def to_prometheus(summary: Dict[str, Any], session_id: str) -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples):
+        full = f"{PROMETHEUS_PREFIX}_{name}"
+        lines.append(f"# HELP {full} {help_text}")
+        lines.append(f"# TYPE {full} {kind}")
+        for suffix, labels, value in samples:
+            lines.append(
+                f"{full}{suffix}{_labels(session=session_id, **labels)} {value}"
+            )
+
+    metric(
+        "phase_duration_seconds",
+        "gauge",
+        "Wall time of the latest run of each phase.",
+        [
+            ("", {"phase": phase, "name": entry.get("name") or ""}, entry["seconds"])
+            for phase, entry in sorted(summary["phases"].items())
+            if entry.get("seconds") is not None
+        ],
+    )
+    agents = summary["agents"]
+    metric(
+        "agent_tasks_total",
+        "counter",
+        "Finished agent tasks by outcome.",
+        [("", {"outcome": o}, n) for o, n in sorted(agents["by_outcome"].items())],
+    )
+    metric(
+        "agent_task_seconds",
+        "summary",
+        "Agent task wall time.",
+        [
+            ("", {"quantile": "0.5"}, agents["p50_seconds"]),
+            ("", {"quantile": "0.95"}, agents["p95_seconds"]),
+            ("_sum", {}, agents["seconds_total"]),
+            ("_count", {}, agents["count"]),
+        ],
+    )
+    ingest = summary["ingest"]
+    metric(
+        "sources_ingested_total",
+        "counter",
+        "Sources added to the session.",
+        [("", {}, ingest["sources"])],
+    )
+    metric(
+        "ingest_seconds_total",
+        "counter",
+        "Time spent ingesting sources.",
+        [("", {}, ingest["seconds"])],
+    )
+    mutations = summary["mutations"]
+    metric(
+        "state_events_total",
+        "counter",
+        "Journaled state mutations.",
+        [("", {}, mutations["events"])],
+    )
+    metric(
+        "state_bytes_written_total",
+        "counter",
+        "Bytes written for session state.",
+        [
+            ("", {"kind": "journal"}, mutations["journal_bytes"]),
+            ("", {"kind": "snapshot"}, mutations["snapshot_bytes"]),
+        ],
+    )
+    fetch = summary["fetch"]
+    metric(
+        "fetches_total",
+        "counter",
+        "Network fetches made through the fetch cache.",
+        [("", {}, fetch["fetches"])],
+    )
+    metric(
+        "fetch_bytes_total",
+        "counter",
+        "Bytes fetched from the network.",
+        [("", {}, fetch["bytes_fetched"])],
+    )
+    metric(
+        "fetch_cache_lookups_total",
+        "counter",
+        "Fetch cache lookups by result (expired entries count as misses).",
+        [
+            ("", {"result": "hit"}, fetch["hits"]),
+            ("", {"result": "miss"}, fetch["misses"]),
+        ],
+    )
+    metric(
+        "fetch_cache_expired_total",
+        "counter",
+        "Fetch cache lookups that found an expired entry.",
+        [("", {}, fetch["expired"])],
+    )
+    metric(
+        "fetch_cache_evictions_total",
+        "counter",
+        "Cached bodies evicted to stay under the size cap.",
+        [("", {}, fetch["evictions"])],
+    )
+    metric(
+        "prompt_tokens_total",
+        "counter",
+        "Estimated prompt tokens by prompt kind.",
+        [
+            ("", {"prompt": name}, entry["tokens"])
+            for name, entry in sorted(summary["prompts"].items())
+        ],
+    )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Numeric Claims - pulls (entity, metric, value, unit, year) tuples out of source
+claims and snippets, and flags numeric contradictions for the Phase 4
+`contradictions` block.
+
+Values are grouped by (entity, metric, unit, year). Within each group every
+value's relative deviation from the group median is computed in one pass
+(NumPy when installed, pure Python otherwise). Values beyond the tolerance are
+paired against the value closest to the consensus from another source.
+"""
+
+import re
+import statistics
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+RELATIVE_TOLERANCE = 0.1
+ENTITY_TOKENS = 3
+
+SCALES = {
+    "thousand": 1e3,
+    "k": 1e3,
+    "million": 1e6,
+    "mn": 1e6,
+    "m": 1e6,
+    "billion": 1e9,
+    "bn": 1e9,
+    "b": 1e9,
+    "trillion": 1e12,
+    "tn": 1e12,
+    "t": 1e12,
+}
+CURRENCIES = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY"}
+
+# First matching keyword names the metric; order matters ("cagr" before "grow",
+# "market" before "valued": a market "valued at $5B" is a market size).
+CURRENCY_METRICS = [
+    ("funding", "funding"),
+    ("raised", "funding"),
+    ("market", "market_size"),
+    ("valuation", "valuation"),
+    ("valued", "valuation"),
+    ("revenue", "revenue"),
+    ("sales", "revenue"),
+    ("cost", "cost"),
+    ("spend", "spending"),
+]
+PERCENT_METRICS = [
+    ("cagr", "growth_rate"),
+    ("growth", "growth_rate"),
+    ("grew", "growth_rate"),
+    ("grow", "growth_rate"),
+    ("adopt", "adoption"),
+    ("share", "market_share"),
+    ("use", "usage"),
+    ("using", "usage"),
+]
+
+STOPWORDS = frozenset(
+    """a an and are as at be been by for from has have in into is it its of on or
+    per the their this to was were which with about around approximately nearly
+    over roughly than almost some according reached reach hit hits totaled total
+    estimated expected projected forecast report reported reports says said
+    grew grow growing grows will would could may might worth now currently
+    just only had having hold holds held stood stands""".split()
+)
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9$€£¥])")
+_NUMBER_RE = re.compile(
+    r"(?<![\w.,])(?P<currency>[$€£¥])?\s?"
+    r"(?P<number>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+    r"(?:\s?(?P<percent>%|percent\b)"
+    r"|\s?(?P<scale>thousand|million|billion|trillion|mn|bn|tn|[kmbt])\b)?",
+    re.IGNORECASE,
+)
+_METRIC_KEYWORDS = tuple(keyword for keyword, _ in CURRENCY_METRICS + PERCENT_METRICS)
+_OWN_KEYWORDS = {
+    metric: tuple(k for k, m in CURRENCY_METRICS + PERCENT_METRICS if m == metric)
+    for _, metric in CURRENCY_METRICS + PERCENT_METRICS
+}
+_WORD_RE = re.compile(r"[a-z][a-z0-9-]*")
+# A capitalized word right before a bare number: "Windows 11", "COVID-19".
+_NAME_BEFORE_RE = re.compile(r"(?<![\w-])(\w*[A-Z]\w*)[ -]$")
+_YEAR_RE = re.compile(r"\b(19\d{2}|20\d{2})\b")
+
+
+@dataclass
+class NumericClaim:
+    entity: str
+    metric: str
+    value: float
+    unit: str
+    year: Optional[int]
+    source_id: str
+    text: str
+
+    @property
+    def key(self) -> Tuple[str, str, str, Optional[int]]:
+        return (self.entity, self.metric, self.unit, self.year)
+
+
+def _words(text: str) -> List[str]:
+    words = []
+    for word in _WORD_RE.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def _keyword_metric(table: List[Tuple[str, str]], words: List[str]) -> Optional[str]:
+    # One C-level startswith per word leaves few (usually no) words to scan.
+    hits = [word for word in words if word.startswith(_METRIC_KEYWORDS)]
+    for keyword, metric in table:
+        if any(word.startswith(keyword) for word in hits):
+            return metric
+    return None
+
+
+def _entity(before: List[str], after: List[str], metric: str) -> str:
+    keep = [w for w in before if w != metric and not w.startswith(_METRIC_KEYWORDS)]
+    if keep:
+        return " ".join(keep[-ENTITY_TOKENS:])
+    # Value leads the sentence ("55% of developers use ..."): take what follows.
+    keep = [w for w in after if w != metric and not w.startswith(_METRIC_KEYWORDS)]
+    if keep:
+        return " ".join(keep[:ENTITY_TOKENS])
+    # Only metric keywords precede the value ("The market will grow at a CAGR
+    # of 25%"): the ones naming another metric are the subject.
+    own = _OWN_KEYWORDS.get(metric, ())
+    keep = [w for w in before if w != metric and not w.startswith(own)]
+    return " ".join(keep[-ENTITY_TOKENS:])
+
+
+def _is_name_number(sentence: str, match: "re.Match[str]") -> bool:
+    """A bare integer that is part of a name ("Windows 11", "COVID-19")."""
+    if match.group("currency") or match.group("percent") or match.group("scale"):
+        return False
+    number = match.group("number")
+    if not number.isdigit() or _YEAR_RE.fullmatch(number):
+        return False
+    name = _NAME_BEFORE_RE.search(sentence, max(0, match.start() - 40), match.start())
+    return bool(name) and name.group(1).lower() not in STOPWORDS
+
+
+def _join_names(sentence: str) -> Tuple[str, List["re.Match[str]"]]:
+    """Hyphenate name numbers onto their word and return the remaining values.
+
+    "Windows 11" becomes "Windows-11" so the number stays in the entity; the
+    sentence keeps its length, so match offsets stay valid.
+    """
+    chars = list(sentence)
+    values = []
+    for match in _NUMBER_RE.finditer(sentence):
+        if _is_name_number(sentence, match):
+            chars[match.start() - 1] = "-"
+        else:
+            values.append(match)
+    return "".join(chars), values
+
+
+def extract_from_text(text: str, source_id: str) -> List[NumericClaim]:
+    claims = []
+    for sentence in _SENTENCE_RE.split(text or ""):
+        sentence, matches = _join_names(sentence)
+        if not matches:
+            continue
+        years = [int(y) for y in _YEAR_RE.findall(sentence)]
+        sentence_words = _words(sentence)
+        keyword_metrics = {
+            "currency": _keyword_metric(CURRENCY_METRICS, sentence_words),
+            "%": _keyword_metric(PERCENT_METRICS, sentence_words),
+        }
+        first_value_at = None
+
+        for match in matches:
+            number = match.group("number")
+            currency = match.group("currency")
+            scale = (match.group("scale") or "").lower()
+            percent = match.group("percent")
+            raw = float(number.replace(",", ""))
+
+            is_year = (
+                not currency and not percent and not scale and _YEAR_RE.fullmatch(number)
+            )
+            if is_year:
+                continue
+            if not currency and not percent and scale in ("m", "b", "t", "k"):
+                # "5 m" without a currency is as likely meters as millions.
+                scale = ""
+
+            if first_value_at is None:
+                first_value_at = match.start()
+            unit = CURRENCIES.get(currency) if currency else "%" if percent else "count"
+            value = raw * SCALES.get(scale, 1.0)
+            after = _words(sentence[match.end() :])
+            metric = keyword_metrics.get("currency" if currency else unit)
+            # Counts and unlabeled percentages are named by the noun that follows.
+            metric = metric or (after[0] if after else unit)
+            entity = _entity(_words(sentence[:first_value_at]), after, metric)
+            if not entity:
+                continue
+
+            claims.append(
+                NumericClaim(
+                    entity=entity,
+                    metric=metric,
+                    value=value,
+                    unit=unit,
+                    year=years[0] if years else None,
+                    source_id=source_id,
+                    text=sentence.strip(),
+                )
+            )
+    return claims
+
+
+def extract_numeric_claims(source: Dict[str, Any]) -> List[NumericClaim]:
+    source_id = source.get("id", "")
+    claims = []
+    for claim in source.get("claims") or []:
+        claims.extend(extract_from_text(claim, source_id))
+    if source.get("snippet"):
+        seen = {(c.key, c.value) for c in claims}
+        for claim in extract_from_text(source["snippet"], source_id):
+            if (claim.key, claim.value) not in seen:
+                claims.append(claim)
+    return claims
+
+
+def relative_deviations(values: List[float], groups: List[int]) -> List[float]:
+    """|value - median(group)| / |median(group)| for every value."""
+    if not values:
+        return []
+    if np is not None:
+        v = np.asarray(values, dtype=float)
+        g = np.asarray(groups, dtype=np.int64)
+        order = np.lexsort((v, g))
+        sorted_values = v[order]
+        counts = np.bincount(g)
+        starts = np.cumsum(counts) - counts
+        present = counts > 0
+        medians = np.zeros(len(counts))
+        lo = starts[present] + (counts[present] - 1) // 2
+        hi = starts[present] + counts[present] // 2
+        medians[present] = (sorted_values[lo] + sorted_values[hi]) / 2
+        center = medians[g]
+        return (np.abs(v - center) / np.maximum(np.abs(center), 1e-12)).tolist()
+
+    by_group: Dict[int, List[float]] = {}
+    for value, group in zip(values, groups):
+        by_group.setdefault(group, []).append(value)
+    medians = {group: statistics.median(vals) for group, vals in by_group.items()}
+    return [
+        abs(value - medians[group]) / max(abs(medians[group]), 1e-12)
+        for value, group in zip(values, groups)
+    ]
+
+
+def find_contradictions(
+    claims: Iterable[NumericClaim], tolerance: float = RELATIVE_TOLERANCE
+) -> List[Dict[str, Any]]:
+    group_ids: Dict[Tuple, int] = {}
+    members: List[List[NumericClaim]] = []
+    values: List[float] = []
+    groups: List[int] = []
+    flat: List[NumericClaim] = []
+    for claim in claims:
+        group = group_ids.setdefault(claim.key, len(group_ids))
+        if group == len(members):
+            members.append([])
+        members[group].append(claim)
+        flat.append(claim)
+        values.append(claim.value)
+        groups.append(group)
+
+    # Only groups reported by more than one source can disagree.
+    multi_source = [len({c.source_id for c in m}) > 1 for m in members]
+    deviations = relative_deviations(values, groups)
+    by_group: Dict[int, List[Tuple[float, NumericClaim]]] = {}
+    for claim, group, deviation in zip(flat, groups, deviations):
+        if multi_source[group]:
+            by_group.setdefault(group, []).append((deviation, claim))
+
+    contradictions = []
+    for group, scored in by_group.items():
+        if not any(deviation > tolerance for deviation, _ in scored):
+            continue
+        scored.sort(key=lambda item: item[0])
+        consensus_deviation, consensus = scored[0]
+        reported = set()
+        for deviation, claim in scored[1:]:
+            if claim.source_id == consensus.source_id or claim.text in reported:
+                continue
+            spread = abs(claim.value - consensus.value) / max(
+                abs(consensus.value), 1e-12
+            )
+            if spread <= tolerance:
+                continue
+            reported.add(claim.text)
+            contradictions.append(
+                {
+                    "claim_a": consensus.text,
+                    "source_a": consensus.source_id,
+                    "claim_b": claim.text,
+                    "source_b": claim.source_id,
+                    "resolution": "unresolved",
+                    "entity": consensus.entity,
+                    "metric": consensus.metric,
+                    "unit": consensus.unit,
+                    "year": consensus.year,
+                    "value_a": consensus.value,
+                    "value_b": claim.value,
+                    "relative_deviation": round(spread, 3),
+                }
+            )
+
+    contradictions.sort(key=lambda c: -c["relative_deviation"])
+    return contradictions
+
+
+def find_source_contradictions(
+    sources: Iterable[Dict[str, Any]], tolerance: float = RELATIVE_TOLERANCE
+) -> List[Dict[str, Any]]:
+    return find_contradictions(
+        (claim for source in sources for claim in extract_numeric_claims(source)),
+        tolerance,
+    )
+
+
+def disputed_claims(contradictions: List[Dict[str, Any]]) -> List[str]:
+    """Claim lines for get_verification_prompt, one per disputed statement."""
+    claims = []
+    seen = set()
+    for contradiction in contradictions:
+        for side in ("a", "b"):
+            line = f"{contradiction[f'claim_{side}']} [{contradiction[f'source_{side}']}]"
+            if line not in seen:
+                seen.add(line)
+                claims.append(line)
+    return claims
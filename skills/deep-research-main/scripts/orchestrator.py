@@ -3,12 +3,50 @@
 Deep Research Orchestrator - State machine controller for research phases.
 """
 
+import argparse
+import hashlib
 import json
 import os
+import shutil
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator, Callable
+
+from dedup import Deduplicator, Fingerprint, fingerprint, merge_sources
+from fetch_cache import FetchCache
+from locking import FileLock
+from metrics import METRICS_FILE, MetricsLog, summarize, summary_table, to_prometheus
+from pipelines import (
+    AgentTask,
+    QueryRegistry,
+    SearchQuery,
+    create_agent_tasks,
+    plan_queries,
+    task_key,
+)
+from session_archive import (
+    ARCHIVE_SUFFIX,
+    SessionArchive,
+    archive_path,
+    is_archive,
+    pack_session,
+    unpack_session,
+)
+from session_catalog import SessionCatalog
+from source_log import SourceLog
+from source_store import SourceStore
+from source_table import Source, SourceTable
+from tracing import TRACE_FILE, Tracer, critical_path, phase_span_id
+
+
+STATE_FILE = "state.json"
+JOURNAL_FILE = "state.journal"
+LOCK_FILE = ".lock"
+SOURCES_DB = "sources/sources.db"
+SNAPSHOT_INTERVAL = 100
 
 
 class ResearchPhase(Enum):
@@ -32,19 +70,194 @@ class PhaseStatus(Enum):
     SKIPPED = "skipped"
 
 
+def _apply_event(state: Dict[str, Any], event: Dict[str, Any]):
+    *parents, key = event["path"]
+    target = state
+    for part in parents:
+        target = target.setdefault(part, {})
+
+    op, value = event["op"], event.get("value")
+    if op == "set":
+        target[key] = value
+    elif op == "update":
+        target.setdefault(key, {}).update(value)
+    elif op == "append":
+        target.setdefault(key, []).append(value)
+    elif op == "incr":
+        target[key] = target.get(key, 0) + value
+    else:
+        raise ValueError(f"Unknown journal op: {op}")
+
+    state["journal_seq"] = event["seq"]
+    state["updated_at"] = event["ts"]
+
+
+def _source_version(source: Dict[str, Any]) -> str:
+    """Version of a source as seen by drafts: its content_hash, else its record."""
+    if source.get("content_hash"):
+        return source["content_hash"]
+    record = json.dumps(source, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(record.encode("utf-8")).hexdigest()[:16]
+
+
+def _claim_key(claim: Any) -> str:
+    """Stable key for a verified claim (text plus supporting sources)."""
+    if isinstance(claim, dict):
+        claim = claim["claim"] + "|" + ",".join(sorted(claim.get("sources", [])))
+    return hashlib.sha256(claim.encode("utf-8")).hexdigest()[:16]
+
+
+def _atomic_write(path: Path, content: str):
+    tmp_path = path.with_name(
+        f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class SourceWriter:
+    """Buffered sink for sources.jsonl that commits sources_count once per batch.
+
+    Incoming sources that duplicate an existing one (same canonical URL, same
+    content_hash or a near-identical snippet) are merged into the existing record
+    instead of being appended as a new source. Each flush runs under the session
+    lock, so several processes can ingest into one session at the same time.
+    """
+
+    def __init__(
+        self, state: "ResearchState", flush_every: int = 1000, dedup: bool = True
+    ):
+        self.state = state
+        self.flush_every = flush_every
+        self.dedup = dedup
+        self.written = 0
+        self.merged = 0
+        self._pending: List[Tuple[Dict, Fingerprint]] = []
+        self._batch_started = 0.0
+
+    def __enter__(self) -> "SourceWriter":
+        self.state._ensure_initialized()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, source: Dict):
+        if not self._pending:
+            self._batch_started = time.perf_counter()
+        # Fingerprinting is the expensive part and needs no lock.
+        self._pending.append((source, fingerprint(source)))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        state = self.state
+        merged_before = self.merged
+        with state._lock():
+            state._catch_up()
+            store = state._source_store()
+            dedup = state._deduplicator()
+            batch: Dict[str, Dict] = {}
+            fingerprints: Dict[str, Fingerprint] = {}
+            new_count = 0
+
+            log_writer = state._source_log().writer()
+            try:
+                for source, fp in self._pending:
+                    match = dedup.match(fp) if self.dedup else None
+                    if match:
+                        existing_id, reason = match
+                        existing = batch.get(existing_id) or store.get(existing_id)
+                        if existing is not None:
+                            dedup.record(reason)
+                            # Its URL and content hash now lead to existing_id.
+                            dedup.add(existing_id, fp)
+                            self.merged += 1
+                            merged = merge_sources(existing, source)
+                            if merged != existing:
+                                # Later lines for the same id supersede earlier ones.
+                                log_writer.write(merged)
+                                batch[existing_id] = merged
+                            continue
+
+                    if not source.get("id"):
+                        # Removed sources keep their ids; never hand them out again.
+                        next_num = (
+                            state.state["sources_count"]
+                            + state.state.get("sources_removed", 0)
+                            + new_count
+                            + 1
+                        )
+                        source = {**source, "id": f"src_{next_num:03d}"}
+                    elif source["id"] in batch or store.get(source["id"]):
+                        # Re-submitting a known id is an update, not a new source.
+                        log_writer.write(source)
+                        batch[source["id"]] = source
+                        fingerprints[source["id"]] = fp
+                        continue
+
+                    dedup.add(source["id"], fp)
+                    log_writer.write(source)
+                    batch[source["id"]] = source
+                    fingerprints[source["id"]] = fp
+                    new_count += 1
+            finally:
+                log_writer.close()
+
+            store.upsert_many(batch.values(), fingerprints)
+            if new_count:
+                state._commit(("incr", ["sources_count"], new_count))
+            self.written += new_count
+        state.record_metric(
+            "ingest",
+            sources=new_count,
+            merged=self.merged - merged_before,
+            seconds=round(time.perf_counter() - self._batch_started, 4),
+        )
+        self._pending = []
+
+    def close(self):
+        self.flush()
+
+
 class ResearchState:
-    def __init__(self, base_path: str = "RESEARCH"):
+    def __init__(
+        self, base_path: str = "RESEARCH", snapshot_interval: int = SNAPSHOT_INTERVAL
+    ):
         self.base_path = Path(base_path)
         self.state: Dict[str, Any] = {}
         self.session_path: Path = Path(".")
+        self.snapshot_interval = snapshot_interval
+        self.catalog = SessionCatalog(self.base_path)
         self._initialized = False
+        self._events_since_snapshot = 0
+        self._journal_pos = 0
+        self._snapshot_stamp: Optional[Tuple[int, int]] = None
+        self._session_lock: Optional[FileLock] = None
+        self._store: Optional[SourceStore] = None
+        self._log: Optional[SourceLog] = None
+        self._archive: Optional[SessionArchive] = None
+        self._dedup: Optional[Deduplicator] = None
+        self._dedup_rowid = 0
+        self._queries: Optional[QueryRegistry] = None
+        self._mutations = dict.fromkeys(
+            ("events", "journal_bytes", "snapshots", "snapshot_bytes"), 0
+        )
 
     def create_session(self, topic: str) -> str:
-        session_id = (
+        session_id = self._claim_session_id(
             f"{self._sanitize_topic(topic)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         )
+        self._close_store()
+        self._close_archive()
+        self._queries = None
         self.session_path = self.base_path / session_id
         self._initialized = True
+        self._session_lock = None
 
         folders = [
             "artifacts/agent_results",
@@ -86,9 +299,16 @@ class ResearchState:
                 "phase_7": PhaseStatus.PENDING.value,
             },
             "sources_count": 0,
+            "sources_removed": 0,
             "artifacts": {},
+            "dependencies": {"drafts": {}, "outputs": {}},
+            "tasks": {},
+            "phase_started": {},
             "errors": [],
+            "journal_seq": 0,
         }
+        self._snapshot_stamp = None
+        self._journal_pos = 0
 
         self._save_state()
         self._create_readme()
@@ -96,18 +316,158 @@ class ResearchState:
         return session_id
 
     def load_session(self, session_id: str) -> bool:
+        self._close_store()
+        self._close_archive()
+        self._queries = None
         self.session_path = self.base_path / session_id
-        state_file = self.session_path / "state.json"
+        self._session_lock = None
 
-        if not state_file.exists():
-            return False
+        if not (self.session_path / STATE_FILE).exists():
+            return self._load_archive(session_id)
 
-        with open(state_file, "r", encoding="utf-8") as f:
-            self.state = json.load(f)
+        self._initialized = True
+        with self._lock():
+            self._read_snapshot()
+            self._replay_journal()
+        return True
 
+    def _load_archive(self, session_id: str) -> bool:
+        """Open an archived session read-only; only state.json is decompressed."""
+        path = archive_path(self.base_path, session_id)
+        if not path.exists():
+            return False
+        self._archive = SessionArchive(path)
+        # archive() folds the journal into state.json before packing.
+        self.state = json.loads(self._archive.read_bytes(STATE_FILE))
         self._initialized = True
+        self._snapshot_stamp = None
+        self._journal_pos = 0
+        self._events_since_snapshot = 0
         return True
 
+    def _close_archive(self):
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    @property
+    def archived(self) -> bool:
+        return self._archive is not None
+
+    def _ensure_writable(self):
+        self._ensure_initialized()
+        if self._archive is not None:
+            raise ValueError(
+                f"Session {self.state['session_id']} is archived and read-only; "
+                "unarchive it first."
+            )
+
+    def _lock(self) -> FileLock:
+        self._ensure_writable()
+        if self._session_lock is None:
+            self._session_lock = FileLock(self.session_path / LOCK_FILE)
+        return self._session_lock
+
+    def _read_snapshot(self):
+        state_file = self.session_path / STATE_FILE
+        with open(state_file, "r", encoding="utf-8") as f:
+            self.state = json.load(f)
+        stat = os.stat(state_file)
+        self._snapshot_stamp = (stat.st_ino, stat.st_mtime_ns)
+        self._journal_pos = 0
+        self._events_since_snapshot = 0
+
+    def _replay_journal(self) -> int:
+        journal_file = self.session_path / JOURNAL_FILE
+        if not journal_file.exists():
+            return 0
+
+        snapshot_seq = self.state.get("journal_seq", 0)
+        replayed = 0
+        with open(journal_file, "rb") as f:
+            f.seek(self._journal_pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A torn trailing write from a crashed process; nothing after
+                    # it was acknowledged, so stop here.
+                    break
+                self._journal_pos += len(line)
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event["seq"] <= snapshot_seq:
+                    continue
+                _apply_event(self.state, event)
+                replayed += 1
+        self._events_since_snapshot += replayed
+        return replayed
+
+    def _catch_up(self):
+        """Apply snapshots and events written by other processes. Needs the lock."""
+        state_file = self.session_path / STATE_FILE
+        if not state_file.exists():
+            return
+        stat = os.stat(state_file)
+        if (stat.st_ino, stat.st_mtime_ns) != self._snapshot_stamp:
+            # Someone compacted since we last looked; the journal was reset too.
+            self._read_snapshot()
+        self._replay_journal()
+
+    def _source_store(self) -> SourceStore:
+        self._ensure_initialized()
+        if self._store is None:
+            if self._archive is not None:
+                # Archives leave sources.db out; rebuild it in memory from the log.
+                self._store = SourceStore(Path(":memory:"))
+                self._store.import_records(self._source_log().records())
+                return self._store
+            db_path = self.session_path / SOURCES_DB
+            is_new = not db_path.exists()
+            self._store = SourceStore(db_path)
+            if is_new:
+                # Sessions created before the store existed (or just unarchived)
+                # only have the log.
+                self._store.import_records(self._source_log().records())
+        return self._store
+
+    def _source_log(self) -> SourceLog:
+        self._ensure_initialized()
+        if self._log is None:
+            files = self._archive.view("sources") if self._archive else None
+            self._log = SourceLog(self.session_path / "sources", files=files)
+        return self._log
+
+    def _close_store(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self._dedup = None
+        self._dedup_rowid = 0
+
+    def close(self):
+        """
+        Close the session's open files (source store and log, archive, catalog).
+        The session stays loaded; each file reopens when it is next used.
+        """
+        self._close_store()
+        if self._archive is not None:
+            self._archive.close()
+        self.catalog.close()
+
+    def _deduplicator(self) -> Deduplicator:
+        if self._dedup is None:
+            self._dedup = Deduplicator()
+        # Pick up sources other writers added since we last looked.
+        for rowid, source_id, fp in self._source_store().iter_fingerprints(
+            self._dedup_rowid
+        ):
+            self._dedup.add(source_id, fp)
+            self._dedup_rowid = rowid
+        return self._dedup
+
     def _ensure_initialized(self):
         if not self._initialized:
             raise ValueError(
@@ -115,12 +475,77 @@ class ResearchState:
             )
 
     def _save_state(self):
-        self._ensure_initialized()
-        self.state["updated_at"] = datetime.now().isoformat()
-        state_file = self.session_path / "state.json"
-
-        with open(state_file, "w", encoding="utf-8") as f:
-            json.dump(self.state, f, indent=2, ensure_ascii=False)
+        """Write a compacted snapshot of the state and reset the journal."""
+        with self._lock():
+            self._catch_up()
+            self.state["updated_at"] = datetime.now().isoformat()
+            state_file = self.session_path / STATE_FILE
+
+            content = json.dumps(self.state, indent=2, ensure_ascii=False)
+            _atomic_write(state_file, content)
+            stat = os.stat(state_file)
+            self._snapshot_stamp = (stat.st_ino, stat.st_mtime_ns)
+            # Events up to journal_seq are now in the snapshot; replay skips them
+            # even if we crash before the truncate below.
+            open(self.session_path / JOURNAL_FILE, "wb").close()
+            self._journal_pos = 0
+            self._events_since_snapshot = 0
+            self.catalog.upsert(self.state)
+
+            self._mutations["snapshots"] += 1
+            self._mutations["snapshot_bytes"] += len(content.encode("utf-8"))
+            self.record_metric("mutations", **self._mutations)
+            self._mutations = dict.fromkeys(self._mutations, 0)
+
+    def _commit(self, *changes: Tuple[str, List[str], Any]):
+        """Apply changes in memory and append them to the journal as events."""
+        with self._lock():
+            self._catch_up()
+            now = datetime.now().isoformat()
+            lines = []
+            for op, path, value in changes:
+                event = {
+                    "seq": self.state.get("journal_seq", 0) + 1,
+                    "ts": now,
+                    "op": op,
+                    "path": path,
+                    "value": value,
+                }
+                _apply_event(self.state, event)
+                lines.append(json.dumps(event, ensure_ascii=False) + "\n")
+
+            data = "".join(lines).encode("utf-8")
+            with open(self.session_path / JOURNAL_FILE, "ab") as f:
+                if f.tell() > self._journal_pos:
+                    # Drop a torn line left by a crashed writer; replay stopped
+                    # there, so appending after it would make it unreadable.
+                    f.truncate(self._journal_pos)
+                f.write(data)
+            self._journal_pos += len(data)
+            self._mutations["events"] += len(lines)
+            self._mutations["journal_bytes"] += len(data)
+
+            self._events_since_snapshot += len(lines)
+            if self._events_since_snapshot >= self.snapshot_interval:
+                self._save_state()
+
+    def _claim_session_id(self, session_id: str) -> str:
+        """
+        Create the session folder, suffixing _2, _3, ... when another session
+        (possibly in another process) took the same topic within the second.
+        """
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        candidate = session_id
+        attempt = 1
+        while True:
+            if not archive_path(self.base_path, candidate).exists():
+                try:
+                    (self.base_path / candidate).mkdir()
+                    return candidate
+                except FileExistsError:
+                    pass
+            attempt += 1
+            candidate = f"{session_id}_{attempt}"
 
     def _sanitize_topic(self, topic: str) -> str:
         sanitized = "".join(c if c.isalnum() or c in " -_" else "_" for c in topic)
@@ -139,12 +564,16 @@ class ResearchState:
 ```
 {self.state["session_id"]}/
 ├── state.json
+├── state.journal
 ├── README.md
 ├── artifacts/
 │   ├── research_plan.json
 │   └── agent_results/
 ├── sources/
 │   ├── sources.jsonl
+│   ├── sources.<n>.jsonl.gz
+│   ├── sources.idx
+│   ├── sources.db
 │   └── bibliography.md
 ├── outputs/
 │   ├── 00_executive_summary.md
@@ -166,50 +595,135 @@ class ResearchState:
 | 6. Quality Assurance | {self.state["progress"]["phase_6"]} |
 | 7. Output & Packaging | {self.state["progress"]["phase_7"]} |
 
+## Metrics
+{summary_table(self.metrics_summary())}
+
 ## Resume Command
 ```
 /research-resume {self.state["session_id"]}
 ```
 """
-        readme_path = self.session_path / "README.md"
-        with open(readme_path, "w", encoding="utf-8") as f:
-            f.write(readme_content)
+        _atomic_write(self.session_path / "README.md", readme_content)
 
+    # Phase transitions are journaled like any other change, but also compact
+    # immediately: there are only a handful per session and it keeps the status in
+    # state.json current for anything that reads the snapshot directly.
     def start_phase(self, phase_num: int):
         self._ensure_initialized()
         phase_key = f"phase_{phase_num}"
-        self.state["progress"][phase_key] = PhaseStatus.IN_PROGRESS.value
-        self.state["current_phase"] = phase_num
-        self.state["status"] = getattr(
+        status = getattr(
             ResearchPhase, f"PHASE_{phase_num}_{self._get_phase_name(phase_num)}"
         ).value
+        self._commit(
+            ("set", ["progress", phase_key], PhaseStatus.IN_PROGRESS.value),
+            ("set", ["current_phase"], phase_num),
+            ("set", ["status"], status),
+            ("set", ["phase_started", phase_key], datetime.now().isoformat()),
+        )
         self._save_state()
 
     def complete_phase(self, phase_num: int, artifacts: Optional[Dict] = None):
         self._ensure_initialized()
         phase_key = f"phase_{phase_num}"
-        self.state["progress"][phase_key] = PhaseStatus.COMPLETED.value
+        changes = [("set", ["progress", phase_key], PhaseStatus.COMPLETED.value)]
 
         if artifacts:
-            self.state["artifacts"].update(artifacts)
+            changes.append(("update", ["artifacts"], artifacts))
 
+        self._commit(*changes)
+        self._record_phase_end(phase_num, PhaseStatus.COMPLETED)
         self._save_state()
         self._create_readme()
 
     def fail_phase(self, phase_num: int, error: str):
         self._ensure_initialized()
         phase_key = f"phase_{phase_num}"
-        self.state["progress"][phase_key] = PhaseStatus.FAILED.value
-        self.state["status"] = ResearchPhase.FAILED.value
-        self.state["errors"].append(
-            {
-                "phase": phase_num,
-                "error": error,
-                "timestamp": datetime.now().isoformat(),
-            }
+        self._commit(
+            ("set", ["progress", phase_key], PhaseStatus.FAILED.value),
+            ("set", ["status"], ResearchPhase.FAILED.value),
+            (
+                "append",
+                ["errors"],
+                {
+                    "phase": phase_num,
+                    "error": error,
+                    "timestamp": datetime.now().isoformat(),
+                },
+            ),
         )
+        self._record_phase_end(phase_num, PhaseStatus.FAILED)
         self._save_state()
 
+    def _record_phase_end(self, phase_num: int, status: PhaseStatus):
+        """Phase duration metric and phase span for the trace."""
+        started = self.state.get("phase_started", {}).get(f"phase_{phase_num}")
+        seconds = None
+        if started:
+            start = datetime.fromisoformat(started)
+            end = datetime.now()
+            seconds = round((end - start).total_seconds(), 3)
+            self.tracer().complete(
+                f"Phase {phase_num}: {self._get_phase_name(phase_num)}",
+                "phase",
+                start.timestamp(),
+                end.timestamp(),
+                span_id=phase_span_id(phase_num, started),
+                status=status.value,
+            )
+        self.record_metric(
+            "phase",
+            phase=phase_num,
+            name=self._get_phase_name(phase_num),
+            status=status.value,
+            seconds=seconds,
+        )
+
+    def record_metric(self, kind: str, **fields: Any):
+        """Append one record to artifacts/metrics.jsonl."""
+        self._ensure_writable()
+        MetricsLog(self.session_path / METRICS_FILE).record(kind, **fields)
+
+    def record_agent_metric(
+        self, task: AgentTask, outcome: str, seconds: float, attempts: int = 1
+    ):
+        self.record_metric(
+            "agent",
+            agent_type=task.agent_type.value,
+            subtopic=task.subtopic,
+            description=task.description,
+            outcome=outcome,
+            seconds=round(seconds, 3),
+            attempts=attempts,
+            prompt_tokens=task.prompt_tokens,
+        )
+
+    def record_fetch_metric(self, stats: Dict[str, int]):
+        """Fetch and cache counters of one FetchCache run (its session_stats)."""
+        self.record_metric("fetch", **stats)
+
+    def tracer(self) -> Tracer:
+        self._ensure_writable()
+        return Tracer(self.session_path / TRACE_FILE, self.state["session_id"])
+
+    def current_phase_span_id(self) -> Optional[str]:
+        """Span id of the phase in progress, the parent of agent task spans."""
+        phase = self.state.get("current_phase", 0)
+        key = f"phase_{phase}"
+        if self.state["progress"].get(key) != PhaseStatus.IN_PROGRESS.value:
+            return None
+        started = self.state.get("phase_started", {}).get(key)
+        return phase_span_id(phase, started) if started else None
+
+    def metrics_summary(self) -> Dict[str, Any]:
+        self._ensure_initialized()
+        if self._archive is not None:
+            return summarize(
+                json.loads(line)
+                for line in self._archive.lines(METRICS_FILE)
+                if line.strip()
+            )
+        return summarize(MetricsLog(self.session_path / METRICS_FILE))
+
     def _get_phase_name(self, phase_num: int) -> str:
         names = {
             1: "SCOPING",
@@ -241,35 +755,322 @@ class ResearchState:
 
     def set_requirements(self, requirements: Dict):
         self._ensure_initialized()
-        self.state["requirements"].update(requirements)
-        self._save_state()
+        self._commit(("update", ["requirements"], requirements))
 
     def set_plan(self, plan: Dict):
         self._ensure_initialized()
-        self.state["plan"].update(plan)
-        self._save_state()
+        self._commit(("update", ["plan"], plan))
+        self._queries = None
 
-    def add_source(self, source: Dict):
+    def query_registry(self) -> QueryRegistry:
+        """The session's QueryRegistry, seeded with the plan's search queries."""
         self._ensure_initialized()
-        sources_file = self.session_path / "sources" / "sources.jsonl"
-        with open(sources_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(source, ensure_ascii=False) + "\n")
-        self.state["sources_count"] += 1
-        self._save_state()
+        if self._queries is None:
+            self._queries = QueryRegistry()
+            plan = self.state["plan"]
+            self._queries.register_plan(
+                plan.get("search_queries", {}), plan.get("priorities")
+            )
+        return self._queries
+
+    def search(
+        self, query: SearchQuery, search_fn: Callable[[SearchQuery], List[Any]]
+    ) -> List[Any]:
+        """
+        Run search_fn for query unless an equivalent query from any subtopic
+        already ran in this session; the counts go to search_queries.json.
+        """
+        self._ensure_writable()
+        registry = self.query_registry()
+        results = registry.search(query, search_fn)
+        registry.save(self)
+        return results
+
+    def add_source(self, source: Dict):
+        self.add_sources([source])
+
+    def add_sources(
+        self, sources: Iterable[Dict], flush_every: int = 1000, dedup: bool = True
+    ) -> int:
+        with self.source_writer(flush_every, dedup) as writer:
+            for source in sources:
+                writer.write(source)
+        return writer.written
+
+    def source_writer(self, flush_every: int = 1000, dedup: bool = True) -> SourceWriter:
+        return SourceWriter(self, flush_every, dedup)
+
+    def get_dedup_stats(self) -> Dict[str, int]:
+        return dict(self._deduplicator().stats)
 
     def get_sources(self) -> List[Dict]:
+        return self._source_store().query()
+
+    def get_compact_sources(self) -> List[Source]:
+        """get_sources() as __slots__ records with interned categorical fields."""
+        return [Source.from_dict(s) for s in self._source_store().iter_query()]
+
+    def source_table(self) -> SourceTable:
+        """Columnar view of the session's sources for whole-session counts."""
+        return SourceTable.from_store(self._source_store())
+
+    def iter_sources(
+        self, filter: Optional[Callable[[Dict], bool]] = None
+    ) -> Iterator[Dict]:
+        return self._source_log().iter(filter)
+
+    def get_source(self, source_id: str) -> Optional[Dict]:
+        return self._source_log().get(source_id)
+
+    def query_sources(
+        self,
+        subtopic: Optional[str] = None,
+        min_quality: Optional[str] = None,
+        domain: Optional[str] = None,
+        source_type: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        return self._source_store().query(
+            subtopic=subtopic,
+            min_quality=min_quality,
+            domain=domain,
+            source_type=source_type,
+            limit=limit,
+        )
+
+    def register_tasks(self, tasks: Iterable[AgentTask]) -> List[str]:
+        """
+        Checkpoint tasks as pending; tasks already known keep their status.
+        Records are keyed by task_key and hold no prompt text.
+        """
+        self._ensure_initialized()
+        with self._lock():
+            self._catch_up()
+            known = self.state.get("tasks", {})
+            changes = []
+            keys = []
+            for task in tasks:
+                key = task_key(task)
+                keys.append(key)
+                if key not in known:
+                    changes.append(
+                        (
+                            "set",
+                            ["tasks", key],
+                            {
+                                "agent_type": task.agent_type.value,
+                                "description": task.description,
+                                "subtopic": task.subtopic,
+                                "expected_output": task.expected_output,
+                                "priority": task.priority,
+                                "status": PhaseStatus.PENDING.value,
+                            },
+                        )
+                    )
+            if changes:
+                self._commit(*changes)
+        return keys
+
+    def record_task_status(
+        self,
+        task: AgentTask,
+        status: str,
+        artifact: Optional[str] = None,
+        attempts: Optional[int] = None,
+        error: Optional[str] = None,
+    ):
+        self._ensure_initialized()
+        key = task_key(task)
+        if key not in self.state.get("tasks", {}):
+            self.register_tasks([task])
+        update: Dict[str, Any] = {
+            "status": status,
+            "updated_at": datetime.now().isoformat(),
+        }
+        if artifact is not None:
+            update["artifact"] = artifact
+        if attempts is not None:
+            update["attempts"] = attempts
+        update["error"] = error
+        self._commit(("update", ["tasks", key], update))
+
+    def get_task_status(self, task: AgentTask) -> Optional[Dict[str, Any]]:
+        return self.state.get("tasks", {}).get(task_key(task))
+
+    def incomplete_tasks(
+        self, tasks: Optional[Iterable[AgentTask]] = None
+    ) -> List[AgentTask]:
+        """
+        Checkpointed tasks that have not completed, ready to re-queue. Prompts
+        are not checkpointed, so the candidates are regenerated from the plan
+        unless the caller passes the tasks it registered.
+        """
+        if tasks is None:
+            plan = self.state["plan"]
+            tasks = create_agent_tasks(
+                plan.get("subtopics", []), self.state["topic"], plan_queries(plan)
+            )
+        records = self.state.get("tasks", {})
+        return [
+            task
+            for task in tasks
+            if task_key(task) in records
+            and records[task_key(task)]["status"] != PhaseStatus.COMPLETED.value
+        ]
+
+    def task_progress(self) -> Dict[str, int]:
+        progress = {"total": 0}
+        for record in self.state.get("tasks", {}).values():
+            progress["total"] += 1
+            progress[record["status"]] = progress.get(record["status"], 0) + 1
+        return progress
+
+    def remove_sources(self, source_ids: Iterable[str]) -> int:
+        """Tombstone sources in sources.jsonl and drop them from the store."""
+        with self._lock():
+            self._catch_up()
+            store = self._source_store()
+            removed = [sid for sid in dict.fromkeys(source_ids) if store.get(sid)]
+            if not removed:
+                return 0
+            log_writer = self._source_log().writer()
+            try:
+                for source_id in removed:
+                    log_writer.write({"id": source_id, "deleted": True})
+            finally:
+                log_writer.close()
+            store.delete_many(removed)
+            # The in-memory dedup index still knows the removed fingerprints.
+            self._dedup = None
+            self._dedup_rowid = 0
+            self._commit(
+                ("incr", ["sources_count"], -len(removed)),
+                ("incr", ["sources_removed"], len(removed)),
+            )
+        return len(removed)
+
+    def record_draft_inputs(
+        self,
+        draft: str,
+        source_ids: Iterable[str],
+        claims: Iterable[Any] = (),
+        subtopic: Optional[str] = None,
+    ):
+        """
+        Record which sources (by content_hash) and verified claims fed a draft.
+        With a subtopic, sources added to it later also make the draft stale.
+        """
         self._ensure_initialized()
-        sources_file = self.session_path / "sources" / "sources.jsonl"
-        sources = []
-        if sources_file.exists():
-            with open(sources_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    if line.strip():
-                        sources.append(json.loads(line))
-        return sources
+        sources = {}
+        for source_id in source_ids:
+            source = self._source_store().get(source_id)
+            if source is not None:
+                sources[source_id] = _source_version(source)
+        claim_keys = sorted({_claim_key(claim) for claim in claims})
+        version = hashlib.sha256(
+            json.dumps([sources, claim_keys], sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        self._commit(
+            (
+                "set",
+                ["dependencies", "drafts", draft],
+                {
+                    "subtopic": subtopic,
+                    "sources": sources,
+                    "claims": claim_keys,
+                    "version": version,
+                },
+            )
+        )
 
-    def save_artifact(self, name: str, content: str, subfolder: str = ""):
+    def record_output_inputs(self, output: str, drafts: Iterable[str]):
+        """Record which drafts (at their current version) fed an output file."""
         self._ensure_initialized()
+        recorded = self.state.get("dependencies", {}).get("drafts", {})
+        self._commit(
+            (
+                "set",
+                ["dependencies", "outputs", output],
+                {
+                    "drafts": {
+                        draft: recorded.get(draft, {}).get("version")
+                        for draft in drafts
+                    }
+                },
+            )
+        )
+
+    def plan_rebuild(
+        self, verified_claims: Optional[List[Any]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        List drafts whose recorded inputs changed (sources edited, removed or
+        added to their subtopic; claims changed when verified_claims is given)
+        and outputs built from stale or since-rebuilt drafts.
+        """
+        self._ensure_initialized()
+        with self._lock():
+            self._catch_up()
+        store = self._source_store()
+        dependencies = self.state.get("dependencies", {})
+        current_claims = None
+        claims_by_source: Dict[str, set] = {}
+        if verified_claims is not None:
+            current_claims = set()
+            for claim in verified_claims:
+                key = _claim_key(claim)
+                current_claims.add(key)
+                if isinstance(claim, dict):
+                    for source_id in claim.get("sources", []):
+                        claims_by_source.setdefault(source_id, set()).add(key)
+
+        stale_drafts: Dict[str, List[str]] = {}
+        for draft, record in dependencies.get("drafts", {}).items():
+            reasons = []
+            for source_id, version in record["sources"].items():
+                source = store.get(source_id)
+                if source is None:
+                    reasons.append(f"source_removed:{source_id}")
+                elif _source_version(source) != version:
+                    reasons.append(f"source_changed:{source_id}")
+            if record.get("subtopic"):
+                for source in store.iter_query(subtopic=record["subtopic"]):
+                    if source["id"] not in record["sources"]:
+                        reasons.append(f"source_added:{source['id']}")
+            if current_claims is not None:
+                recorded = set(record["claims"])
+                if recorded - current_claims:
+                    reasons.append("claims_changed")
+                elif any(
+                    claims_by_source.get(source_id, set()) - recorded
+                    for source_id in record["sources"]
+                ):
+                    reasons.append("claims_added")
+            if reasons:
+                stale_drafts[draft] = reasons
+
+        stale_outputs = []
+        recorded_drafts = dependencies.get("drafts", {})
+        for output, record in dependencies.get("outputs", {}).items():
+            reasons = []
+            for draft, version in record["drafts"].items():
+                if draft in stale_drafts:
+                    reasons.append(f"draft_stale:{draft}")
+                elif recorded_drafts.get(draft, {}).get("version") != version:
+                    reasons.append(f"draft_rebuilt:{draft}")
+            if reasons:
+                stale_outputs.append({"output": output, "reasons": reasons})
+
+        return {
+            "drafts": [
+                {"draft": draft, "reasons": reasons}
+                for draft, reasons in stale_drafts.items()
+            ],
+            "outputs": stale_outputs,
+        }
+
+    def save_artifact(self, name: str, content: str, subfolder: str = ""):
+        self._ensure_writable()
         if subfolder:
             artifact_path = self.session_path / "artifacts" / subfolder / name
             artifact_path.parent.mkdir(parents=True, exist_ok=True)
@@ -279,28 +1080,76 @@ class ResearchState:
         with open(artifact_path, "w", encoding="utf-8") as f:
             f.write(content)
 
-        self.state["artifacts"][name] = str(
-            artifact_path.relative_to(self.session_path)
+        self._commit(
+            (
+                "set",
+                ["artifacts", name],
+                str(artifact_path.relative_to(self.session_path)),
+            )
         )
-        self._save_state()
 
     def save_output(self, name: str, content: str, subfolder: str = ""):
-        self._ensure_initialized()
-        if subfolder:
-            output_path = self.session_path / "outputs" / subfolder / name
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-        else:
-            output_path = self.session_path / "outputs" / name
+        self._ensure_writable()
+        output_path = self.session_path / "outputs" / subfolder / name
+        # Archives packed without directory entries unpack without outputs/.
+        output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(content)
 
     def mark_completed(self):
         self._ensure_initialized()
-        self.state["status"] = ResearchPhase.COMPLETED.value
+        self._commit(("set", ["status"], ResearchPhase.COMPLETED.value))
         self._save_state()
         self._create_readme()
 
+    def archive(self) -> Dict[str, Any]:
+        """
+        Pack this COMPLETED session into RESEARCH/<session_id>.zip and remove
+        its directory; the session stays loaded, read-only, from the archive.
+        """
+        self._ensure_writable()
+        if self.state["status"] != ResearchPhase.COMPLETED.value:
+            raise ValueError(
+                f"Only COMPLETED sessions can be archived (status: "
+                f"{self.state['status']})"
+            )
+        session_id = self.state["session_id"]
+        with self._lock():
+            self._catch_up()
+            self._save_state()
+            self._source_log().seal(force=True)
+            self._close_store()
+            result = pack_session(
+                self.session_path, archive_path(self.base_path, session_id)
+            )
+            # Keep the lock file until the lock is released.
+            for child in self.session_path.iterdir():
+                if child.name == LOCK_FILE:
+                    continue
+                if child.is_dir():
+                    shutil.rmtree(child)
+                else:
+                    child.unlink()
+        (self.session_path / LOCK_FILE).unlink(missing_ok=True)
+        self.session_path.rmdir()
+        self._session_lock = None
+        self._load_archive(session_id)
+        return result
+
+    def unarchive(self):
+        """Extract the archived session back into its directory."""
+        self._ensure_initialized()
+        if self._archive is None:
+            raise ValueError(f"Session {self.state['session_id']} is not archived")
+        session_id = self.state["session_id"]
+        path = self._archive.path
+        self._close_store()
+        self._close_archive()
+        unpack_session(path, self.session_path)
+        path.unlink()
+        self.load_session(session_id)
+
 
 class ResearchOrchestrator:
     def __init__(self, base_path: str = "RESEARCH"):
@@ -327,13 +1176,20 @@ class ResearchOrchestrator:
         if next_phase is None:
             return {"status": "completed", "message": "Research already completed"}
 
-        return {
+        result = {
             "session_id": session_id,
             "status": "resumed",
             "current_phase": next_phase,
             "next_action": f"execute_phase_{next_phase}",
             "message": f"Resuming from phase {next_phase}",
         }
+        if self.state_manager.state.get("tasks"):
+            # Only agent tasks that did not finish need to run again.
+            result["tasks"] = self.state_manager.task_progress()
+            result["pending_tasks"] = [
+                task.description for task in self.state_manager.incomplete_tasks()
+            ]
+        return result
 
     def get_status(self, session_id: str) -> Dict[str, Any]:
         if not self.state_manager.load_session(session_id):
@@ -346,30 +1202,88 @@ class ResearchOrchestrator:
             "progress": self.state_manager.state["progress"],
             "sources_count": self.state_manager.state["sources_count"],
             "current_phase": self.state_manager.get_current_phase(),
+            "tasks": self.state_manager.task_progress(),
+            "archived": self.state_manager.archived,
         }
 
-    def list_sessions(self) -> List[Dict]:
-        sessions = []
-        if not self.base_path.exists():
-            return sessions
-
-        for folder in self.base_path.iterdir():
-            if folder.is_dir():
-                state_file = folder / "state.json"
-                if state_file.exists():
-                    with open(state_file, "r", encoding="utf-8") as f:
-                        state = json.load(f)
-                    sessions.append(
-                        {
-                            "session_id": state["session_id"],
-                            "topic": state["topic"],
-                            "status": state["status"],
-                            "created_at": state["created_at"],
-                            "updated_at": state["updated_at"],
-                        }
-                    )
+    def get_metrics(self, session_id: str, prometheus: bool = False) -> Any:
+        if not self.state_manager.load_session(session_id):
+            return {"status": "error", "message": "Session not found"}
+        summary = self.state_manager.metrics_summary()
+        if prometheus:
+            return to_prometheus(summary, session_id)
+        return {"session_id": session_id, **summary}
+
+    def archive_session(self, session_id: str) -> Dict[str, Any]:
+        state = self.state_manager
+        if not state.load_session(session_id):
+            return {"status": "error", "message": f"Session not found: {session_id}"}
+        if state.archived:
+            return {"status": "error", "message": f"Already archived: {session_id}"}
+        if state.state["status"] != ResearchPhase.COMPLETED.value:
+            return {
+                "status": "error",
+                "message": f"Only COMPLETED sessions can be archived: {session_id} "
+                f"is {state.state['status']}",
+            }
+        return {"session_id": session_id, "status": "archived", **state.archive()}
+
+    def archive_completed(self) -> List[Dict[str, Any]]:
+        """Archive every COMPLETED session that still has a directory."""
+        return [
+            self.archive_session(entry["session_id"])
+            for entry in self.list_sessions(status=ResearchPhase.COMPLETED.value)
+            if (self.base_path / entry["session_id"] / STATE_FILE).exists()
+        ]
 
-        return sorted(sessions, key=lambda x: x["updated_at"], reverse=True)
+    def unarchive_session(self, session_id: str) -> Dict[str, Any]:
+        state = self.state_manager
+        if not state.load_session(session_id):
+            return {"status": "error", "message": f"Session not found: {session_id}"}
+        if not state.archived:
+            return {"status": "error", "message": f"Not archived: {session_id}"}
+        state.unarchive()
+        return {
+            "session_id": session_id,
+            "status": "unarchived",
+            "session_path": str(state.session_path),
+        }
+
+    def list_sessions(
+        self,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict]:
+        if not self.base_path.exists():
+            return []
+
+        catalog = self.state_manager.catalog
+        if not catalog.is_complete():
+            self.rebuild_catalog()
+        return catalog.list(status=status, since=since, limit=limit, offset=offset)
+
+    def rebuild_catalog(self) -> Dict[str, Any]:
+        states = []
+        if self.base_path.exists():
+            for folder in self.base_path.iterdir():
+                if folder.is_dir() and (folder / STATE_FILE).exists():
+                    session_id = folder.name
+                elif is_archive(folder):
+                    session_id = folder.name[: -len(ARCHIVE_SUFFIX)]
+                else:
+                    continue
+                loader = ResearchState(str(self.base_path))
+                if loader.load_session(session_id):
+                    states.append(loader.state)
+                    loader.close()
+
+        catalog = self.state_manager.catalog
+        catalog.clear()
+        catalog.upsert_many(states)
+        catalog.mark_complete()
+        return {"status": "rebuilt", "sessions": len(states)}
 
 
 def init_research(topic: str, base_path: str = "RESEARCH") -> Dict:
@@ -387,11 +1301,139 @@ def get_research_status(session_id: str, base_path: str = "RESEARCH") -> Dict:
     return orchestrator.get_status(session_id)
 
 
-def list_research_sessions(base_path: str = "RESEARCH") -> List[Dict]:
+def list_research_sessions(
+    base_path: str = "RESEARCH",
+    status: Optional[str] = None,
+    since: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Dict]:
     orchestrator = ResearchOrchestrator(base_path)
-    return orchestrator.list_sessions()
+    return orchestrator.list_sessions(
+        status=status, since=since, limit=limit, offset=offset
+    )
+
+
+def rebuild_session_catalog(base_path: str = "RESEARCH") -> Dict:
+    orchestrator = ResearchOrchestrator(base_path)
+    return orchestrator.rebuild_catalog()
+
+
+def get_session_metrics(
+    session_id: str, base_path: str = "RESEARCH", prometheus: bool = False
+) -> Any:
+    orchestrator = ResearchOrchestrator(base_path)
+    return orchestrator.get_metrics(session_id, prometheus)
+
+
+def archive_research_session(session_id: str, base_path: str = "RESEARCH") -> Dict:
+    orchestrator = ResearchOrchestrator(base_path)
+    return orchestrator.archive_session(session_id)
+
+
+def archive_completed_sessions(base_path: str = "RESEARCH") -> List[Dict]:
+    orchestrator = ResearchOrchestrator(base_path)
+    return orchestrator.archive_completed()
+
+
+def unarchive_research_session(session_id: str, base_path: str = "RESEARCH") -> Dict:
+    orchestrator = ResearchOrchestrator(base_path)
+    return orchestrator.unarchive_session(session_id)
+
+
+def fetch_cache_stats(base_path: str = "RESEARCH", prune: bool = False) -> Dict:
+    cache = FetchCache(Path(base_path))
+    try:
+        pruned = cache.prune() if prune else 0
+        result = cache.stats()
+        result.pop("session")
+        if prune:
+            result["pruned"] = pruned
+        return result
+    finally:
+        cache.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Deep Research session manager")
+    parser.add_argument("--base-path", default="RESEARCH")
+    commands = parser.add_subparsers(dest="command")
+
+    init_cmd = commands.add_parser("init", help="Create a research session")
+    init_cmd.add_argument("topic")
+    resume_cmd = commands.add_parser("resume", help="Resume a research session")
+    resume_cmd.add_argument("session_id")
+    status_cmd = commands.add_parser("status", help="Show session status")
+    status_cmd.add_argument("session_id")
+    list_cmd = commands.add_parser("list", help="List sessions from the catalog")
+    list_cmd.add_argument("--status")
+    list_cmd.add_argument("--since")
+    list_cmd.add_argument("--limit", type=int)
+    list_cmd.add_argument("--offset", type=int, default=0)
+    commands.add_parser("rebuild-catalog", help="Rebuild the session catalog")
+    cache_cmd = commands.add_parser("cache", help="Show shared fetch cache stats")
+    cache_cmd.add_argument("--prune", action="store_true", help="Drop expired entries")
+    metrics_cmd = commands.add_parser("metrics", help="Show session metrics")
+    metrics_cmd.add_argument("session_id")
+    metrics_cmd.add_argument(
+        "--prometheus", action="store_true", help="Prometheus text format"
+    )
+    path_cmd = commands.add_parser(
+        "critical-path", help="Critical agent task chain from the session trace"
+    )
+    path_cmd.add_argument("session_id")
+    path_cmd.add_argument("--max-parallel-agents", type=int)
+    archive_cmd = commands.add_parser(
+        "archive", help="Pack COMPLETED sessions into single zip archives"
+    )
+    archive_cmd.add_argument("session_ids", nargs="*")
+    archive_cmd.add_argument(
+        "--completed", action="store_true", help="Archive every COMPLETED session"
+    )
+    unarchive_cmd = commands.add_parser(
+        "unarchive", help="Extract an archived session"
+    )
+    unarchive_cmd.add_argument("session_id")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "init":
+        result = init_research(args.topic, args.base_path)
+    elif args.command == "resume":
+        result = resume_research(args.session_id, args.base_path)
+    elif args.command == "status":
+        result = get_research_status(args.session_id, args.base_path)
+    elif args.command == "list":
+        result = list_research_sessions(
+            args.base_path, args.status, args.since, args.limit, args.offset
+        )
+    elif args.command == "rebuild-catalog":
+        result = rebuild_session_catalog(args.base_path)
+    elif args.command == "cache":
+        result = fetch_cache_stats(args.base_path, args.prune)
+    elif args.command == "metrics":
+        result = get_session_metrics(args.session_id, args.base_path, args.prometheus)
+        if isinstance(result, str):
+            print(result, end="")
+            return
+    elif args.command == "critical-path":
+        result = critical_path(
+            args.session_id, args.base_path, args.max_parallel_agents
+        )
+    elif args.command == "archive":
+        result = [
+            archive_research_session(session_id, args.base_path)
+            for session_id in args.session_ids
+        ]
+        if args.completed:
+            result.extend(archive_completed_sessions(args.base_path))
+    elif args.command == "unarchive":
+        result = unarchive_research_session(args.session_id, args.base_path)
+    else:
+        result = init_research("AI Detection Technologies 2025", args.base_path)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
 
 
 if __name__ == "__main__":
-    result = init_research("AI Detection Technologies 2025")
-    print(json.dumps(result, indent=2))
+    main()
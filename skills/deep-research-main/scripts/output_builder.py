@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Output Builder - renders Phase 7 files (executive summary, outputs/0X_* sections,
+website/) from assets/templates in a thread pool.
+
+Each output's inputs (template text, placeholder values and any extra input
+files such as drafts) are hashed. Outputs whose hash matches the last build are
+skipped, so rebuilding after a small edit only renders what changed. Files are
+written to a temp name and renamed into place.
+
+The contents of a spec's input and draft files are available to its template
+as {INPUT_<NAME>} and {DRAFT_<NAME>}, where NAME is the upper-cased file stem
+("artifacts/drafts/02_market-size.md" fills {DRAFT_02_MARKET_SIZE}). Explicit
+values take precedence.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "assets" / "templates"
+MANIFEST_FILE = "outputs/.build_manifest.json"
+MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Templates use {UPPER_CASE} placeholders; the HTML template also contains CSS
+# braces, so str.format is not an option.
+_PLACEHOLDER_RE = re.compile(r"\{([A-Z][A-Z0-9_]*)\}")
+_NON_NAME_RE = re.compile(r"[^A-Z0-9]+")
+
+
+@dataclass
+class OutputSpec:
+    path: str
+    template: str
+    values: Dict[str, Any] = field(default_factory=dict)
+    inputs: List[str] = field(default_factory=list)
+    drafts: List[str] = field(default_factory=list)
+
+
+def render_template(template: str, values: Dict[str, Any]) -> str:
+    """Fill {NAME} placeholders; unknown ones are left for QA to spot."""
+    return _PLACEHOLDER_RE.sub(
+        lambda m: str(values[m.group(1)]) if m.group(1) in values else m.group(0),
+        template,
+    )
+
+
+def file_placeholder(prefix: str, name: str) -> str:
+    """Placeholder a file's contents fill: ("DRAFT", "drafts/a-b.md") -> "DRAFT_A_B"."""
+    stem = _NON_NAME_RE.sub("_", Path(name).stem.upper()).strip("_")
+    return f"{prefix}_{stem}"
+
+
+def _write_atomic(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(
+        f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class OutputBuilder:
+    def __init__(
+        self,
+        session_path: Path,
+        templates_dir: Path = TEMPLATES_DIR,
+        max_workers: int = MAX_WORKERS,
+        state: Optional[Any] = None,
+    ):
+        self.session_path = Path(session_path)
+        self.templates_dir = Path(templates_dir)
+        self.max_workers = max_workers
+        self.state = state
+        self._templates: Dict[str, str] = {}
+        self._templates_lock = threading.Lock()
+
+    @classmethod
+    def for_state(cls, state, **kwargs) -> "OutputBuilder":
+        return cls(state.session_path, state=state, **kwargs)
+
+    def _template(self, name: str) -> str:
+        with self._templates_lock:
+            if name not in self._templates:
+                self._templates[name] = (self.templates_dir / name).read_text(
+                    encoding="utf-8"
+                )
+            return self._templates[name]
+
+    def _read_files(self, spec: OutputSpec) -> Dict[str, Optional[str]]:
+        contents: Dict[str, Optional[str]] = {}
+        for name in spec.inputs + spec.drafts:
+            path = self.session_path / name
+            contents[name] = path.read_text(encoding="utf-8") if path.exists() else None
+        return contents
+
+    def _input_hash(self, spec: OutputSpec, contents: Dict[str, Optional[str]]) -> str:
+        digest = hashlib.sha256()
+        digest.update(self._template(spec.template).encode("utf-8"))
+        digest.update(
+            json.dumps(spec.values, sort_keys=True, ensure_ascii=False, default=str)
+            .encode("utf-8")
+        )
+        for name in sorted(contents):
+            digest.update(name.encode("utf-8"))
+            if contents[name] is not None:
+                digest.update(contents[name].encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _values(spec: OutputSpec, contents: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for prefix, names in (("INPUT", spec.inputs), ("DRAFT", spec.drafts)):
+            for name in names:
+                if contents[name] is not None:
+                    values[file_placeholder(prefix, name)] = contents[name]
+        values.update(spec.values)
+        return values
+
+    def _load_manifest(self) -> Dict[str, str]:
+        path = self.session_path / MANIFEST_FILE
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _build_one(
+        self, spec: OutputSpec, previous: Optional[str], force: bool
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"path": spec.path}
+        try:
+            contents = self._read_files(spec)
+            input_hash = self._input_hash(spec, contents)
+            result["hash"] = input_hash
+            target = self.session_path / spec.path
+            if not force and input_hash == previous and target.exists():
+                result["status"] = "skipped"
+            else:
+                rendered = render_template(
+                    self._template(spec.template), self._values(spec, contents)
+                )
+                _write_atomic(target, rendered)
+                result["status"] = "built"
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+        result["seconds"] = round(time.perf_counter() - started, 4)
+        return result
+
+    def build(self, specs: List[OutputSpec], force: bool = False) -> Dict[str, Any]:
+        started = time.perf_counter()
+        manifest = self._load_manifest()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            files = list(
+                pool.map(
+                    lambda spec: self._build_one(spec, manifest.get(spec.path), force),
+                    specs,
+                )
+            )
+
+        for spec, result in zip(specs, files):
+            if result["status"] != "failed":
+                manifest[spec.path] = result.pop("hash")
+        _write_atomic(
+            self.session_path / MANIFEST_FILE, json.dumps(manifest, indent=2)
+        )
+
+        if self.state is not None:
+            for spec, result in zip(specs, files):
+                if result["status"] == "built" and spec.drafts:
+                    self.state.record_output_inputs(spec.path, spec.drafts)
+
+        counts = {"built": 0, "skipped": 0, "failed": 0}
+        for result in files:
+            counts[result["status"]] += 1
+        return {
+            **counts,
+            "seconds": round(time.perf_counter() - started, 4),
+            "files": files,
+        }
+
+
+def build_outputs(state, specs: List[OutputSpec], force: bool = False) -> Dict:
+    return OutputBuilder.for_state(state).build(specs, force)
@@ -3,11 +3,17 @@
 Deep Research Pipeline Definitions
 """
 
-from typing import Dict, List, Any, Optional
+import hashlib
+import json
+import math
+import re
+from typing import Dict, List, Any, Optional, Callable, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
+from tracing import span
+
 
 class AgentType(Enum):
     EXPLORE = "explore"
@@ -30,6 +36,22 @@ class AgentTask:
     prompt: str
     subtopic: str
     expected_output: str
+    priority: int = 1
+
+    @property
+    def prompt_tokens(self) -> int:
+        return estimate_tokens(self.prompt)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE token count: ~4 UTF-8 bytes per token, good enough for budgets."""
+    return math.ceil(len(text.encode("utf-8")) / 4)
+
+
+def task_key(task: AgentTask) -> str:
+    """Stable checkpoint key for a task: agent type, subtopic and prompt."""
+    material = f"{task.agent_type.value}\0{task.subtopic}\0{task.prompt}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
 
 
 @dataclass
@@ -39,6 +61,8 @@ class PipelineConfig:
     quality_threshold: str = "C"
     max_parallel_agents: int = 5
     search_timeout_seconds: int = 60
+    max_agent_attempts: int = 3
+    retry_backoff_seconds: float = 2.0
 
 
 CLARIFICATION_QUESTIONS = """
@@ -332,10 +356,170 @@ def generate_research_plan(topic: str, requirements: Dict) -> Dict:
     }
 
 
-def create_agent_tasks(subtopics: List[str], topic: str) -> List[AgentTask]:
+def plan_queries(plan: Dict[str, Any]) -> List[SearchQuery]:
+    """
+    SearchQuery list of a Phase 2 plan: {subtopic: [query, ...]} under
+    "search_queries", prioritized by the optional {subtopic: priority} map
+    under "priorities" (1 runs first).
+    """
+    priorities = plan.get("priorities") or {}
+    return [
+        SearchQuery(query=text, subtopic=subtopic, priority=priorities.get(subtopic, 1))
+        for subtopic, texts in (plan.get("search_queries") or {}).items()
+        for text in texts
+    ]
+
+
+def subtopic_priorities(queries: List[SearchQuery]) -> Dict[str, int]:
+    priorities: Dict[str, int] = {}
+    for query in queries:
+        priorities[query.subtopic] = min(
+            query.priority, priorities.get(query.subtopic, query.priority)
+        )
+    return priorities
+
+
+# Question words stay: "why X fails" and "how X works" are different searches.
+QUERY_STOPWORDS = frozenset(
+    """a an and are as at by for from in is it of on or the to vs with latest
+    current recent""".split()
+)
+_QUERY_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.-]*")
+_YEAR_TOKEN_RE = re.compile(r"^(19|20)\d{2}$")
+
+
+def normalize_query(query: str) -> str:
+    """Case, stopword, word-order and year insensitive key for a search query."""
+    tokens = set()
+    for token in _QUERY_TOKEN_RE.findall(query.lower()):
+        token = token.rstrip(".")
+        if not token or token in QUERY_STOPWORDS or _YEAR_TOKEN_RE.match(token):
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.add(token)
+    return " ".join(sorted(tokens)) or query.strip().lower()
+
+
+class QueryRegistry:
+    """
+    Collapses equivalent SearchQuery strings across subtopics and memoizes
+    their results, so each distinct search runs once and its results fan out
+    to every subtopic that asked for it.
+    """
+
+    def __init__(self):
+        self.queries: Dict[str, SearchQuery] = {}
+        self.subscribers: Dict[str, List[str]] = {}
+        self.results: Dict[str, List[Any]] = {}
+        self.stats = {"requested": 0, "searches_run": 0, "searches_saved": 0}
+        # Planned (subtopic, query) requests, counted when planned: searching
+        # one of them later is the same request, not a new one.
+        self._planned: Set[Tuple[str, str]] = set()
+
+    def _subscribe(self, key: str, subtopic: str):
+        subscribers = self.subscribers.setdefault(key, [])
+        if subtopic not in subscribers:
+            subscribers.append(subtopic)
+
+    def register(self, query: SearchQuery, planned: bool = False) -> bool:
+        """Subscribe query.subtopic to the query; True if it is a new search."""
+        key = normalize_query(query.query)
+        request = (query.subtopic, query.query)
+        counted = request in self._planned
+        if planned:
+            self._planned.add(request)
+        else:
+            self._planned.discard(request)
+        if not counted:
+            self.stats["requested"] += 1
+        self._subscribe(key, query.subtopic)
+
+        existing = self.queries.get(key)
+        if existing is None:
+            self.queries[key] = query
+            return True
+        if not counted:
+            self.stats["searches_saved"] += 1
+        existing.priority = min(existing.priority, query.priority)
+        return False
+
+    def register_all(
+        self, queries: List[SearchQuery], planned: bool = False
+    ) -> List[SearchQuery]:
+        return [query for query in queries if self.register(query, planned)]
+
+    def register_plan(
+        self,
+        search_queries: Dict[str, List[str]],
+        priorities: Optional[Dict[str, int]] = None,
+    ) -> List[SearchQuery]:
+        """Register a plan's {subtopic: [query, ...]} map."""
+        plan = {"search_queries": search_queries, "priorities": priorities}
+        return self.register_all(plan_queries(plan), planned=True)
+
+    def pending(self) -> List[SearchQuery]:
+        """Distinct searches that still need to run, highest priority first."""
+        return sorted(
+            (q for key, q in self.queries.items() if key not in self.results),
+            key=lambda q: q.priority,
+        )
+
+    def record_results(self, query: SearchQuery, results: List[Any]):
+        key = normalize_query(query.query)
+        if key not in self.queries:
+            self.register(query)
+        self.results[key] = list(results)
+        self.stats["searches_run"] += 1
+
+    def search(
+        self, query: SearchQuery, search_fn: Callable[[SearchQuery], List[Any]]
+    ) -> List[Any]:
+        """Run search_fn for query unless an equivalent search already ran."""
+        key = normalize_query(query.query)
+        self.register(query)
+        if key not in self.results:
+            with span("search", "search", query=query.query, subtopic=query.subtopic):
+                results = search_fn(self.queries[key])
+            self.record_results(query, results)
+        return self.results[key]
+
+    def results_by_subtopic(self) -> Dict[str, List[Any]]:
+        fanned_out: Dict[str, List[Any]] = {}
+        for key, results in self.results.items():
+            for subtopic in self.subscribers.get(key, []):
+                fanned_out.setdefault(subtopic, []).extend(results)
+        return fanned_out
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "distinct_queries": len(self.queries),
+            "shared_queries": [
+                {"query": self.queries[key].query, "subtopics": subtopics}
+                for key, subtopics in self.subscribers.items()
+                if len(subtopics) > 1
+            ],
+        }
+
+    def save(self, state) -> Dict[str, Any]:
+        """Write the report to the session's artifacts/search_queries.json."""
+        report = self.report()
+        state.save_artifact(
+            "search_queries.json", json.dumps(report, indent=2, ensure_ascii=False)
+        )
+        return report
+
+
+def create_agent_tasks(
+    subtopics: List[str], topic: str, queries: Optional[List[SearchQuery]] = None
+) -> List[AgentTask]:
     tasks = []
+    priorities = subtopic_priorities(queries or [])
+    lowest_priority = max(priorities.values(), default=1)
 
     for subtopic in subtopics:
+        priority = priorities.get(subtopic, 1)
         tasks.append(
             AgentTask(
                 agent_type=AgentType.EXPLORE,
@@ -345,6 +529,7 @@ def create_agent_tasks(subtopics: List[str], topic: str) -> List[AgentTask]:
                 ),
                 subtopic=subtopic,
                 expected_output="Structured findings with citations",
+                priority=priority,
             )
         )
 
@@ -357,6 +542,7 @@ def create_agent_tasks(subtopics: List[str], topic: str) -> List[AgentTask]:
                 ),
                 subtopic=subtopic,
                 expected_output="Challenge analysis with sources",
+                priority=priority,
             )
         )
 
@@ -367,6 +553,7 @@ def create_agent_tasks(subtopics: List[str], topic: str) -> List[AgentTask]:
                 prompt=AGENT_PROMPTS["librarian_docs"].format(subtopic=subtopic),
                 subtopic=subtopic,
                 expected_output="Documentation links and summaries",
+                priority=priority,
             )
         )
 
@@ -379,6 +566,7 @@ def create_agent_tasks(subtopics: List[str], topic: str) -> List[AgentTask]:
             ),
             subtopic="future",
             expected_output="Future predictions with timeline",
+            priority=lowest_priority,
         )
     )
 
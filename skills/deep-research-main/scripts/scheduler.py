@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Agent Scheduler - runs AgentTask lists with bounded concurrency under
+PipelineConfig limits (priority order, per-task timeout, retries, cancellation).
+An optional budget (batch_runner.GlobalBudget) caps agents running at once
+across every scheduler sharing it, in this process or others. Executors search
+through AgentExecutor.search, which dedups queries across subtopics with the
+session's QueryRegistry.
+"""
+
+import asyncio
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from orchestrator import PhaseStatus
+from pipelines import AgentTask, PipelineConfig, SearchQuery, task_key
+from tracing import PHASE_LANE, span
+
+
+class TaskOutcome(Enum):
+    COMPLETED = "completed"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+    CANCELLED = "cancelled"
+    SKIPPED = "skipped"
+
+
+# Cancelled tasks stay pending so a resumed run picks them up again.
+CHECKPOINT_STATUS = {
+    TaskOutcome.COMPLETED: PhaseStatus.COMPLETED,
+    TaskOutcome.FAILED: PhaseStatus.FAILED,
+    TaskOutcome.TIMED_OUT: PhaseStatus.FAILED,
+    TaskOutcome.CANCELLED: PhaseStatus.PENDING,
+}
+
+
+@dataclass
+class AgentResult:
+    task: AgentTask
+    outcome: TaskOutcome
+    output: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    artifact: Optional[str] = None
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.finished_at - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "agent_type": self.task.agent_type.value,
+            "description": self.task.description,
+            "subtopic": self.task.subtopic,
+            "priority": self.task.priority,
+            "outcome": self.outcome.value,
+            "attempts": self.attempts,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "error": self.error,
+            "output": self.output,
+        }
+
+
+class AgentExecutor(ABC):
+    """Runs one agent task and returns its findings text."""
+
+    # The ResearchState of the AgentScheduler running this executor, if any.
+    session: Optional[Any] = None
+
+    @abstractmethod
+    async def run(self, task: AgentTask) -> str:
+        """Findings for task; raising fails the attempt (it may be retried)."""
+
+    def search(
+        self,
+        task: AgentTask,
+        query: str,
+        search_fn: Callable[[SearchQuery], List[Any]],
+    ) -> List[Any]:
+        """
+        Search for task.subtopic through the session's QueryRegistry, so an
+        equivalent query from another subtopic reuses the stored results.
+        """
+        search_query = SearchQuery(
+            query=query, subtopic=task.subtopic, priority=task.priority
+        )
+        if self.session is None:
+            return search_fn(search_query)
+        return self.session.search(search_query, search_fn)
+
+
+class FakeExecutor(AgentExecutor):
+    """Local stand-in for real agents: sleeps, optionally fails, echoes the task."""
+
+    def __init__(
+        self,
+        delay_seconds: float = 0.01,
+        delays: Optional[Dict[str, float]] = None,
+        failures: Optional[Dict[str, int]] = None,
+    ):
+        self.delay_seconds = delay_seconds
+        self.delays = delays or {}
+        self.failures = dict(failures or {})
+        self.calls: List[str] = []
+
+    async def run(self, task: AgentTask) -> str:
+        self.calls.append(task.description)
+        await asyncio.sleep(self.delays.get(task.description, self.delay_seconds))
+        if self.failures.get(task.description, 0) > 0:
+            self.failures[task.description] -= 1
+            raise RuntimeError(f"Simulated failure for {task.description}")
+        return f"# {task.description}\n\nFindings for {task.subtopic}."
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_")[:60]
+
+
+class AgentScheduler:
+    def __init__(
+        self,
+        executor: AgentExecutor,
+        config: Optional[PipelineConfig] = None,
+        state: Optional[Any] = None,
+        on_result: Optional[Callable[[AgentResult], None]] = None,
+        budget: Optional[Any] = None,
+    ):
+        self.executor = executor
+        self.config = config or PipelineConfig()
+        self.state = state
+        if state is not None:
+            executor.session = state
+        self.on_result = on_result
+        self.budget = budget
+        self._cancelled = asyncio.Event()
+        self._running: Dict[int, asyncio.Task] = {}
+
+    def cancel(self):
+        self._cancelled.set()
+        for running in list(self._running.values()):
+            running.cancel()
+
+    async def run(self, tasks: List[AgentTask]) -> List[AgentResult]:
+        self._cancelled = asyncio.Event()
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        results: List[Optional[AgentResult]] = [None] * len(tasks)
+        if self.state is not None:
+            self.state.register_tasks(tasks)
+
+        for index, task in enumerate(tasks):
+            checkpoint = self.state.get_task_status(task) if self.state else None
+            if checkpoint and checkpoint["status"] == PhaseStatus.COMPLETED.value:
+                # Finished in an earlier run; its result artifact is already saved.
+                results[index] = AgentResult(
+                    task,
+                    TaskOutcome.SKIPPED,
+                    attempts=checkpoint.get("attempts", 0),
+                    artifact=checkpoint.get("artifact"),
+                )
+                continue
+            queue.put_nowait((task.priority, index, task))
+
+        lanes = max(1, min(self.config.max_parallel_agents, len(tasks)))
+        with self._trace_run(len(tasks), lanes):
+            # Workers copy the current context, so task spans nest under the run.
+            workers = [
+                asyncio.ensure_future(self._worker(queue, results, lane))
+                for lane in range(1, lanes + 1)
+            ]
+            try:
+                await asyncio.gather(*workers)
+            except asyncio.CancelledError:
+                self.cancel()
+                raise
+            finally:
+                for worker in workers:
+                    worker.cancel()
+
+        for index, task in enumerate(tasks):
+            if results[index] is None:
+                results[index] = AgentResult(task, TaskOutcome.CANCELLED)
+        return results
+
+    def run_sync(self, tasks: List[AgentTask]) -> List[AgentResult]:
+        return asyncio.run(self.run(tasks))
+
+    def _trace_run(self, task_count: int, lanes: int):
+        """Scheduler span under the phase in progress; untraced without a state."""
+        if self.state is None:
+            return nullcontext()
+        tracer = self.state.tracer()
+        for lane in range(1, lanes + 1):
+            tracer.name_lane(lane, f"agent lane {lane}")
+        return tracer.span(
+            "scheduler",
+            "scheduler",
+            parent_id=self.state.current_phase_span_id(),
+            tid=PHASE_LANE,
+            tasks=task_count,
+            max_parallel_agents=self.config.max_parallel_agents,
+        )
+
+    async def _worker(self, queue: asyncio.PriorityQueue, results: List, lane: int):
+        while not self._cancelled.is_set():
+            try:
+                _, index, task = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            with span(
+                task.description,
+                "agent",
+                tid=lane,
+                agent_type=task.agent_type.value,
+                subtopic=task.subtopic,
+            ) as task_span:
+                result = await self._run_task(index, task)
+                if task_span is not None:
+                    task_span.args["outcome"] = result.outcome.value
+                    task_span.args["attempts"] = result.attempts
+            results[index] = result
+            self._publish(result)
+
+    async def _run_task(self, index: int, task: AgentTask) -> AgentResult:
+        result = AgentResult(task, TaskOutcome.CANCELLED, started_at=time.time())
+        if self.state is not None:
+            self.state.record_task_status(task, PhaseStatus.IN_PROGRESS.value)
+        max_attempts = max(1, self.config.max_agent_attempts)
+
+        while result.attempts < max_attempts and not self._cancelled.is_set():
+            result.attempts += 1
+            running = asyncio.ensure_future(self._attempt(task))
+            self._running[index] = running
+            try:
+                result.output = await running
+                result.outcome = TaskOutcome.COMPLETED
+                result.error = None
+                break
+            except asyncio.TimeoutError:
+                result.outcome = TaskOutcome.TIMED_OUT
+                result.error = f"Timed out after {self.config.search_timeout_seconds}s"
+            except asyncio.CancelledError:
+                if not self._cancelled.is_set():
+                    # The run itself was cancelled, not only this attempt: stop
+                    # every lane instead of moving on to the next task.
+                    self.cancel()
+                    raise
+                result.outcome = TaskOutcome.CANCELLED
+                result.error = "Cancelled"
+                break
+            except Exception as e:
+                result.outcome = TaskOutcome.FAILED
+                result.error = str(e)
+            finally:
+                self._running.pop(index, None)
+
+            if self._cancelled.is_set():
+                result.outcome = TaskOutcome.CANCELLED
+                break
+            if result.attempts < max_attempts:
+                backoff = self.config.retry_backoff_seconds * 2 ** (result.attempts - 1)
+                await asyncio.sleep(backoff)
+
+        result.finished_at = time.time()
+        return result
+
+    async def _attempt(self, task: AgentTask) -> str:
+        """One executor run; time spent waiting for a budget slot is not timed."""
+        if self.budget is None:
+            return await self._run_executor(task)
+        async with self.budget.agent_slot():
+            return await self._run_executor(task)
+
+    async def _run_executor(self, task: AgentTask) -> str:
+        return await asyncio.wait_for(
+            self.executor.run(task), self.config.search_timeout_seconds
+        )
+
+    def _publish(self, result: AgentResult):
+        if self.state is not None:
+            # Named by checkpoint key: a resumed run, whose task list may be
+            # ordered differently, rewrites the same artifact for the same task.
+            name = (
+                f"{result.task.agent_type.value}_{_slug(result.task.description)}_"
+                f"{task_key(result.task)}.json"
+            )
+            self.state.save_artifact(
+                name,
+                json.dumps(result.to_dict(), indent=2, ensure_ascii=False),
+                subfolder="agent_results",
+            )
+            result.artifact = f"artifacts/agent_results/{name}"
+            self.state.record_task_status(
+                result.task,
+                CHECKPOINT_STATUS[result.outcome].value,
+                artifact=result.artifact,
+                attempts=result.attempts,
+                error=result.error,
+            )
+            self.state.record_agent_metric(
+                result.task,
+                result.outcome.value,
+                result.duration_seconds,
+                result.attempts,
+            )
+        if self.on_result is not None:
+            self.on_result(result)
+
+
+def run_agent_tasks(
+    tasks: List[AgentTask],
+    executor: AgentExecutor,
+    config: Optional[PipelineConfig] = None,
+    state: Optional[Any] = None,
+) -> List[AgentResult]:
+    return AgentScheduler(executor, config, state).run_sync(tasks)
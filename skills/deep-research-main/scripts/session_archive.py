@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Session Archive - packs a COMPLETED session directory into one zip file next
+to it (RESEARCH/<session_id>.zip) and reads members back without extracting.
+
+A zip keeps a central directory, so opening an archive reads only the index
+and a member is decompressed when it is asked for: loading an archived
+session's state touches state.json and nothing else. Sealed source segments
+are already compressed and are stored as-is; everything else is deflated.
+sources/sources.db is left out, it is rebuilt from the source log on demand.
+Every folder gets a directory entry, so the empty outputs/ and website/
+folders of the session layout come back on unarchive.
+"""
+
+import os
+import shutil
+import zipfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+ARCHIVE_SUFFIX = ".zip"
+# Lock file and the derived SQLite store (with its WAL files).
+EXCLUDED = (".lock", "sources/sources.db")
+STORED_SUFFIXES = (".gz", ".xz", ".zst", ".png", ".jpg", ".jpeg", ".zip")
+
+
+def archive_path(base_path: Path, session_id: str) -> Path:
+    return Path(base_path) / f"{session_id}{ARCHIVE_SUFFIX}"
+
+
+def is_archive(path: Path) -> bool:
+    return path.is_file() and path.name.endswith(ARCHIVE_SUFFIX)
+
+
+def _excluded(name: str) -> bool:
+    return any(name == e or name.startswith(e + "-") for e in EXCLUDED)
+
+
+def pack_session(session_path: Path, target: Path) -> Dict[str, Any]:
+    """Write session_path into the zip at target (atomically); returns sizes."""
+    session_path = Path(session_path)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    files = size = inodes = 0
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for root, dirs, names in os.walk(session_path):
+            dirs.sort()
+            inodes += len(dirs) + len(names)
+            for name in dirs:
+                path = Path(root) / name
+                zf.write(path, path.relative_to(session_path).as_posix())
+            for name in sorted(names):
+                path = Path(root) / name
+                member = path.relative_to(session_path).as_posix()
+                size += path.stat().st_size
+                if _excluded(member):
+                    continue
+                stored = name.endswith(STORED_SUFFIXES)
+                zf.write(
+                    path,
+                    member,
+                    zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED,
+                )
+                files += 1
+    os.replace(tmp, target)
+    return {
+        "archive": str(target),
+        "files": files,
+        "inodes_before": inodes + 1,
+        "bytes_before": size,
+        "bytes_after": target.stat().st_size,
+    }
+
+
+def unpack_session(source: Path, session_path: Path):
+    """Extract an archive into session_path (which must not exist yet)."""
+    session_path = Path(session_path)
+    tmp = session_path.with_name(f".{session_path.name}.{os.getpid()}.tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    with zipfile.ZipFile(source) as zf:
+        zf.extractall(tmp)
+    os.replace(tmp, session_path)
+
+
+class _ArchiveDirectory:
+    """Read-only view of one folder inside an archive (the SourceLog `files`)."""
+
+    def __init__(self, archive: "SessionArchive", prefix: str):
+        self.archive = archive
+        self.prefix = prefix.rstrip("/") + "/"
+
+    def names(self) -> List[str]:
+        return self.archive.names(self.prefix)
+
+    def open(self, name: str) -> BinaryIO:
+        return self.archive.open(self.prefix + name)
+
+    def size(self, name: str) -> int:
+        return self.archive.size(self.prefix + name)
+
+    def exists(self, name: str) -> bool:
+        return name in self.names()
+
+
+class SessionArchive:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._zip: Optional[zipfile.ZipFile] = None
+
+    def _zipfile(self) -> zipfile.ZipFile:
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path)
+        return self._zip
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def names(self, prefix: str = "") -> List[str]:
+        """Member names directly under prefix ("sources/"), without the prefix."""
+        return [
+            name[len(prefix) :]
+            for name in self._zipfile().namelist()
+            if name.startswith(prefix)
+            and name[len(prefix) :]
+            and "/" not in name[len(prefix) :]
+        ]
+
+    def size(self, name: str) -> int:
+        try:
+            return self._zipfile().getinfo(name).file_size
+        except KeyError:
+            return 0
+
+    def open(self, name: str) -> BinaryIO:
+        try:
+            return self._zipfile().open(name)
+        except KeyError:
+            raise FileNotFoundError(f"{name} not in {self.path}") from None
+
+    def read_bytes(self, name: str) -> bytes:
+        with self.open(name) as f:
+            return f.read()
+
+    def lines(self, name: str) -> Iterator[bytes]:
+        if not self.size(name):
+            return
+        with self.open(name) as f:
+            yield from f
+
+    def view(self, prefix: str) -> _ArchiveDirectory:
+        return _ArchiveDirectory(self, prefix)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Session catalog: one small SQLite index under the research base path so that
+listing sessions does not open every state.json.
+
+Saving a session upserts its row, which also creates the catalog. A catalog
+is only trusted for listing once it has been filled from the sessions on disk
+(mark_complete); until then the orchestrator rebuilds it, so sessions that
+predate the catalog are not hidden.
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+CATALOG_FILE = "_catalog.db"
+CATALOG_FIELDS = ("session_id", "topic", "status", "created_at", "updated_at")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    topic TEXT,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions(status, updated_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SessionCatalog:
+    def __init__(self, base_path: Path):
+        self.path = Path(base_path) / CATALOG_FILE
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def is_complete(self) -> bool:
+        """True once the catalog has been filled from the sessions on disk."""
+        if not self.exists():
+            return False
+        row = (
+            self._connection()
+            .execute("SELECT value FROM meta WHERE key = 'rebuilt_at'")
+            .fetchone()
+        )
+        return row is not None
+
+    def mark_complete(self):
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('rebuilt_at', ?)",
+                (datetime.now().isoformat(),),
+            )
+
+    def upsert(self, state: Dict[str, Any]):
+        self.upsert_many([state])
+
+    def upsert_many(self, states: List[Dict[str, Any]]):
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT INTO sessions (session_id, topic, status, created_at, "
+                "updated_at) VALUES (?, ?, ?, ?, ?) ON CONFLICT(session_id) DO "
+                "UPDATE SET topic=excluded.topic, status=excluded.status, "
+                "created_at=excluded.created_at, updated_at=excluded.updated_at",
+                [tuple(state.get(field) for field in CATALOG_FIELDS) for state in states],
+            )
+
+    def remove(self, session_id: str):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM sessions")
+
+    def count(self, status: Optional[str] = None, since: Optional[str] = None) -> int:
+        where, params = self._filters(status, since)
+        return (
+            self._connection()
+            .execute(f"SELECT COUNT(*) FROM sessions{where}", params)
+            .fetchone()[0]
+        )
+
+    def list(
+        self,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        where, params = self._filters(status, since)
+        sql = (
+            f"SELECT {', '.join(CATALOG_FIELDS)} FROM sessions{where} "
+            "ORDER BY updated_at DESC LIMIT ? OFFSET ?"
+        )
+        params.extend([-1 if limit is None else limit, offset])
+        return [
+            dict(zip(CATALOG_FIELDS, row))
+            for row in self._connection().execute(sql, params)
+        ]
+
+    def _filters(self, status: Optional[str], since: Optional[str]):
+        where = []
+        params: List[Any] = []
+        if status is not None:
+            where.append("status = ?")
+            params.append(status)
+        if since is not None:
+            # ISO-8601 timestamps compare correctly as strings.
+            where.append("updated_at >= ?")
+            params.append(since)
+        return (" WHERE " + " AND ".join(where) if where else ""), params
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Append-only source log in size-capped segments, with a sidecar byte-offset
+index (sources.idx).
+
+Segment 0 is sources.jsonl, segment n > 0 is sources.<n>.jsonl; new lines go
+to the highest-numbered one. Once a writer leaves it at segment_bytes or more
+the segment is sealed: the next segment file is created, then the sealed one is
+compressed to sources.<n>.jsonl.zst (zstandard installed), .gz or .xz and the
+plain file removed. Segment names are never reused, so a reader that opened a
+segment keeps reading the right data whatever happens after. A seal interrupted
+before compressing leaves a readable plain segment, compressed by the next seal.
+
+The index maps each source id to the segment, offset and length of its latest
+line (offsets into the uncompressed segment), so single records are read
+straight out of an mmap of the active segment or a decompressed sealed one,
+and streaming readers can skip superseded versions. A removed source is a
+trailing {"id": ..., "deleted": true} tombstone line. Logs written before
+segments existed are segment 0 with three-field index lines.
+"""
+
+import functools
+import gzip
+import io
+import json
+import lzma
+import mmap
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+JSONL_NAME = "sources.jsonl"
+INDEX_NAME = "sources.idx"
+SEGMENT_BYTES = 16 * 2**20
+CACHED_SEGMENTS = 2
+
+# codec -> (file suffix, compress, decompress)
+CODECS: Dict[str, Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "gzip": (".gz", functools.partial(gzip.compress, compresslevel=6), gzip.decompress),
+    "lzma": (".xz", lzma.compress, lzma.decompress),
+}
+if zstandard is not None:
+    CODECS["zstd"] = (
+        ".zst",
+        lambda data: zstandard.ZstdCompressor().compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+DEFAULT_CODEC = "zstd" if zstandard is not None else "gzip"
+
+_DECOMPRESS = {suffix: decompress for suffix, _, decompress in CODECS.values()}
+_SEGMENT_RE = re.compile(r"^sources\.(\d+)\.jsonl(\.gz|\.xz|\.zst)?$")
+
+# (segment, offset, length) of a source's latest line
+Entry = Tuple[int, int, int]
+
+
+def segment_name(segment: int) -> str:
+    """File name of a segment before it is compressed."""
+    return JSONL_NAME if segment == 0 else f"sources.{segment:06d}.jsonl"
+
+
+class _Directory:
+    """The sources/ directory of a live session."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def names(self) -> List[str]:
+        try:
+            return os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+
+    def open(self, name: str) -> BinaryIO:
+        return open(self.path / name, "rb")
+
+    def size(self, name: str) -> int:
+        try:
+            return os.stat(self.path / name).st_size
+        except FileNotFoundError:
+            return 0
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self.path / name)
+
+
+class SourceLogWriter:
+    """Appends records to the log. Callers hold the session lock while open."""
+
+    def __init__(self, log: "SourceLog"):
+        self.log = log
+        self.segment = log._active
+        self._data = open(log.path(self.segment), "ab")
+        self._index = open(log.index_path, "ab")
+        self._offset = self._data.tell()
+
+    def write(self, source: Dict[str, Any]):
+        line = (json.dumps(source, ensure_ascii=False) + "\n").encode("utf-8")
+        self._data.write(line)
+        self._index.write(
+            f"{source['id']}\t{self._offset}\t{len(line)}\t{self.segment}\n".encode()
+        )
+        self.log._remember(source["id"], self.segment, self._offset, len(line))
+        self._offset += len(line)
+
+    def flush(self):
+        # Data before index: an index entry must never point past the data.
+        self._data.flush()
+        self._index.flush()
+
+    def close(self):
+        self.flush()
+        self.log._index_pos = self._index.tell()
+        self._data.close()
+        self._index.close()
+        if self._offset >= self.log.segment_bytes:
+            self.log.seal()
+
+
+class SourceLog:
+    def __init__(
+        self,
+        sources_dir: Path,
+        segment_bytes: int = SEGMENT_BYTES,
+        codec: str = DEFAULT_CODEC,
+        files: Optional[Any] = None,
+    ):
+        """
+        `files` is a read-only view of the directory (names/open/size/exists),
+        used to read the log of an archived session; by default sources_dir.
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec} (available: {sorted(CODECS)})")
+        self.sources_dir = Path(sources_dir)
+        self.jsonl_path = self.sources_dir / JSONL_NAME
+        self.index_path = self.sources_dir / INDEX_NAME
+        self.segment_bytes = segment_bytes
+        self.codec = codec
+        self.read_only = files is not None
+        self._files = files if files is not None else _Directory(self.sources_dir)
+        self._offsets: Dict[str, Entry] = {}
+        self._sealed: Dict[int, str] = {}
+        self._active = 0
+        self._scanned = False
+        self._index_pos = 0
+        self._indexed_end = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._mmap_file = None
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+
+    def path(self, segment: int) -> Path:
+        return self.sources_dir / segment_name(segment)
+
+    def close(self):
+        self._unmap()
+        self._cache.clear()
+
+    def writer(self) -> SourceLogWriter:
+        if self.read_only:
+            raise ValueError("Source log is read-only")
+        self.refresh()
+        return SourceLogWriter(self)
+
+    def _remember(self, source_id: str, segment: int, offset: int, length: int):
+        self._offsets[source_id] = (segment, offset, length)
+        if segment == self._active:
+            self._indexed_end = max(self._indexed_end, offset + length)
+
+    def _scan(self):
+        """List segments: the active one is the highest-numbered plain file."""
+        plain, compressed = set(), {}
+        for name in self._files.names():
+            match = _SEGMENT_RE.match(name)
+            if name == JSONL_NAME:
+                plain.add(0)
+            elif match and match.group(2):
+                compressed[int(match.group(1))] = name
+            elif match:
+                plain.add(int(match.group(1)))
+        numbers = plain | set(compressed)
+        active = max(numbers, default=0)
+        if active in compressed:
+            active += 1
+        # While a seal finishes both files exist; prefer the compressed one.
+        self._sealed = {
+            segment: compressed.get(segment) or segment_name(segment)
+            for segment in numbers
+            if segment != active
+        }
+        self._scanned = True
+        if active != self._active:
+            self._active = active
+            self._unmap()
+            self._indexed_end = max(
+                (
+                    offset + length
+                    for segment, offset, length in self._offsets.values()
+                    if segment == active
+                ),
+                default=0,
+            )
+
+    def _stale(self) -> bool:
+        """Whether a seal may have happened since the last scan."""
+        if not self._scanned:
+            return True
+        if self.read_only:
+            return False
+        # Sealing creates the next segment; compressing removes this one.
+        return self._files.exists(
+            segment_name(self._active + 1)
+        ) or not self._files.exists(segment_name(self._active))
+
+    def refresh(self) -> Dict[str, Entry]:
+        """Pick up segments, index entries and data lines added since the last read."""
+        if self._stale():
+            self._scan()
+
+        if self._files.size(INDEX_NAME) > self._index_pos:
+            with self._files.open(INDEX_NAME) as f:
+                f.seek(self._index_pos)
+                for line in f:
+                    parts = line.rstrip(b"\n").split(b"\t")
+                    if not line.endswith(b"\n") or len(parts) not in (3, 4):
+                        break
+                    segment = int(parts[3]) if len(parts) == 4 else 0
+                    self._remember(
+                        parts[0].decode(), segment, int(parts[1]), int(parts[2])
+                    )
+                    self._index_pos += len(line)
+
+        active_size = self._files.size(segment_name(self._active))
+        if not self.read_only and self._indexed_end < active_size:
+            # Lines appended without the index (older sessions, or a crash between
+            # the two writes): index the tail.
+            self._index_tail()
+        return self._offsets
+
+    def _index_tail(self):
+        segment = self._active
+        try:
+            data = open(self.path(segment), "rb")
+        except FileNotFoundError:
+            return
+        with data, open(self.index_path, "ab") as index:
+            data.seek(self._indexed_end)
+            offset = self._indexed_end
+            for line in data:
+                if not line.endswith(b"\n"):
+                    break
+                if line.strip():
+                    source_id = json.loads(line)["id"]
+                    self._remember(source_id, segment, offset, len(line))
+                    index.write(
+                        f"{source_id}\t{offset}\t{len(line)}\t{segment}\n".encode()
+                    )
+                offset += len(line)
+            self._indexed_end = offset
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._mmap_file is not None:
+            self._mmap_file.close()
+            self._mmap_file = None
+
+    def _map(self, end: int) -> Optional[mmap.mmap]:
+        """mmap of the active segment; None once it is compressed away."""
+        if self._mmap is None or len(self._mmap) < end:
+            if self._mmap_file is None:
+                try:
+                    self._mmap_file = open(self.path(self._active), "rb")
+                except FileNotFoundError:
+                    return None
+            if self._mmap is not None:
+                self._mmap.close()
+            self._mmap = mmap.mmap(
+                self._mmap_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        return self._mmap
+
+    def _sealed_data(self, segment: int) -> Optional[bytes]:
+        """Decompressed contents of a sealed segment, None if it is not sealed."""
+        data = self._cache.get(segment)
+        if data is not None:
+            self._cache.move_to_end(segment)
+            return data
+        name = self._sealed.get(segment)
+        if name is None:
+            return None
+        try:
+            with self._files.open(name) as f:
+                data = f.read()
+        except FileNotFoundError:
+            # Compressed by another process since the last scan.
+            return None
+        suffix = name[name.index(".jsonl") + len(".jsonl") :]
+        if suffix:
+            if suffix not in _DECOMPRESS:
+                raise RuntimeError(f"Reading {name} needs the zstandard package")
+            data = _DECOMPRESS[suffix](data)
+        self._cache[segment] = data
+        while len(self._cache) > CACHED_SEGMENTS:
+            self._cache.popitem(last=False)
+        return data
+
+    def _read(self, segment: int, offset: int, length: int) -> bytes:
+        for _ in range(2):
+            if segment == self._active and not self.read_only:
+                mapped = self._map(offset + length)
+                if mapped is not None:
+                    return mapped[offset : offset + length]
+            else:
+                data = self._sealed_data(segment)
+                if data is not None:
+                    return data[offset : offset + length]
+            self._scan()
+        raise FileNotFoundError(f"Source log segment {segment} not found")
+
+    def _open_segment(self, segment: int) -> Optional[BinaryIO]:
+        """Uncompressed stream of a segment; None if the active one is empty."""
+        for _ in range(2):
+            if segment == self._active:
+                if not self._files.size(segment_name(segment)):
+                    return None
+                try:
+                    return self._files.open(segment_name(segment))
+                except FileNotFoundError:
+                    pass
+            else:
+                data = self._sealed_data(segment)
+                if data is not None:
+                    return io.BytesIO(data)
+            self._scan()
+        raise FileNotFoundError(f"Source log segment {segment} not found")
+
+    def _lines(self, segment: int) -> Iterator[Tuple[int, bytes]]:
+        f = self._open_segment(segment)
+        if f is None:
+            return
+        offset = 0
+        with f:
+            for line in f:
+                yield offset, line
+                offset += len(line)
+
+    def segments(self) -> List[int]:
+        return sorted(self._sealed) + [self._active]
+
+    def seal(self, force: bool = False):
+        """
+        Seal the active segment once it holds segment_bytes (any data with force)
+        and compress every plain sealed segment. Needs the session lock.
+        """
+        if self.read_only:
+            raise ValueError("Source log is read-only")
+        self.refresh()
+        size = self._files.size(segment_name(self._active))
+        if size and (force or size >= self.segment_bytes):
+            # Creating the next segment is what seals this one.
+            open(self.path(self._active + 1), "ab").close()
+        self._scan()
+        suffix, compress, _ = CODECS[self.codec]
+        for segment, name in self._sealed.items():
+            if name.endswith(".jsonl"):
+                plain = self.path(segment)
+                target = plain.with_name(f"sources.{segment:06d}.jsonl{suffix}")
+                tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+                tmp.write_bytes(compress(plain.read_bytes()))
+                os.replace(tmp, target)
+                plain.unlink()
+        self._scan()
+
+    def get(self, source_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._offsets.get(source_id)
+        if entry is None:
+            entry = self.refresh().get(source_id)
+            if entry is None:
+                return None
+        source = json.loads(self._read(*entry))
+        return None if source.get("deleted") else source
+
+    def __len__(self) -> int:
+        return len(self.refresh())
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Every line in write order: superseded versions and tombstones too."""
+        self.refresh()
+        for segment in self.segments():
+            for _, line in self._lines(segment):
+                if line.endswith(b"\n") and line.strip():
+                    yield json.loads(line)
+
+    def iter(
+        self, filter: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        latest = {(segment, offset) for segment, offset, _ in self.refresh().values()}
+        for segment in self.segments():
+            for offset, line in self._lines(segment):
+                if (segment, offset) not in latest:
+                    continue
+                source = json.loads(line)
+                if source.get("deleted"):
+                    continue
+                if filter is None or filter(source):
+                    yield source
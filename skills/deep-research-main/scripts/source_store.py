@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Indexed per-session source store (SQLite) backing ResearchState source lookups.
+
+sources.jsonl stays the export format; this store answers filtered lookups
+("sources for subtopic X", "B-rated or better", "from domain Y") without
+rescanning the whole file.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+
+from dedup import (
+    Fingerprint,
+    canonicalize_url,
+    fingerprint,
+    pack_signature,
+    unpack_signature,
+)
+
+
+QUALITY_RANKS = {"A": 0, "B": 1, "C": 2, "D": 3, "E": 4}
+UNRATED_RANK = len(QUALITY_RANKS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id TEXT PRIMARY KEY,
+    url TEXT,
+    domain TEXT,
+    type TEXT,
+    quality_rating TEXT,
+    quality_rank INTEGER,
+    content_hash TEXT,
+    canonical_url TEXT,
+    minhash BLOB,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS source_subtopics (
+    subtopic TEXT NOT NULL,
+    quality_rank INTEGER NOT NULL,
+    source_rowid INTEGER NOT NULL,
+    PRIMARY KEY (subtopic, quality_rank, source_rowid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sources_domain ON sources(domain, quality_rank);
+CREATE INDEX IF NOT EXISTS idx_sources_quality ON sources(quality_rank);
+CREATE INDEX IF NOT EXISTS idx_sources_type ON sources(type, quality_rank);
+CREATE INDEX IF NOT EXISTS idx_sources_content_hash ON sources(content_hash);
+CREATE INDEX IF NOT EXISTS idx_sources_canonical_url ON sources(canonical_url);
+CREATE INDEX IF NOT EXISTS idx_source_subtopics_rowid
+    ON source_subtopics(source_rowid);
+"""
+
+ID_CHUNK = 500
+
+# Columns added after the first release of the store, for in-place upgrades.
+MIGRATED_COLUMNS = {"canonical_url": "TEXT", "minhash": "BLOB"}
+
+
+def quality_rank(rating: Optional[str]) -> int:
+    return QUALITY_RANKS.get((rating or "").strip().upper()[:1], UNRATED_RANK)
+
+
+def source_subtopics(source: Dict[str, Any]) -> List[str]:
+    subtopic = source.get("subtopic")
+    if not subtopic:
+        return []
+    if isinstance(subtopic, str):
+        return [subtopic]
+    return list(subtopic)
+
+
+class SourceStore:
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+
+    def _migrate(self):
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(sources)")}
+        if not columns:
+            return
+        with self.conn:
+            for column, column_type in MIGRATED_COLUMNS.items():
+                if column not in columns:
+                    self.conn.execute(
+                        f"ALTER TABLE sources ADD COLUMN {column} {column_type}"
+                    )
+
+    def close(self):
+        self.conn.close()
+
+    def upsert_many(
+        self,
+        sources: Iterable[Dict[str, Any]],
+        fingerprints: Optional[Dict[str, Fingerprint]] = None,
+    ) -> int:
+        fingerprints = fingerprints or {}
+        rows = []
+        subtopics: Dict[str, List[str]] = {}
+        for source in sources:
+            fp = fingerprints.get(source["id"]) or fingerprint(source)
+            rows.append(
+                (
+                    source["id"],
+                    source.get("url"),
+                    source.get("domain"),
+                    source.get("type"),
+                    source.get("quality_rating"),
+                    quality_rank(source.get("quality_rating")),
+                    source.get("content_hash"),
+                    fp.canonical_url,
+                    pack_signature(fp.signature),
+                    json.dumps(source, ensure_ascii=False),
+                )
+            )
+            subtopics[source["id"]] = source_subtopics(source)
+
+        if not rows:
+            return 0
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO sources (id, url, domain, type, quality_rating, "
+                "quality_rank, content_hash, canonical_url, minhash, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET url=excluded.url, "
+                "domain=excluded.domain, type=excluded.type, "
+                "quality_rating=excluded.quality_rating, "
+                "quality_rank=excluded.quality_rank, "
+                "content_hash=excluded.content_hash, "
+                "canonical_url=excluded.canonical_url, minhash=excluded.minhash, "
+                "data=excluded.data",
+                rows,
+            )
+            rowids = self._rowids(list(subtopics))
+            self.conn.executemany(
+                "DELETE FROM source_subtopics WHERE source_rowid = ?",
+                [(rowid,) for rowid in rowids.values()],
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO source_subtopics "
+                "(subtopic, quality_rank, source_rowid) VALUES (?, ?, ?)",
+                [
+                    (subtopic, row[5], rowids[row[0]])
+                    for row in rows
+                    for subtopic in subtopics[row[0]]
+                ],
+            )
+        return len(rows)
+
+    def _rowids(self, source_ids: List[str]) -> Dict[str, int]:
+        rowids = {}
+        for start in range(0, len(source_ids), ID_CHUNK):
+            chunk = source_ids[start : start + ID_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rowids.update(
+                self.conn.execute(
+                    f"SELECT id, rowid FROM sources WHERE id IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return rowids
+
+    def delete_many(self, source_ids: List[str]) -> int:
+        with self.conn:
+            rowids = self._rowids(list(source_ids))
+            self.conn.executemany(
+                "DELETE FROM source_subtopics WHERE source_rowid = ?",
+                [(rowid,) for rowid in rowids.values()],
+            )
+            self.conn.executemany(
+                "DELETE FROM sources WHERE rowid = ?",
+                [(rowid,) for rowid in rowids.values()],
+            )
+        return len(rowids)
+
+    def import_jsonl(self, jsonl_path: Path, batch_size: int = 5000) -> int:
+        with open(jsonl_path, "r", encoding="utf-8") as f:
+            return self.import_records(
+                (json.loads(line) for line in f if line.strip()), batch_size
+            )
+
+    def import_records(
+        self, records: Iterable[Dict[str, Any]], batch_size: int = 5000
+    ) -> int:
+        """Replay source log records (later versions and tombstones win)."""
+        imported = 0
+        batch: List[Dict[str, Any]] = []
+        for source in records:
+            if source.get("deleted"):
+                # Tombstone from remove_sources: apply in order.
+                imported += self.upsert_many(batch)
+                batch = []
+                self.delete_many([source["id"]])
+                continue
+            batch.append(source)
+            if len(batch) >= batch_size:
+                imported += self.upsert_many(batch)
+                batch = []
+        imported += self.upsert_many(batch)
+        return imported
+
+    def get(self, source_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT data FROM sources WHERE id = ?", (source_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_fingerprints(
+        self, after_rowid: int = 0
+    ) -> Iterator[Tuple[int, str, Fingerprint]]:
+        """Fingerprints by rowid, plus one URL-only fingerprint per alternate_url."""
+        for rowid, source_id, canonical_url, content_hash, blob, alternates in (
+            self.conn.execute(
+                "SELECT rowid, id, canonical_url, content_hash, minhash, "
+                "json_extract(data, '$.alternate_urls') FROM sources "
+                "WHERE rowid > ? ORDER BY rowid",
+                (after_rowid,),
+            )
+        ):
+            yield rowid, source_id, Fingerprint(
+                canonical_url=canonical_url or "",
+                content_hash=content_hash,
+                signature=unpack_signature(blob),
+            )
+            for url in json.loads(alternates) if alternates else []:
+                yield rowid, source_id, Fingerprint(
+                    canonical_url=canonicalize_url(url),
+                    content_hash=None,
+                    signature=None,
+                )
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+
+    def query(
+        self,
+        subtopic: Optional[str] = None,
+        min_quality: Optional[str] = None,
+        domain: Optional[str] = None,
+        source_type: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        return list(
+            self.iter_query(
+                subtopic=subtopic,
+                min_quality=min_quality,
+                domain=domain,
+                source_type=source_type,
+                content_hash=content_hash,
+                limit=limit,
+            )
+        )
+
+    def iter_query(
+        self,
+        subtopic: Optional[str] = None,
+        min_quality: Optional[str] = None,
+        domain: Optional[str] = None,
+        source_type: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        sql = "SELECT s.data FROM sources s"
+        where = []
+        params: List[Any] = []
+
+        if subtopic is not None:
+            sql += " JOIN source_subtopics t ON t.source_rowid = s.rowid"
+            where.append("t.subtopic = ?")
+            params.append(subtopic)
+            rank_column, rowid_column = "t.quality_rank", "t.source_rowid"
+        else:
+            rank_column, rowid_column = "s.quality_rank", "s.rowid"
+        if min_quality is not None:
+            where.append(f"{rank_column} <= ?")
+            params.append(quality_rank(min_quality))
+        if domain is not None:
+            where.append("s.domain = ?")
+            params.append(domain)
+        if source_type is not None:
+            where.append("s.type = ?")
+            params.append(source_type)
+        if content_hash is not None:
+            where.append("s.content_hash = ?")
+            params.append(content_hash)
+
+        if where:
+            # Every filter index ends in (quality_rank, rowid), so filtered results
+            # come back best-rated first without a sort step.
+            sql += " WHERE " + " AND ".join(where)
+            sql += f" ORDER BY {rank_column}, {rowid_column}"
+        else:
+            sql += " ORDER BY s.rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        for (data,) in self.conn.execute(sql, params):
+            yield json.loads(data)
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory sources: a __slots__ Source record with interned categorical
+fields, and a columnar SourceTable for whole-session counting.
+
+Sources loaded as plain dicts repeat every key and every domain/type/rating/
+subtopic string per record. Source keeps the contract fields in slots and
+interns the categorical ones, so 500k records share a few thousand strings.
+SourceTable goes further for analytics: it keeps only ids plus array-backed
+category codes with one string pool per column, and answers Phase 4's
+source_quality_report, per-subtopic counts and per-domain diversity by
+counting codes (NumPy bincount when available, Counter otherwise).
+"""
+
+import sys
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from source_store import (
+    QUALITY_RANKS,
+    UNRATED_RANK,
+    SourceStore,
+    quality_rank,
+    source_subtopics,
+)
+from triangulation import QUALITY_GRADES
+
+SOURCE_FIELDS = (
+    "id",
+    "url",
+    "title",
+    "author",
+    "date",
+    "domain",
+    "type",
+    "quality_rating",
+    "fetched_at",
+    "content_hash",
+    "snippet",
+    "subtopic",
+    "claims",
+)
+CATEGORICAL_FIELDS = ("domain", "type", "quality_rating", "subtopic")
+_FIELDS = frozenset(SOURCE_FIELDS)
+_CATEGORICAL = frozenset(CATEGORICAL_FIELDS)
+
+
+def _intern(value: Any) -> Any:
+    if type(value) is str:
+        return sys.intern(value)
+    if isinstance(value, list):
+        # Multi-subtopic sources; a tuple of interned strings.
+        return tuple(sys.intern(v) if type(v) is str else v for v in value)
+    return value
+
+
+class Source:
+    """
+    One source record. Reads like the dict it came from (source["url"],
+    source.get("claims")), so it can be passed to code written for dicts.
+    Fields outside the sources.jsonl contract are kept in `extra`.
+    """
+
+    __slots__ = SOURCE_FIELDS + ("extra",)
+
+    def __init__(self, **fields: Any):
+        for name in SOURCE_FIELDS:
+            setattr(self, name, None)
+        self.extra: Optional[Dict[str, Any]] = None
+        for name, value in fields.items():
+            self[name] = value
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Source":
+        return cls(**data)
+
+    def __setitem__(self, name: str, value: Any):
+        if name in _CATEGORICAL:
+            setattr(self, name, _intern(value))
+        elif name in _FIELDS:
+            setattr(self, name, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[name] = value
+
+    def __getitem__(self, name: str) -> Any:
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name in _FIELDS:
+            value = getattr(self, name)
+        elif self.extra is not None:
+            value = self.extra.get(name)
+        else:
+            value = None
+        return default if value is None else value
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def keys(self) -> List[str]:
+        names = [name for name in SOURCE_FIELDS if getattr(self, name) is not None]
+        return names + list(self.extra or ())
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        for name in SOURCE_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = list(value) if isinstance(value, tuple) else value
+        data.update(self.extra or {})
+        return data
+
+    def __repr__(self) -> str:
+        return f"Source(id={self.id!r}, url={self.url!r})"
+
+
+class _Pool:
+    """String pool of one categorical column: value <-> small integer code."""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _grade(rating: Any) -> str:
+    return (rating or "").strip().upper()[:1]
+
+
+def _view(codes: array):
+    """Zero-copy NumPy view of a code column."""
+    return np.frombuffer(codes, dtype=f"u{codes.itemsize}")
+
+
+def _bincount(codes: array, size: int) -> List[int]:
+    if np is not None:
+        return np.bincount(_view(codes), minlength=size).tolist()
+    counts = [0] * size
+    for code, count in Counter(codes).items():
+        counts[code] = count
+    return counts
+
+
+class SourceTable:
+    """Column store of source ids and categorical fields, one row per source."""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.pools = {name: _Pool() for name in ("domain", "type", "grade", "subtopic")}
+        self.domain = array("I")
+        self.type = array("I")
+        self.grade = array("I")
+        # Subtopic membership, exploded: a source in two subtopics has two entries.
+        self.member_rows = array("I")
+        self.member_subtopics = array("I")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _append(
+        self,
+        source_id: str,
+        domain: Optional[str],
+        source_type: Optional[str],
+        grade: str,
+        subtopics: Iterable[str],
+    ):
+        row = len(self.ids)
+        self.ids.append(source_id)
+        self.domain.append(self.pools["domain"].code(domain or ""))
+        self.type.append(self.pools["type"].code(source_type or ""))
+        self.grade.append(self.pools["grade"].code(grade))
+        subtopic_pool = self.pools["subtopic"]
+        for subtopic in subtopics:
+            self.member_rows.append(row)
+            self.member_subtopics.append(subtopic_pool.code(subtopic))
+
+    def append(self, source: Mapping[str, Any]):
+        """Add a source given as a dict or a Source."""
+        subtopic = source.get("subtopic")
+        if isinstance(subtopic, tuple):
+            subtopic = list(subtopic)
+        self._append(
+            source["id"],
+            source.get("domain"),
+            source.get("type"),
+            _grade(source.get("quality_rating")),
+            source_subtopics({"subtopic": subtopic}),
+        )
+
+    @classmethod
+    def from_sources(cls, sources: Iterable[Mapping[str, Any]]) -> "SourceTable":
+        table = cls()
+        for source in sources:
+            table.append(source)
+        return table
+
+    @classmethod
+    def from_store(cls, store: SourceStore) -> "SourceTable":
+        """Build from the store's indexed columns without decoding any records."""
+        table = cls()
+        rows: Dict[int, int] = {}
+        for rowid, source_id, domain, source_type, rating in store.conn.execute(
+            "SELECT rowid, id, domain, type, quality_rating FROM sources ORDER BY rowid"
+        ):
+            rows[rowid] = len(table.ids)
+            table._append(source_id, domain, source_type, _grade(rating), ())
+        subtopic_pool = table.pools["subtopic"]
+        for subtopic, rowid in store.conn.execute(
+            "SELECT subtopic, source_rowid FROM source_subtopics ORDER BY source_rowid"
+        ):
+            row = rows.get(rowid)
+            if row is not None:
+                table.member_rows.append(row)
+                table.member_subtopics.append(subtopic_pool.code(subtopic))
+        return table
+
+    def counts(self, column: str) -> Dict[str, int]:
+        """Sources per value of domain, type, grade or subtopic."""
+        pool = self.pools[column]
+        codes = self.member_subtopics if column == "subtopic" else getattr(self, column)
+        return {
+            value: count
+            for value, count in zip(pool.values, _bincount(codes, len(pool.values)))
+            if count
+        }
+
+    def quality_report(self) -> Dict[str, int]:
+        """Phase 4 source_quality_report: {"A_rated": n, ..., "unrated": n}."""
+        report = {f"{grade}_rated": 0 for grade in QUALITY_GRADES}
+        for grade, count in self.counts("grade").items():
+            key = f"{grade}_rated" if grade and grade in QUALITY_GRADES else "unrated"
+            report[key] = report.get(key, 0) + count
+        return report
+
+    def _member_mask(self, min_quality: Optional[str]) -> Optional[List[bool]]:
+        """Per grade code, whether it passes min_quality (None: no filter)."""
+        if min_quality is None:
+            return None
+        limit = quality_rank(min_quality)
+        return [
+            QUALITY_RANKS.get(grade, UNRATED_RANK) <= limit
+            for grade in self.pools["grade"].values
+        ]
+
+    def subtopic_counts(self, min_quality: Optional[str] = None) -> Dict[str, int]:
+        allowed = self._member_mask(min_quality)
+        if allowed is None:
+            return self.counts("subtopic")
+        pool = self.pools["subtopic"]
+        if np is not None:
+            rows = _view(self.member_rows)
+            subtopics = _view(self.member_subtopics)
+            keep = np.asarray(allowed, dtype=bool)[_view(self.grade)[rows]]
+            counts = np.bincount(subtopics[keep], minlength=len(pool.values)).tolist()
+        else:
+            grade = self.grade
+            counter = Counter(
+                subtopic
+                for row, subtopic in zip(self.member_rows, self.member_subtopics)
+                if allowed[grade[row]]
+            )
+            counts = [counter.get(code, 0) for code in range(len(pool.values))]
+        return {value: count for value, count in zip(pool.values, counts) if count}
+
+    def _subtopic_domain_counts(self) -> List[List[int]]:
+        """counts[subtopic_code][domain_code] over subtopic memberships."""
+        subtopics = len(self.pools["subtopic"].values)
+        domains = len(self.pools["domain"].values)
+        if np is not None:
+            rows = _view(self.member_rows)
+            keys = (
+                _view(self.member_subtopics).astype(np.int64) * domains
+                + _view(self.domain)[rows]
+            )
+            return (
+                np.bincount(keys, minlength=subtopics * domains)
+                .reshape(subtopics, domains)
+                .tolist()
+            )
+        matrix = [[0] * domains for _ in range(subtopics)]
+        domain = self.domain
+        pairs = Counter(
+            (subtopic, domain[row])
+            for row, subtopic in zip(self.member_rows, self.member_subtopics)
+        )
+        for (subtopic, domain_code), count in pairs.items():
+            matrix[subtopic][domain_code] = count
+        return matrix
+
+    def domain_diversity(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per subtopic: sources, distinct domains and the share of the most
+        common domain, for the "Source diversity (multiple domains)" check.
+        """
+        domains = self.pools["domain"].values
+        report = {}
+        for subtopic, row in zip(
+            self.pools["subtopic"].values, self._subtopic_domain_counts()
+        ):
+            total = sum(row)
+            if not total:
+                continue
+            # Ties go to the alphabetically first domain.
+            top = min(range(len(row)), key=lambda code: (-row[code], domains[code]))
+            report[subtopic] = {
+                "sources": total,
+                "domains": sum(1 for count in row if count),
+                "top_domain": domains[top],
+                "top_domain_share": round(row[top] / total, 3),
+            }
+        return report
+
+    def rows(self) -> Iterator[Tuple[str, str, str, str]]:
+        """(id, domain, type, grade) per source, decoded."""
+        domain = self.pools["domain"].values
+        source_type = self.pools["type"].values
+        grade = self.pools["grade"].values
+        for i, source_id in enumerate(self.ids):
+            yield (
+                source_id,
+                domain[self.domain[i]],
+                source_type[self.type[i]],
+                grade[self.grade[i]],
+            )
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Session Tracing - span-based trace of a research session in Chrome trace-event
+format (artifacts/trace.json, opens in Perfetto or chrome://tracing offline).
+
+Phases are spans on lane 0, each AgentScheduler run is a child span of the
+phase that is in progress, agent tasks are its children on one lane per
+scheduler worker, and fetch/search spans nest inside the task that made them.
+The file is a JSON array that is never closed: every span is one appended line,
+which the trace-event format allows, so several processes can write to it.
+
+critical_path() reads the trace back and reports which chain of agent tasks
+bounded each scheduler run and how much parallelism was achieved against
+max_parallel_agents.
+"""
+
+import contextvars
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+TRACE_FILE = "artifacts/trace.json"
+PHASE_LANE = 0
+
+
+@dataclass
+class Span:
+    id: str
+    name: str
+    cat: str
+    parent_id: Optional[str]
+    tid: int
+    start: float
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+_tracer: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar(
+    "tracer", default=None
+)
+_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "span", default=None
+)
+
+
+def new_span_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def phase_span_id(phase: int, started: str) -> str:
+    """Phase spans are named after their start so a re-run gets a new span."""
+    return f"phase_{phase}@{started}"
+
+
+def current_span() -> Optional[Span]:
+    return _span.get()
+
+
+class Tracer:
+    def __init__(self, path: Path, process_name: str = "", pid: int = 1):
+        self.path = Path(path)
+        self.pid = pid
+        self.process_name = process_name
+
+    def _append(self, events: List[Dict[str, Any]]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = "".join(
+            json.dumps(event, ensure_ascii=False) + ",\n" for event in events
+        )
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size == 0:
+                meta = {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": self.pid,
+                    "tid": PHASE_LANE,
+                    "args": {"name": self.process_name or "research session"},
+                }
+                data = "[\n" + json.dumps(meta, ensure_ascii=False) + ",\n" + data
+            os.write(fd, data.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def name_lane(self, tid: int, name: str):
+        self._append(
+            [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+            ]
+        )
+
+    def complete(
+        self,
+        name: str,
+        cat: str,
+        start: float,
+        end: float,
+        span_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        tid: int = PHASE_LANE,
+        **args: Any,
+    ) -> str:
+        """Write one finished span; start and end are epoch seconds."""
+        span_id = span_id or new_span_id()
+        self._append(
+            [
+                {
+                    "name": name,
+                    "cat": cat,
+                    "ph": "X",
+                    "ts": round(start * 1e6),
+                    "dur": max(0, round((end - start) * 1e6)),
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": {"span_id": span_id, "parent_id": parent_id, **args},
+                }
+            ]
+        )
+        return span_id
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        cat: str,
+        parent_id: Optional[str] = None,
+        tid: Optional[int] = None,
+        **args: Any,
+    ) -> Iterator[Span]:
+        """
+        Time the block as a span. Without an explicit parent it nests under the
+        current span. Spans opened inside (including in asyncio tasks and
+        threads started from here) see this one as their parent.
+        """
+        parent = _span.get()
+        if parent_id is None and parent is not None:
+            parent_id = parent.id
+        if tid is None:
+            tid = parent.tid if parent is not None else PHASE_LANE
+        current = Span(new_span_id(), name, cat, parent_id, tid, time.time(), args)
+        tracer_token = _tracer.set(self)
+        span_token = _span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.args.setdefault("error", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _span.reset(span_token)
+            _tracer.reset(tracer_token)
+            self.complete(
+                current.name,
+                current.cat,
+                current.start,
+                time.time(),
+                current.id,
+                current.parent_id,
+                current.tid,
+                **current.args,
+            )
+
+
+@contextmanager
+def span(name: str, cat: str, **args: Any) -> Iterator[Optional[Span]]:
+    """Child span of the current span; a no-op outside a traced block."""
+    tracer = _tracer.get()
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, cat, **args) as current:
+        yield current
+
+
+def load_trace(path: Path) -> List[Dict[str, Any]]:
+    events = []
+    if not Path(path).exists():
+        return events
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip().rstrip(",")
+            if line in ("", "[", "]"):
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A writer may have been killed mid-line; skip the torn event.
+                continue
+    return events
+
+
+def _peak_concurrency(spans: List[Dict[str, Any]]) -> int:
+    edges = []
+    for s in spans:
+        edges.append((s["ts"], 1))
+        edges.append((s["ts"] + s["dur"], -1))
+    peak = running = 0
+    # Ends sort before starts at the same instant: back-to-back is not overlap.
+    for _, delta in sorted(edges):
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+def _chain(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Walk back from the last task to finish through the task that freed its lane."""
+    if not tasks:
+        return []
+    current = max(tasks, key=lambda s: s["ts"] + s["dur"])
+    chain = [current]
+    while True:
+        # A worker lane runs one task at a time, so the previous task on the
+        # lane is what this one waited for.
+        before = [
+            s for s in tasks if s["tid"] == current["tid"] and s["ts"] < current["ts"]
+        ]
+        if not before:
+            break
+        current = max(before, key=lambda s: s["ts"] + s["dur"])
+        chain.append(current)
+    return chain[::-1]
+
+
+def _hint(run: Dict[str, Any]) -> str:
+    longest = max(run["critical_path"], key=lambda t: t["seconds"], default=None)
+    wall = run["wall_seconds"]
+    if longest and wall and longest["seconds"] > 0.5 * wall:
+        return (
+            f"'{longest['name']}' alone takes {longest['seconds']}s of "
+            f"{wall}s; splitting subtopic '{longest['subtopic']}' "
+            "shortens the run more than extra lanes would."
+        )
+    if run["max_parallel_agents"] and run["utilization"] >= 0.8:
+        return (
+            "Agent lanes were saturated; raising max_parallel_agents should "
+            "shorten the run."
+        )
+    return (
+        "Parallelism stayed below the limit; more lanes will not help, the run "
+        "is bounded by the task chain."
+    )
+
+
+def analyze(
+    events: List[Dict[str, Any]], max_parallel_agents: Optional[int] = None
+) -> Dict[str, Any]:
+    spans = [e for e in events if e.get("ph") == "X"]
+    by_parent: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in spans:
+        by_parent.setdefault(s["args"].get("parent_id"), []).append(s)
+
+    phases = [
+        {
+            "name": s["name"],
+            "seconds": round(s["dur"] / 1e6, 3),
+            "status": s["args"].get("status"),
+        }
+        for s in sorted(spans, key=lambda s: s["ts"])
+        if s.get("cat") == "phase"
+    ]
+
+    schedulers = [s for s in spans if s.get("cat") == "scheduler"]
+    if not schedulers:
+        agents = [s for s in spans if s.get("cat") == "agent"]
+        if agents:
+            start = min(s["ts"] for s in agents)
+            end = max(s["ts"] + s["dur"] for s in agents)
+            schedulers = [
+                {"ts": start, "dur": end - start, "name": "agents", "args": {}}
+            ]
+            by_parent[None] = agents
+
+    runs = []
+    for run in sorted(schedulers, key=lambda s: s["ts"]):
+        run_id = run["args"].get("span_id")
+        tasks = [s for s in by_parent.get(run_id, []) if s.get("cat") == "agent"]
+        if not tasks:
+            continue
+        wall = run["dur"] / 1e6
+        busy = sum(s["dur"] for s in tasks) / 1e6
+        limit = max_parallel_agents or run["args"].get("max_parallel_agents")
+        parallelism = busy / wall if wall else 0.0
+        chain = _chain(tasks)
+        chain_seconds = sum(s["dur"] for s in chain) / 1e6
+        result = {
+            "name": run["name"],
+            "parent_id": run["args"].get("parent_id"),
+            "tasks": len(tasks),
+            "wall_seconds": round(wall, 3),
+            "busy_seconds": round(busy, 3),
+            "achieved_parallelism": round(parallelism, 2),
+            "peak_concurrency": _peak_concurrency(tasks),
+            "max_parallel_agents": limit,
+            "utilization": round(parallelism / limit, 2) if limit else None,
+            "critical_path": [
+                {
+                    "name": s["name"],
+                    "subtopic": s["args"].get("subtopic"),
+                    "lane": s["tid"],
+                    "start_offset": round((s["ts"] - run["ts"]) / 1e6, 3),
+                    "seconds": round(s["dur"] / 1e6, 3),
+                    "outcome": s["args"].get("outcome"),
+                    "children": len(by_parent.get(s["args"].get("span_id"), [])),
+                }
+                for s in chain
+            ],
+            "critical_path_seconds": round(chain_seconds, 3),
+            # Time on the critical lane not spent in tasks (scheduler overhead,
+            # lanes waiting on the queue).
+            "critical_path_gaps_seconds": round(max(0.0, wall - chain_seconds), 3),
+        }
+        result["hint"] = _hint(result)
+        runs.append(result)
+
+    return {"phases": phases, "scheduler_runs": runs}
+
+
+def critical_path(
+    session_id: str,
+    base_path: str = "RESEARCH",
+    max_parallel_agents: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Critical task chain and achieved parallelism of each scheduler run."""
+    path = Path(base_path) / session_id / TRACE_FILE
+    if not path.exists():
+        return {"status": "error", "message": f"No trace for session: {session_id}"}
+    result = analyze(load_trace(path), max_parallel_agents)
+    return {"session_id": session_id, "trace": str(path), **result}
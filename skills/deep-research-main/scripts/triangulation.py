@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Phase 4 Source Triangulation - clusters equivalent claims across sources and
+emits the verified_claims / contradictions / source_quality_report contract.
+Numeric contradictions come from numeric_claims.
+
+Claims are compared as sets of normalized content tokens. Candidate clusters
+come from an index on each claim's smallest token hashes (a MinHash-style
+anchor), so work grows with the number of claims, not with pairs of claims.
+Token hashes are blake2b digests, not hash(), so clusters do not depend on
+PYTHONHASHSEED.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from numeric_claims import extract_numeric_claims, find_contradictions
+from pipelines import PipelineConfig
+
+
+STOPWORDS = frozenset(
+    """a an and are as at be been being but by can could did do does for from had
+    has have how in into is it its may might more most much no not of on or our
+    over such than that the their them then there these they this those through
+    to under up was we were what when where which while who will with would""".split()
+)
+QUALITY_WEIGHTS = {"A": 1.0, "B": 0.8, "C": 0.5, "D": 0.3, "E": 0.1}
+UNRATED_WEIGHT = 0.3
+QUALITY_GRADES = "ABCDE"
+
+SIMILARITY_THRESHOLD = 0.5
+ANCHORS_PER_CLAIM = 3
+MAX_CLUSTERS_PER_ANCHOR = 64
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9.%$-]*", re.UNICODE)
+
+
+def claim_tokens(claim: str) -> frozenset:
+    tokens = set()
+    for token in _TOKEN_RE.findall(claim.lower()):
+        token = token.rstrip(".-")
+        if token and token not in STOPWORDS:
+            # Cheap plural folding so "assistants" and "assistant" agree.
+            if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+                token = token[:-1]
+            tokens.add(token)
+    return frozenset(tokens)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def _quality(source: Dict[str, Any]) -> str:
+    return (source.get("quality_rating") or "").strip().upper()[:1]
+
+
+def _grade_rank(grade: str) -> int:
+    # "" is a substring of every string; unrated sources rank last.
+    if grade and grade in QUALITY_GRADES:
+        return QUALITY_GRADES.index(grade)
+    return len(QUALITY_GRADES)
+
+
+def _report_key(grade: str) -> str:
+    return f"{grade}_rated" if grade and grade in QUALITY_GRADES else "unrated"
+
+
+class _Cluster:
+    __slots__ = ("tokens", "members")
+
+    def __init__(self, tokens: frozenset):
+        self.tokens = tokens
+        self.members: List[Tuple[str, str, str]] = []
+
+
+class ClaimClusterer:
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.clusters: List[_Cluster] = []
+        self._exact: Dict[frozenset, int] = {}
+        self._anchors: Dict[int, List[int]] = {}
+
+    def add(self, claim: str, source_id: str, quality: str):
+        tokens = claim_tokens(claim)
+        if not tokens:
+            return
+
+        cluster_id = self._exact.get(tokens)
+        if cluster_id is None:
+            anchors = sorted(map(_token_hash, tokens))[:ANCHORS_PER_CLAIM]
+            cluster_id = self._match(tokens, anchors)
+            if cluster_id is None:
+                cluster_id = len(self.clusters)
+                self.clusters.append(_Cluster(tokens))
+            self._exact[tokens] = cluster_id
+            for anchor in anchors:
+                postings = self._anchors.setdefault(anchor, [])
+                if len(postings) <= MAX_CLUSTERS_PER_ANCHOR and cluster_id not in postings:
+                    postings.append(cluster_id)
+
+        self.clusters[cluster_id].members.append((source_id, quality, claim))
+
+    def _match(self, tokens: frozenset, anchors: List[int]) -> Optional[int]:
+        best_id, best_score = None, self.threshold
+        seen = set()
+        for anchor in anchors:
+            postings = self._anchors.get(anchor, ())
+            if len(postings) > MAX_CLUSTERS_PER_ANCHOR:
+                # Anchors shared by many distinct clusters are generic
+                # tokens and do not indicate the same claim.
+                continue
+            for cluster_id in postings:
+                if cluster_id in seen:
+                    continue
+                seen.add(cluster_id)
+                score = jaccard(tokens, self.clusters[cluster_id].tokens)
+                if score >= best_score:
+                    best_id, best_score = cluster_id, score
+        return best_id
+
+
+def _confidence(
+    qualities: Dict[str, str], config: PipelineConfig
+) -> Tuple[str, float]:
+    score = sum(QUALITY_WEIGHTS.get(q, UNRATED_WEIGHT) for q in qualities.values())
+    count = len(qualities)
+    best = min(_grade_rank(q) for q in qualities.values())
+
+    if count >= max(3, config.min_sources_for_triangulation) and (
+        best <= _grade_rank("B") or score >= 2.0
+    ):
+        confidence = "high"
+    elif count >= config.min_sources_for_triangulation:
+        confidence = "medium"
+    else:
+        confidence = "low"
+    return confidence, round(score, 2)
+
+
+def triangulate(
+    sources: Iterable[Dict[str, Any]],
+    config: Optional[PipelineConfig] = None,
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> Dict[str, Any]:
+    config = config or PipelineConfig()
+    clusterer = ClaimClusterer(threshold)
+    quality_report = {f"{grade}_rated": 0 for grade in QUALITY_GRADES}
+    numeric_claims = []
+
+    for source in sources:
+        grade = _quality(source)
+        key = _report_key(grade)
+        quality_report[key] = quality_report.get(key, 0) + 1
+        for claim in source.get("claims") or []:
+            clusterer.add(claim, source["id"], grade)
+        numeric_claims.extend(extract_numeric_claims(source))
+
+    contradictions = find_contradictions(numeric_claims)
+    disputed: Dict[str, List[Dict[str, Any]]] = {}
+    for contradiction in contradictions:
+        disputed.setdefault(contradiction["claim_a"], []).append(contradiction)
+        disputed.setdefault(contradiction["claim_b"], []).append(contradiction)
+
+    verified_claims = []
+    single_source_claims = []
+    for cluster in clusterer.clusters:
+        qualities: Dict[str, str] = {}
+        for source_id, grade, _ in cluster.members:
+            qualities.setdefault(source_id, grade)
+
+        # Report the wording used by the best-rated source.
+        claim = min(cluster.members, key=lambda member: _grade_rank(member[1]))[2]
+        if len(qualities) < config.min_sources_for_triangulation:
+            single_source_claims.append(
+                {"claim": claim, "sources": sorted(qualities)}
+            )
+            continue
+
+        confidence, score = _confidence(qualities, config)
+        conflicts = {}
+        for text in dict.fromkeys(member[2] for member in cluster.members):
+            for contradiction in disputed.get(text, ()):
+                conflicts.setdefault(id(contradiction), contradiction)
+        verified_claims.append(
+            {
+                "claim": claim,
+                "sources": sorted(qualities),
+                "confidence": confidence,
+                "quality_score": score,
+                "variants": len({member[2] for member in cluster.members}),
+                "contradictions": list(conflicts.values()),
+            }
+        )
+
+    verified_claims.sort(key=lambda c: (-len(c["sources"]), -c["quality_score"]))
+    return {
+        "verified_claims": verified_claims,
+        "contradictions": contradictions,
+        "source_quality_report": quality_report,
+        "single_source_claims": single_source_claims,
+    }
+
+
+def triangulate_session(state, config: Optional[PipelineConfig] = None) -> Dict:
+    result = triangulate(state.iter_sources(), config)
+    state.save_artifact(
+        "triangulation.json", json.dumps(result, indent=2, ensure_ascii=False)
+    )
+    return result
@@ -0,0 +1,47 @@
+import json
+
+from orchestrator import JOURNAL_FILE, ResearchState
+
+
+def make_source(i):
+    return {
+        "url": f"https://example.com/article/{i}",
+        "title": f"Source {i}",
+        "snippet": f"Finding {i} about batched ingestion, measured as {i * 7919}.",
+    }
+
+
+def count_commits(state):
+    journal = (state.session_path / JOURNAL_FILE).read_text(encoding="utf-8")
+    events = [json.loads(line) for line in journal.splitlines()]
+    return [e["value"] for e in events if e["path"] == ["sources_count"]]
+
+
+def test_one_sources_count_commit_per_flushed_batch(tmp_path):
+    state = ResearchState(str(tmp_path))
+    state.create_session("Batch ingest")
+
+    written = state.add_sources((make_source(i) for i in range(25)), flush_every=10)
+
+    assert written == 25
+    assert count_commits(state) == [10, 10, 5]
+    assert state.state["sources_count"] == 25
+    assert [s["id"] for s in state.iter_sources()] == [
+        f"src_{i:03d}" for i in range(1, 26)
+    ]
+    state.close()
+
+
+def test_known_ids_and_duplicates_do_not_count(tmp_path):
+    state = ResearchState(str(tmp_path))
+    state.create_session("Batch updates")
+    state.add_sources(make_source(i) for i in range(3))
+
+    updated = {"id": "src_002", "url": "https://example.com/moved", "title": "Renamed"}
+    assert state.add_sources([updated, make_source(0)]) == 0
+    assert count_commits(state) == [3]
+    assert state.get_source("src_002")["title"] == "Renamed"
+
+    assert state.add_sources([make_source(0)], dedup=False) == 1
+    assert state.state["sources_count"] == 4
+    state.close()
@@ -0,0 +1,63 @@
+import re
+from datetime import datetime
+
+from bibliography import write_bibliography
+
+SOURCES = [
+    {"id": "s1", "author": "Smith, J.", "date": "2023-05-01", "title": "Later work"},
+    {"id": "s2", "author": "Adams, K.", "date": "2024", "title": "Agents"},
+    {"id": "s3", "author": "Smith, J.", "date": "2023-01-01", "title": "Earlier work"},
+    {"id": "s4", "title": "The Zebra Report", "date": "2022", "url": "https://z.org"},
+    {"id": "s5", "author": "Brown, L.", "title": "Undated", "url": "https://b.org/x"},
+    {"id": "s6", "author": "Smith, J.", "date": "2021", "title": "Oldest"},
+    {"id": "s7", "author": "Jones, P.", "date": "2020", "quality_rating": "D"},
+]
+
+
+ENTRY_RE = re.compile(r"^- (.+?)\. \((?:\d{4}[a-z]?|n\.d\.)\)", re.MULTILINE)
+
+
+def authors(path):
+    return ENTRY_RE.findall(path.read_text())
+
+
+def test_entries_are_ordered_and_limitations_filled(tmp_path):
+    path = tmp_path / "bibliography.md"
+    result = write_bibliography(SOURCES, path, limitations=["English sources only"])
+    today = datetime.now()
+
+    assert authors(path) == [
+        "Adams, K",
+        "Brown, L",
+        "Jones, P",
+        "Smith, J",
+        "Smith, J",
+        "Smith, J",
+        "The Zebra Report",
+    ]
+    text = path.read_text()
+    smith = [line for line in text.splitlines() if line.startswith("- Smith")]
+    assert smith == [
+        '- Smith, J. (2021). "Oldest."',
+        '- Smith, J. (2023a). "Earlier work."',
+        '- Smith, J. (2023b). "Later work."',
+    ]
+    retrieved = f"Retrieved {today:%B} {today.day}, {today.year}, from https://b.org/x"
+    assert f"- Brown, L. (n.d.). \"Undated.\" {retrieved}" in text
+    assert "{LIMITATION" not in text
+    assert "- English sources only\n" in text
+    assert "- 1 of 7 sources have no publication date and are cited as n.d.\n" in text
+    assert result["spilled_runs"] == 0
+
+
+def test_spilled_runs_merge_into_the_same_output(tmp_path):
+    in_memory = tmp_path / "memory" / "bibliography.md"
+    spilled = tmp_path / "spilled" / "bibliography.md"
+    write_bibliography(SOURCES, in_memory)
+
+    result = write_bibliography(SOURCES, spilled, max_records=2)
+
+    assert result["spilled_runs"] == 3
+    assert result["total"] == len(SOURCES)
+    assert spilled.read_text() == in_memory.read_text()
+    assert [p.name for p in spilled.parent.iterdir()] == ["bibliography.md"]
@@ -0,0 +1,57 @@
+from citation_verifier import CitationIndex, verify_text
+
+SOURCES = [
+    {
+        "id": "src_001",
+        "author": "Gartner",
+        "date": "2024-03-01",
+        "title": "Market Guide",
+    }
+]
+
+
+def missing(text):
+    _, issues, _ = verify_text(text, CitationIndex(SOURCES))
+    return [i["text"] for i in issues if i["type"] == "missing_citation"]
+
+
+def test_decimal_figure_without_citation_is_flagged():
+    assert missing("Revenue was $4.2B last year.") == ["Revenue was $4.2B last year."]
+
+
+def test_decimal_point_does_not_split_sentences():
+    text = "Adoption grew 3.5% in 2024. Teams liked it. Churn fell to 1.2 percent."
+    assert missing(text) == [
+        "Adoption grew 3.5% in 2024.",
+        "Churn fell to 1.2 percent.",
+    ]
+
+
+def test_cited_decimal_figure_is_not_flagged():
+    text = "Revenue was $4.2B last year (Gartner, 2024). Margins held."
+    assert missing(text) == []
+
+
+def test_citation_on_the_next_wrapped_line_counts():
+    text = (
+        "# Market\n"
+        "\n"
+        "Intro without figures.\n"
+        "\n"
+        "Revenue reached $4.2B last year according to\n"
+        "(Gartner, 2024). Churn fell to 1.2 percent\n"
+        "over the same period.\n"
+        "- Adoption grew 3.5% (Gartner, 2024)\n"
+        "- Usage rose 12%\n"
+    )
+    stats, issues, _ = verify_text(text, CitationIndex(SOURCES), "report.md")
+
+    assert stats["verified"] == 2
+    assert [(i["text"], i["location"], i["line"]) for i in issues] == [
+        (
+            "Churn fell to 1.2 percent over the same period.",
+            "report.md, section 1, paragraph 2",
+            5,
+        ),
+        ("- Usage rose 12%", "report.md, section 1, paragraph 2", 9),
+    ]
@@ -0,0 +1,61 @@
+import json
+from multiprocessing import Pool
+
+from orchestrator import JOURNAL_FILE, ResearchState
+
+WORKERS = 4
+PER_WORKER = 120
+ARTIFACT_EVERY = 25
+
+
+def make_source(i):
+    return {
+        "url": f"https://example{i % 13}.com/article/{i}",
+        "title": f"Source {i}",
+        "snippet": f"Distinct finding number {i} about concurrent ingest {i * 7919}.",
+        "quality_rating": "ABCDE"[i % 5],
+    }
+
+
+def ingest(args):
+    """One process: a batched add_sources, then single adds and artifact saves."""
+    base_path, session_id, worker_id = args
+    state = ResearchState(base_path, snapshot_interval=25)
+    state.load_session(session_id)
+    start = worker_id * PER_WORKER
+    sources = [make_source(i) for i in range(start, start + PER_WORKER)]
+    half = PER_WORKER // 2
+    state.add_sources(sources[:half], flush_every=17)
+    for i, source in enumerate(sources[half:]):
+        state.add_source(source)
+        if i % ARTIFACT_EVERY == 0:
+            state.save_artifact(f"worker_{worker_id}_{i}.md", "x", "agent_results")
+    state.close()
+    return len(sources)
+
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    state = ResearchState(str(tmp_path))
+    session_id = state.create_session("Concurrent ingest")
+    state.close()
+
+    with Pool(WORKERS) as pool:
+        jobs = [(str(tmp_path), session_id, worker) for worker in range(WORKERS)]
+        expected = sum(pool.map(ingest, jobs))
+
+    journal = (state.session_path / JOURNAL_FILE).read_text(encoding="utf-8")
+    for line in journal.splitlines():
+        json.loads(line)
+
+    reader = ResearchState(str(tmp_path))
+    reader.load_session(session_id)
+    logged = [source["id"] for source in reader.iter_sources()]
+    stored = [source["id"] for source in reader.get_sources()]
+
+    assert reader.state["sources_count"] == expected
+    assert len(logged) == len(set(logged)) == expected
+    assert sorted(stored) == sorted(logged)
+    assert all(reader.get_source(source_id) for source_id in logged)
+    artifacts_per_worker = len(range(0, PER_WORKER - PER_WORKER // 2, ARTIFACT_EVERY))
+    assert len(reader.state["artifacts"]) == WORKERS * artifacts_per_worker
+    reader.close()
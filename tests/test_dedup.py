@@ -0,0 +1,25 @@
+from orchestrator import ResearchState
+
+SNIPPET = "Solar panel prices fell sharply across Europe during the last two years"
+ORIGINAL = {"url": "https://a.com/x", "title": "Original", "snippet": SNIPPET}
+DUPLICATE = {"url": "https://b.com/y", "title": "Duplicate", "snippet": SNIPPET + "."}
+
+
+def test_merged_duplicate_url_is_recognised(tmp_path):
+    state = ResearchState(str(tmp_path))
+    session_id = state.create_session("Dedup")
+    state.add_sources([ORIGINAL, DUPLICATE])
+    assert state.state["sources_count"] == 1
+    assert state.get_source("src_001")["alternate_urls"] == ["https://b.com/y"]
+
+    state.add_source({"url": "https://b.com/y"})
+    assert state.state["sources_count"] == 1
+    state.close()
+
+    # A fresh process rebuilds the index from the store, alternate URLs included.
+    reloaded = ResearchState(str(tmp_path))
+    reloaded.load_session(session_id)
+    reloaded.add_source({"url": "https://b.com/y?utm_source=feed"})
+    assert reloaded.state["sources_count"] == 1
+    assert reloaded.get_source("src_002") is None
+    reloaded.close()
@@ -0,0 +1,141 @@
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from fetch_cache import FetchCache
+
+BODY_BYTES = 1000
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves BODY_BYTES per path and counts the requests each path gets."""
+
+    requests = Counter()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.requests[self.path] += 1
+            count = self.requests[self.path]
+        body = f"{self.path} #{count} ".encode("utf-8").ljust(BODY_BYTES, b".")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def site(http_server):
+    PageHandler.requests = Counter()
+    return http_server(PageHandler)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def make_cache(tmp_path, clock):
+    caches = []
+
+    def make(**kwargs) -> FetchCache:
+        cache = FetchCache(tmp_path, clock=clock, **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def test_second_fetch_is_served_from_cache(site, make_cache):
+    cache = make_cache()
+    first = cache.fetch(f"{site}/a")
+    second = cache.fetch(f"{site}/a?utm_source=newsletter")
+
+    assert not first.from_cache and second.from_cache
+    assert second.body == first.body
+    assert second.content_type == "text/html"
+    assert PageHandler.requests["/a"] == 1
+
+
+def test_expired_entry_is_fetched_again(site, make_cache, clock):
+    cache = make_cache(ttls={"news": 60})
+    cache.fetch(f"{site}/news", source_type="news")
+    clock.now += 59
+    assert cache.fetch(f"{site}/news", source_type="news").from_cache
+
+    clock.now += 2
+    refreshed = cache.fetch(f"{site}/news", source_type="news")
+    assert not refreshed.from_cache
+    assert refreshed.text().startswith("/news #2")
+    assert PageHandler.requests["/news"] == 2
+    assert cache.session_stats["expired"] == 1
+
+
+def test_prune_drops_expired_entries(site, make_cache, clock):
+    cache = make_cache(ttls={"news": 60, "academic": 3600})
+    cache.fetch(f"{site}/news", source_type="news")
+    cache.fetch(f"{site}/paper", source_type="academic")
+    clock.now += 120
+
+    assert cache.prune() == 1
+    assert cache.stats()["entries"] == 1
+    assert cache.total_bytes() == BODY_BYTES
+
+
+def test_least_recently_used_body_is_evicted(site, make_cache, clock):
+    cache = make_cache(max_bytes=2 * BODY_BYTES)
+    for path in ("/a", "/b"):
+        cache.fetch(site + path)
+        clock.now += 1
+    assert cache.fetch(f"{site}/a").from_cache
+    clock.now += 1
+
+    cache.fetch(f"{site}/c")
+
+    assert cache.total_bytes() == 2 * BODY_BYTES
+    assert cache.session_stats["evictions"] == 1
+    assert cache.get(f"{site}/a") is not None
+    assert cache.get(f"{site}/b") is None
+    assert cache.get(f"{site}/c") is not None
+
+
+def test_stats_persist_across_cache_instances(site, make_cache):
+    first = make_cache()
+    first.fetch(f"{site}/a")
+    first.fetch(f"{site}/a")
+    first.close()
+
+    second = make_cache()
+    second.fetch(f"{site}/a")
+    second.fetch(f"{site}/b")
+
+    assert second.session_stats == {
+        "fetches": 1,
+        "hits": 1,
+        "misses": 1,
+        "expired": 0,
+        "evictions": 0,
+        "bytes_fetched": BODY_BYTES,
+    }
+    stats = second.stats()
+    assert (stats["fetches"], stats["hits"], stats["misses"]) == (2, 2, 2)
+    assert stats["hit_rate"] == 0.5
+    assert stats["bytes_fetched"] == 2 * BODY_BYTES
+    assert (stats["entries"], stats["blobs"]) == (2, 2)
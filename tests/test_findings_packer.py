@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from findings_packer import pack_findings
+
+SOURCES = [
+    {
+        "id": "src_001",
+        "title": "Agent adoption survey",
+        "quality_rating": "A",
+        "date": "2025-02-01",
+        "snippet": "Sixty percent of teams run coding agents in CI.",
+    }
+]
+
+
+def test_claim_without_sources_is_dropped_not_fatal():
+    claims = [
+        {"claim": "Agents are everywhere", "sources": [], "confidence": "low"},
+        {"claim": "Teams run agents in CI", "sources": ["src_001"]},
+    ]
+
+    packed = pack_findings(SOURCES, claims, now=datetime(2026, 1, 1))
+
+    assert {"kind": "claim", "id": "claim_0", "reason": "no_sources"} in packed.dropped
+    assert [item["id"] for item in packed.included] == ["claim_1", "src_001"]
+    assert "Agents are everywhere" not in packed.text
@@ -0,0 +1,23 @@
+from orchestrator import JOURNAL_FILE, ResearchState
+
+
+def test_session_survives_a_torn_journal_write(tmp_path):
+    writer = ResearchState(str(tmp_path))
+    session_id = writer.create_session("Torn journal")
+    writer.start_phase(1)
+    journal = writer.session_path / JOURNAL_FILE
+    # A writer crashed halfway through appending an event.
+    with open(journal, "ab") as f:
+        f.write(b'{"seq": 99, "ts": "2026-01-01T00:00:00", "op": "set", "pa')
+
+    state = ResearchState(str(tmp_path))
+    assert state.load_session(session_id)
+    assert state.state["progress"]["phase_1"] == "in_progress"
+    state.complete_phase(1)
+    state.start_phase(2)
+
+    reloaded = ResearchState(str(tmp_path))
+    assert reloaded.load_session(session_id)
+    assert reloaded.state["progress"]["phase_1"] == "completed"
+    assert reloaded.state["progress"]["phase_2"] == "in_progress"
+    assert b'"seq": 99' not in journal.read_bytes()
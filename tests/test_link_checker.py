@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from link_checker import (
+    BROKEN,
+    OK,
+    RESTRICTED,
+    TIMEOUT,
+    LinkChecker,
+    check_session_links,
+)
+from orchestrator import ResearchState
+
+SLOW_SECONDS = 1.0
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """One behaviour per first path segment; counts requests per method+path."""
+
+    protocol_version = "HTTP/1.1"
+    requests = Counter()
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, headers=None, body=b""):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    def _handle(self):
+        with self.lock:
+            self.requests[(self.command, self.path)] += 1
+            seen = self.requests[(self.command, self.path)]
+        kind = self.path.strip("/").split("/")[0]
+        if kind == "ok":
+            self._reply(200, body=b"hello")
+        elif kind == "gated":
+            self._reply(403)
+        elif kind == "limited" and seen == 1:
+            self._reply(429, {"Retry-After": "0"})
+        elif kind == "limited":
+            self._reply(200)
+        elif kind == "nohead" and self.command == "HEAD":
+            self._reply(405)
+        elif kind == "nohead":
+            self._reply(200, body=b"hello")
+        elif kind == "moved":
+            self._reply(301, {"Location": "/ok" + self.path[len("/moved") :]})
+        elif kind == "slow":
+            time.sleep(SLOW_SECONDS)
+            self._reply(200)
+        else:
+            self._reply(404)
+
+    do_HEAD = _handle
+    do_GET = _handle
+
+
+@pytest.fixture
+def site(http_server):
+    StandInHandler.requests = Counter()
+    return http_server(StandInHandler)
+
+
+def checker_for(tmp_path, **kwargs) -> LinkChecker:
+    options = {"requests_per_second": 0, "timeout": 0.3, "retries": 1, **kwargs}
+    return LinkChecker(tmp_path, **options)
+
+
+def test_verdicts(site, tmp_path):
+    paths = ["ok/1", "missing/1", "gated/1", "limited/1", "nohead/1", "moved/1"]
+    checker = checker_for(tmp_path)
+    results = checker.check_urls(f"{site}/{path}" for path in paths + ["slow/1"])
+    checker.close()
+    status = {url[len(site) + 1 :]: result for url, result in results.items()}
+
+    assert {path: status[path].status for path in paths} == {
+        "ok/1": OK,
+        "missing/1": BROKEN,
+        "gated/1": RESTRICTED,
+        "limited/1": OK,
+        "nohead/1": OK,
+        "moved/1": OK,
+    }
+    assert status["missing/1"].http_status == 404
+    assert status["nohead/1"].method == "GET"
+    assert status["moved/1"].final_url == f"{site}/ok/1"
+    assert StandInHandler.requests[("HEAD", "/limited/1")] == 2
+    assert status["slow/1"].status == TIMEOUT
+
+
+def test_verdicts_are_cached_until_they_expire(site, tmp_path):
+    now = [1_000_000.0]
+    urls = [f"{site}/ok/2", f"{site}/missing/2"]
+    first = checker_for(tmp_path, clock=lambda: now[0])
+    first.check_urls(urls)
+    first.close()
+    requests = sum(StandInHandler.requests.values())
+
+    second = checker_for(tmp_path, clock=lambda: now[0])
+    cached = second.check_urls(urls)
+    assert all(result.from_cache for result in cached.values())
+    assert cached[urls[1]].status == BROKEN
+    assert second.stats["cached"] == 2
+    assert sum(StandInHandler.requests.values()) == requests
+
+    # Broken verdicts are kept for a day, working links for a week.
+    now[0] += 2 * 24 * 60 * 60
+    rechecked = second.check_urls(urls)
+    second.close()
+    assert rechecked[urls[0]].from_cache
+    assert not rechecked[urls[1]].from_cache
+
+
+def test_check_session_links_updates_sources(site, tmp_path):
+    state = ResearchState(str(tmp_path))
+    state.create_session("Link check")
+    state.add_sources(
+        [
+            {"id": "src_ok", "url": f"{site}/ok/3", "title": "Working"},
+            {"id": "src_gone", "url": f"{site}/missing/3", "title": "Gone"},
+            {"id": "src_moved", "url": f"{site}/moved/3", "title": "Moved"},
+        ]
+    )
+
+    report = check_session_links(state, requests_per_second=0, timeout=0.3)
+
+    assert report["broken"] == ["src_gone"]
+    assert report["by_status"] == {OK: 2, BROKEN: 1}
+    assert state.get_source("src_ok")["link_status"] == OK
+    assert state.get_source("src_gone")["link_http_status"] == 404
+    assert state.get_source("src_moved")["link_final_url"] == f"{site}/ok/3"
+    state.close()
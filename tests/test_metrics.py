@@ -0,0 +1,36 @@
+from fetch_cache import FetchCache
+from orchestrator import ResearchOrchestrator, ResearchState
+
+
+def fetcher(url):
+    return f"<html>{url}</html>".encode("utf-8"), "text/html"
+
+
+def test_fetch_cache_counters_reach_metrics_and_prometheus(tmp_path):
+    state = ResearchState(str(tmp_path))
+    session_id = state.create_session("Fetch metrics")
+    for run in range(2):
+        cache = FetchCache(tmp_path, fetcher=fetcher)
+        cache.fetch("https://example.com/a")
+        cache.fetch("https://example.com/b")
+        cache.fetch("https://example.com/a")
+        state.record_fetch_metric(cache.session_stats)
+        cache.close()
+
+    fetch = state.metrics_summary()["fetch"]
+    assert fetch["fetches"] == 2
+    assert fetch["hits"] == 4
+    assert fetch["misses"] == 2
+    assert fetch["bytes_fetched"] == 2 * len(fetcher("https://example.com/a")[0])
+    assert fetch["hit_rate"] == round(4 / 6, 3)
+
+    text = ResearchOrchestrator(str(tmp_path)).get_metrics(session_id, True)
+    labels = f'session="{session_id}"'
+    lookups = "deep_research_fetch_cache_lookups_total"
+    assert f"deep_research_fetches_total{{{labels}}} 2" in text
+    assert f'{lookups}{{{labels},result="hit"}} 4' in text
+    assert f'{lookups}{{{labels},result="miss"}} 2' in text
+
+    state.mark_completed()
+    readme = (state.session_path / "README.md").read_text()
+    assert "| Fetches | 2 network, 4 cache hits / 2 misses (67% hit rate) |" in readme
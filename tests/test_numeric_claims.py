@@ -0,0 +1,56 @@
+from numeric_claims import extract_from_text, find_source_contradictions
+
+
+def contradiction(text_a, text_b):
+    sources = [
+        {"id": "src_a", "claims": [text_a]},
+        {"id": "src_b", "claims": [text_b]},
+    ]
+    return find_source_contradictions(sources)
+
+
+def test_market_value_wording_does_not_change_the_metric():
+    found = contradiction(
+        "The AI agents market was valued at $5.1 billion in 2024.",
+        "The AI agents market reached $7.9 billion in 2024.",
+    )
+    assert len(found) == 1
+    assert found[0]["entity"] == "ai agent"
+    assert found[0]["metric"] == "market_size"
+
+
+def test_company_valuation_keeps_its_metric():
+    (claim,) = extract_from_text("Anthropic was valued at $61.5 billion.", "s")
+    assert (claim.entity, claim.metric) == ("anthropic", "valuation")
+
+
+def test_verb_is_not_part_of_the_entity():
+    found = contradiction(
+        "GitHub Copilot had 1.3M subscribers in 2024.",
+        "GitHub Copilot reached 1.8M subscribers in 2024.",
+    )
+    assert len(found) == 1
+    assert found[0]["entity"] == "github copilot"
+
+
+def test_metric_keyword_subject_is_the_entity():
+    text = "The market will grow at a CAGR of 25.2% from 2023 to 2030."
+    (claim,) = extract_from_text(text, "s")
+    assert claim.entity == "market"
+    assert claim.metric == "growth_rate"
+    assert (claim.value, claim.unit, claim.year) == (25.2, "%", 2023)
+
+
+def test_numbers_in_names_are_not_values():
+    found = contradiction(
+        "Windows 11 market share is 30% in 2024.",
+        "Windows 10 market share is 60% in 2024.",
+    )
+    assert found == []
+
+    (claim,) = extract_from_text("Windows 11 market share is 30% in 2024.", "s")
+    assert (claim.entity, claim.metric) == ("windows-11", "market_share")
+    assert claim.value == 30
+    (claim,) = extract_from_text("COVID-19 cases reached 5 million in 2024.", "s")
+    assert claim.entity == "covid-19 case"
+    assert (claim.value, claim.unit) == (5e6, "count")
@@ -0,0 +1,36 @@
+from output_builder import OutputBuilder, OutputSpec
+
+
+def make_builder(tmp_path):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "section.md").write_text("# {TITLE}\n\n{DRAFT_02_MARKET_SIZE}\n")
+    session = tmp_path / "session"
+    (session / "artifacts/drafts").mkdir(parents=True)
+    return OutputBuilder(session, templates_dir=templates, max_workers=2), session
+
+
+def test_unchanged_outputs_are_skipped_and_drafts_rendered(tmp_path):
+    builder, session = make_builder(tmp_path)
+    draft = session / "artifacts/drafts/02_market-size.md"
+    draft.write_text("The market is large.")
+    spec = OutputSpec(
+        path="outputs/02_market.md",
+        template="section.md",
+        values={"TITLE": "Market"},
+        drafts=["artifacts/drafts/02_market-size.md"],
+    )
+    output = session / spec.path
+
+    assert builder.build([spec])["built"] == 1
+    assert output.read_text() == "# Market\n\nThe market is large.\n"
+    assert builder.build([spec])["skipped"] == 1
+
+    draft.write_text("The market is small.")
+    assert builder.build([spec])["built"] == 1
+    assert output.read_text() == "# Market\n\nThe market is small.\n"
+
+    spec.values["TITLE"] = "Market size"
+    assert builder.build([spec])["built"] == 1
+    assert builder.build([spec], force=True)["built"] == 1
+    assert builder.build([spec])["skipped"] == 1
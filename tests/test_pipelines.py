@@ -0,0 +1,95 @@
+import json
+
+from batch_runner import spec_plan
+from orchestrator import ResearchState
+from pipelines import (
+    QueryRegistry,
+    SearchQuery,
+    create_agent_tasks,
+    normalize_query,
+    plan_queries,
+)
+from scheduler import AgentExecutor, AgentScheduler
+
+
+def test_planned_then_searched_queries_are_counted_once():
+    registry = QueryRegistry()
+    registry.register_plan(
+        {
+            "Pricing": ["AI agent pricing 2025"],
+            "Market": ["pricing of AI agents"],
+        }
+    )
+    calls = []
+
+    def search_fn(query):
+        calls.append(query.query)
+        return [f"result for {query.query}"]
+
+    first = registry.search(SearchQuery("AI agent pricing 2025", "Pricing"), search_fn)
+    second = registry.search(SearchQuery("pricing of AI agents", "Market"), search_fn)
+
+    assert first == second and len(calls) == 1
+    assert registry.stats == {"requested": 2, "searches_run": 1, "searches_saved": 1}
+    assert registry.report()["shared_queries"] == [
+        {"query": "AI agent pricing 2025", "subtopics": ["Pricing", "Market"]}
+    ]
+
+
+def test_unplanned_duplicate_search_is_saved():
+    def search_fn(query):
+        return [query.query]
+
+    registry = QueryRegistry()
+    registry.search(SearchQuery("RAG evaluation", "Quality"), search_fn)
+    registry.search(SearchQuery("rag evaluation", "Quality"), search_fn)
+    registry.search(SearchQuery("evaluation of RAG", "Tooling"), search_fn)
+    assert registry.stats == {"requested": 3, "searches_run": 1, "searches_saved": 2}
+
+
+def test_spec_plan_ranks_subtopics_in_question_order():
+    spec = {"questions": {"secondary": ["Who adopts agents?", "What do they cost?"]}}
+    queries = plan_queries(spec_plan(spec))
+    assert [(q.subtopic, q.priority) for q in queries] == [
+        ("Who adopts agents?", 1),
+        ("What do they cost?", 2),
+    ]
+
+
+def test_question_words_are_kept():
+    assert normalize_query("why RAG fails") != normalize_query("how RAG fails")
+    assert normalize_query("What is RAG") == normalize_query("what RAG")
+
+
+class SearchingExecutor(AgentExecutor):
+    def __init__(self):
+        self.searches = []
+
+    async def run(self, task):
+        results = self.search(task, f"{task.subtopic} adoption", self.search_fn)
+        return "\n".join(results)
+
+    def search_fn(self, query):
+        self.searches.append(query.query)
+        return [f"https://example.com/{len(self.searches)}"]
+
+
+def test_agents_share_searches_through_the_session(tmp_path):
+    state = ResearchState(str(tmp_path))
+    state.create_session("Search dedup")
+    state.set_plan(
+        {"subtopics": ["Agents"], "search_queries": {"Agents": ["Agents adoption"]}}
+    )
+    executor = SearchingExecutor()
+    tasks = create_agent_tasks(["Agents"], "Search dedup")[:3]
+
+    results = AgentScheduler(executor, state=state).run_sync(tasks)
+
+    assert len(executor.searches) == 1
+    assert {r.output for r in results} == {"https://example.com/1"}
+    report = json.loads(
+        (state.session_path / "artifacts/search_queries.json").read_text()
+    )
+    assert report["requested"] == 3
+    assert report["searches_run"] == 1
+    assert report["searches_saved"] == 2
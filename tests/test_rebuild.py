@@ -0,0 +1,67 @@
+from orchestrator import ResearchState
+
+CLAIM = {"claim": "Costs fell", "sources": ["src_001"]}
+
+
+def source(i, subtopic, **fields):
+    return {
+        "id": f"src_{i:03d}",
+        "url": f"https://example.com/{subtopic}/{i}",
+        "title": f"Source {i}",
+        "subtopic": subtopic,
+        **fields,
+    }
+
+
+def make_state(tmp_path):
+    state = ResearchState(str(tmp_path))
+    state.create_session("Incremental rebuild")
+    state.add_sources([source(1, "cost"), source(2, "cost"), source(3, "use")])
+    state.record_draft_inputs("a.md", ["src_001", "src_002"], [CLAIM], "cost")
+    state.record_draft_inputs("b.md", ["src_003"], subtopic="use")
+    state.record_output_inputs("report.md", ["a.md"])
+    state.record_output_inputs("site.html", ["b.md"])
+    return state
+
+
+def reasons(plan, kind):
+    key = "draft" if kind == "drafts" else "output"
+    return {item[key]: item["reasons"] for item in plan[kind]}
+
+
+def test_source_edits_make_drafts_and_their_outputs_stale(tmp_path):
+    state = make_state(tmp_path)
+    assert state.plan_rebuild([CLAIM]) == {"drafts": [], "outputs": []}
+
+    # A new URL, so this is an update of src_001 rather than a merged duplicate.
+    state.add_source(source(1, "cost", url="https://example.com/moved"))
+    state.remove_sources(["src_002"])
+    state.add_source(source(4, "cost"))
+    plan = state.plan_rebuild()
+
+    assert reasons(plan, "drafts") == {
+        "a.md": [
+            "source_changed:src_001",
+            "source_removed:src_002",
+            "source_added:src_004",
+        ]
+    }
+    assert reasons(plan, "outputs") == {"report.md": ["draft_stale:a.md"]}
+    state.close()
+
+
+def test_rebuilt_drafts_and_changed_claims(tmp_path):
+    state = make_state(tmp_path)
+
+    plan = state.plan_rebuild([{"claim": "Costs rose", "sources": ["src_001"]}])
+    assert reasons(plan, "drafts") == {"a.md": ["claims_changed"]}
+    extra = {"claim": "Costs vary", "sources": ["src_002"]}
+    plan = state.plan_rebuild([CLAIM, extra])
+    assert reasons(plan, "drafts") == {"a.md": ["claims_added"]}
+
+    state.record_draft_inputs("b.md", ["src_003", "src_002"], subtopic="use")
+    assert state.plan_rebuild() == {
+        "drafts": [],
+        "outputs": [{"output": "site.html", "reasons": ["draft_rebuilt:b.md"]}],
+    }
+    state.close()
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from orchestrator import JOURNAL_FILE, STATE_FILE, ResearchState
+from pipelines import PipelineConfig, create_agent_tasks, plan_queries, task_key
+from scheduler import AgentExecutor, AgentScheduler, FakeExecutor, TaskOutcome
+
+TASKS = create_agent_tasks(["Agents", "Pricing"], "Scheduler tests")
+
+
+def config(**overrides) -> PipelineConfig:
+    return PipelineConfig(
+        **{"max_parallel_agents": 3, "retry_backoff_seconds": 0, **overrides}
+    )
+
+
+def test_agent_executor_requires_run():
+    with pytest.raises(TypeError):
+        AgentExecutor()
+
+
+def test_failed_attempts_are_retried():
+    flaky, broken = TASKS[0].description, TASKS[1].description
+    executor = FakeExecutor(delay_seconds=0, failures={flaky: 2, broken: 5})
+
+    results = AgentScheduler(executor, config(max_agent_attempts=3)).run_sync(TASKS)
+
+    by_task = {r.task.description: r for r in results}
+    assert by_task[flaky].outcome == TaskOutcome.COMPLETED
+    assert by_task[flaky].attempts == 3
+    assert by_task[broken].outcome == TaskOutcome.FAILED
+    assert by_task[broken].attempts == 3
+    assert by_task[broken].error == f"Simulated failure for {broken}"
+    assert executor.calls.count(flaky) == 3
+    assert all(r.attempts == 1 for r in results[2:])
+
+
+def test_slow_attempts_time_out():
+    slow = TASKS[0].description
+    executor = FakeExecutor(delay_seconds=0, delays={slow: 5})
+    scheduler = AgentScheduler(
+        executor, config(search_timeout_seconds=0.05, max_agent_attempts=2)
+    )
+
+    results = scheduler.run_sync(TASKS[:2])
+
+    assert results[0].outcome == TaskOutcome.TIMED_OUT
+    assert results[0].attempts == 2
+    assert results[0].error == "Timed out after 0.05s"
+    assert results[1].outcome == TaskOutcome.COMPLETED
+
+
+def test_resume_skips_tasks_completed_in_an_earlier_run(tmp_path):
+    state = ResearchState(str(tmp_path))
+    session_id = state.create_session("Scheduler resume")
+    broken = TASKS[2].description
+    first = FakeExecutor(delay_seconds=0, failures={broken: 1})
+    AgentScheduler(first, config(max_agent_attempts=1), state).run_sync(TASKS)
+    assert state.task_progress()["failed"] == 1
+
+    resumed = ResearchState(str(tmp_path))
+    resumed.load_session(session_id)
+    second = FakeExecutor(delay_seconds=0)
+    # A resumed run may list the tasks in another order.
+    tasks = list(reversed(TASKS))
+    results = AgentScheduler(second, config(), resumed).run_sync(tasks)
+
+    assert second.calls == [broken]
+    skipped = [r for r in results if r.outcome == TaskOutcome.SKIPPED]
+    assert len(skipped) == len(TASKS) - 1
+    assert resumed.task_progress() == {"total": len(TASKS), "completed": len(TASKS)}
+
+    folder = resumed.session_path / "artifacts/agent_results"
+    assert len(list(folder.iterdir())) == len(TASKS)
+    for result in results:
+        assert result.artifact.endswith(f"_{task_key(result.task)}.json")
+    retried = next(r for r in results if r.task.description == broken)
+    artifact = json.loads((resumed.session_path / retried.artifact).read_text())
+    assert artifact["outcome"] == "completed"
+
+
+def test_cancelling_the_run_stops_every_lane():
+    tasks = create_agent_tasks([f"Subtopic {i}" for i in range(3)], "Cancel")[:10]
+    executor = FakeExecutor(delay_seconds=0.1)
+    scheduler = AgentScheduler(executor, config(max_parallel_agents=2))
+
+    async def cancel_early():
+        run = asyncio.ensure_future(scheduler.run(tasks))
+        await asyncio.sleep(0.15)
+        run.cancel()
+        started = time.perf_counter()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        return time.perf_counter() - started
+
+    assert asyncio.run(cancel_early()) < 0.05
+    assert len(executor.calls) <= 4
+
+
+def test_higher_priority_subtopics_start_first():
+    plan = {
+        "subtopics": ["Background", "Pricing"],
+        "search_queries": {"Background": ["history"], "Pricing": ["price lists"]},
+        "priorities": {"Background": 2, "Pricing": 1},
+    }
+    tasks = create_agent_tasks(plan["subtopics"], "Priorities", plan_queries(plan))
+    executor = FakeExecutor(delay_seconds=0)
+
+    AgentScheduler(executor, config(max_parallel_agents=1)).run_sync(tasks)
+
+    subtopic_of = {task.description: task.subtopic for task in tasks}
+    order = [subtopic_of[description] for description in executor.calls]
+    assert order == ["Pricing"] * 3 + ["Background"] * 3 + ["future"]
+
+
+def test_checkpoints_hold_no_prompts_and_resume_from_the_plan(tmp_path):
+    state = ResearchState(str(tmp_path))
+    session_id = state.create_session("Checkpoint prompts")
+    plan = {"subtopics": ["Agents"], "search_queries": {"Agents": ["agent tools"]}}
+    state.set_plan(plan)
+    tasks = create_agent_tasks(
+        plan["subtopics"], "Checkpoint prompts", plan_queries(plan)
+    )
+    broken = tasks[1].description
+    executor = FakeExecutor(delay_seconds=0, failures={broken: 1})
+    AgentScheduler(executor, config(max_agent_attempts=1), state).run_sync(tasks)
+    state.close()
+
+    saved = (state.session_path / STATE_FILE).read_text()
+    saved += (state.session_path / JOURNAL_FILE).read_text()
+    assert all(task.prompt not in saved for task in tasks)
+    assert all(task.description in saved for task in tasks)
+
+    resumed = ResearchState(str(tmp_path))
+    resumed.load_session(session_id)
+    assert resumed.incomplete_tasks() == [tasks[1]]
+    assert resumed.incomplete_tasks(reversed(tasks)) == [tasks[1]]
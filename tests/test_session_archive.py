@@ -0,0 +1,61 @@
+import zipfile
+
+from orchestrator import ResearchState
+from session_archive import SessionArchive, archive_path
+
+
+def make_source(i):
+    return {
+        "id": f"src_{i:03d}",
+        "url": f"https://example.com/article/{i}",
+        "title": f"Source {i}",
+        "quality_rating": "B",
+    }
+
+
+def make_archived_session(base_path):
+    state = ResearchState(str(base_path))
+    session_id = state.create_session("Archive round trip")
+    state.add_sources(make_source(i) for i in range(20))
+    state.mark_completed()
+    state.archive()
+    return state, session_id
+
+
+def test_archive_keeps_empty_session_folders(tmp_path):
+    _, session_id = make_archived_session(tmp_path)
+
+    with zipfile.ZipFile(archive_path(tmp_path, session_id)) as zf:
+        names = set(zf.namelist())
+    assert {"outputs/01_full_report/", "website/", "artifacts/drafts/"} <= names
+
+    archive = SessionArchive(archive_path(tmp_path, session_id))
+    assert "" not in archive.names("outputs/")
+    archive.close()
+
+
+def test_save_output_after_unarchive(tmp_path):
+    state, session_id = make_archived_session(tmp_path)
+    assert state.archived
+
+    state.unarchive()
+    assert (state.session_path / "outputs/01_full_report").is_dir()
+    assert (state.session_path / "website").is_dir()
+
+    state.save_output("00_executive_summary.md", "# Summary\n")
+    state.save_output("report.md", "# Report\n", subfolder="01_full_report")
+    outputs = state.session_path / "outputs"
+    assert (outputs / "00_executive_summary.md").read_text() == "# Summary\n"
+    assert (outputs / "01_full_report/report.md").read_text() == "# Report\n"
+    assert state.get_source("src_007")["title"] == "Source 7"
+    assert sum(1 for _ in state.iter_sources()) == 20
+
+
+def test_close_keeps_the_archived_session_readable(tmp_path):
+    state, _ = make_archived_session(tmp_path)
+    assert state.get_source("src_003")["title"] == "Source 3"
+
+    state.close()
+    assert state.archived
+    assert state.get_source("src_004")["title"] == "Source 4"
+    state.close()
@@ -0,0 +1,33 @@
+from orchestrator import ResearchOrchestrator, ResearchState
+from session_catalog import CATALOG_FILE
+
+
+def make_pre_catalog_session(base_path, topic):
+    """A session as written before the catalog existed: no _catalog.db."""
+    state = ResearchState(str(base_path))
+    session_id = state.create_session(topic)
+    state.catalog.close()
+    (base_path / CATALOG_FILE).unlink()
+    for suffix in ("-wal", "-shm"):
+        (base_path / f"{CATALOG_FILE}{suffix}").unlink(missing_ok=True)
+    return session_id
+
+
+def test_new_session_does_not_hide_sessions_older_than_the_catalog(tmp_path):
+    old_id = make_pre_catalog_session(tmp_path, "Old session")
+
+    new_id = ResearchState(str(tmp_path)).create_session("New session")
+    listed = ResearchOrchestrator(str(tmp_path)).list_sessions()
+
+    assert {s["session_id"] for s in listed} == {old_id, new_id}
+
+
+def test_catalog_is_trusted_after_rebuild(tmp_path):
+    old_id = make_pre_catalog_session(tmp_path, "Old session")
+    orchestrator = ResearchOrchestrator(str(tmp_path))
+    assert [s["session_id"] for s in orchestrator.list_sessions()] == [old_id]
+    assert orchestrator.state_manager.catalog.is_complete()
+
+    new_id = ResearchState(str(tmp_path)).create_session("New session")
+    listed = orchestrator.list_sessions()
+    assert {s["session_id"] for s in listed} == {old_id, new_id}
@@ -0,0 +1,59 @@
+import json
+
+from source_log import INDEX_NAME, JSONL_NAME, SourceLog
+
+
+def write(log, *records):
+    writer = log.writer()
+    for record in records:
+        writer.write(record)
+    writer.close()
+
+
+def test_tombstones_and_updates_resolve_to_the_latest_line(tmp_path):
+    log = SourceLog(tmp_path)
+    write(log, {"id": "s1", "v": 1}, {"id": "s2", "v": 1}, {"id": "s3", "v": 1})
+    write(log, {"id": "s2", "v": 2}, {"id": "s1", "deleted": True})
+
+    assert log.get("s1") is None
+    assert log.get("s2") == {"id": "s2", "v": 2}
+    assert list(log.iter()) == [{"id": "s3", "v": 1}, {"id": "s2", "v": 2}]
+    assert list(log.iter(lambda s: s["id"] == "s3")) == [{"id": "s3", "v": 1}]
+    assert len(list(log.records())) == 5
+    assert len(log) == 3
+    log.close()
+
+
+def test_a_fresh_reader_seeks_through_the_index(tmp_path):
+    writer_log = SourceLog(tmp_path)
+    write(writer_log, *({"id": f"s{i}", "v": i} for i in range(50)))
+    write(writer_log, {"id": "s7", "v": "updated"})
+    lines = (tmp_path / INDEX_NAME).read_text().splitlines()
+    assert len(lines) == 51
+
+    reader = SourceLog(tmp_path)
+    assert reader.get("s7") == {"id": "s7", "v": "updated"}
+    assert reader.get("s49") == {"id": "s49", "v": 49}
+    assert reader.get("missing") is None
+
+    # A line appended without its index entry (an older session, or a crash
+    # between the two writes) is indexed on the next read.
+    with open(tmp_path / JSONL_NAME, "a") as f:
+        f.write(json.dumps({"id": "late", "v": 0}) + "\n")
+    assert reader.get("late") == {"id": "late", "v": 0}
+    assert len((tmp_path / INDEX_NAME).read_text().splitlines()) == 52
+    writer_log.close()
+    reader.close()
+
+
+def test_sealed_segments_stay_readable(tmp_path):
+    log = SourceLog(tmp_path, segment_bytes=200, codec="gzip")
+    for i in range(20):
+        write(log, {"id": f"s{i}", "text": "x" * 40})
+
+    assert len(log.segments()) > 2
+    assert any(path.suffix == ".gz" for path in tmp_path.iterdir())
+    assert log.get("s0") == {"id": "s0", "text": "x" * 40}
+    assert SourceLog(tmp_path).get("s1")["id"] == "s1"
+    assert [s["id"] for s in log.iter()] == [f"s{i}" for i in range(20)]
+    log.close()
@@ -0,0 +1,42 @@
+from source_store import SourceStore
+
+SOURCES = [
+    {"id": "s1", "quality_rating": "C", "domain": "a.com", "subtopic": "cost"},
+    {"id": "s2", "quality_rating": "A", "domain": "b.com", "type": "academic"},
+    {"id": "s3", "quality_rating": "B", "domain": "a.com", "subtopic": ["cost", "use"]},
+    {"id": "s4", "domain": "a.com", "subtopic": "cost"},
+    {"id": "s5", "quality_rating": "a", "domain": "a.com", "type": "academic"},
+    {"id": "s6", "quality_rating": "D", "domain": "b.com", "subtopic": "use"},
+]
+
+
+def ids(sources):
+    return [source["id"] for source in sources]
+
+
+def test_query_filters_and_orders_best_rated_first(tmp_path):
+    store = SourceStore(tmp_path / "sources.db")
+    store.upsert_many(SOURCES)
+
+    assert ids(store.query()) == ["s1", "s2", "s3", "s4", "s5", "s6"]
+    assert ids(store.query(min_quality="B")) == ["s2", "s5", "s3"]
+    assert ids(store.query(subtopic="cost")) == ["s3", "s1", "s4"]
+    assert ids(store.query(subtopic="cost", min_quality="C")) == ["s3", "s1"]
+    assert ids(store.query(domain="a.com", min_quality="C")) == ["s5", "s3", "s1"]
+    assert ids(store.query(source_type="academic", domain="b.com")) == ["s2"]
+    assert ids(store.query(min_quality="E", limit=2)) == ["s2", "s5"]
+    store.close()
+
+
+def test_upsert_moves_a_source_between_subtopics(tmp_path):
+    store = SourceStore(tmp_path / "sources.db")
+    store.upsert_many(SOURCES)
+
+    store.upsert_many([{"id": "s1", "quality_rating": "A", "subtopic": "use"}])
+
+    assert ids(store.query(subtopic="cost")) == ["s3", "s4"]
+    assert ids(store.query(subtopic="use", min_quality="B")) == ["s1", "s3"]
+    assert store.delete_many(["s1", "missing"]) == 1
+    assert store.get("s1") is None
+    assert store.count() == len(SOURCES) - 1
+    store.close()
@@ -0,0 +1,54 @@
+from source_store import SourceStore
+from source_table import Source, SourceTable
+
+SOURCES = [
+    {"id": "s1", "domain": "a.com", "quality_rating": "A", "subtopic": "cost"},
+    {"id": "s2", "domain": "a.com", "quality_rating": "c", "subtopic": ["cost", "use"]},
+    {"id": "s3", "domain": "b.com", "quality_rating": "B", "subtopic": "cost"},
+    {"id": "s4", "domain": "b.com", "type": "news", "subtopic": "use"},
+    {"id": "s5", "domain": "c.com", "quality_rating": "D", "subtopic": "use"},
+]
+
+
+def check_counts(table):
+    assert table.counts("domain") == {"a.com": 2, "b.com": 2, "c.com": 1}
+    assert table.subtopic_counts() == {"cost": 3, "use": 3}
+    assert table.subtopic_counts(min_quality="C") == {"cost": 3, "use": 1}
+    assert table.quality_report() == {
+        "A_rated": 1,
+        "B_rated": 1,
+        "C_rated": 1,
+        "D_rated": 1,
+        "E_rated": 0,
+        "unrated": 1,
+    }
+    assert table.domain_diversity()["use"] == {
+        "sources": 3,
+        "domains": 3,
+        "top_domain": "a.com",
+        "top_domain_share": 0.333,
+    }
+    assert table.domain_diversity()["cost"]["top_domain_share"] == 0.667
+
+
+def test_counts_from_dicts_and_source_records():
+    check_counts(SourceTable.from_sources(SOURCES))
+    check_counts(SourceTable.from_sources(Source.from_dict(s) for s in SOURCES))
+
+
+def test_counts_from_the_store_match(tmp_path):
+    store = SourceStore(tmp_path / "sources.db")
+    store.upsert_many(SOURCES)
+    table = SourceTable.from_store(store)
+    store.close()
+
+    check_counts(table)
+    assert list(table.rows())[3] == ("s4", "b.com", "news", "")
+
+
+def test_source_reads_like_its_dict():
+    source = Source.from_dict({**SOURCES[1], "score": 3})
+    assert source["subtopic"] == ("cost", "use")
+    assert source.get("title", "untitled") == "untitled"
+    assert "score" in source and "url" not in source
+    assert source.to_dict() == {**SOURCES[1], "score": 3}
@@ -0,0 +1,62 @@
+from tracing import TRACE_FILE, Tracer, critical_path
+
+T0 = 1_700_000_000.0
+
+
+def write_trace(session_path):
+    tracer = Tracer(session_path / TRACE_FILE)
+    phase = tracer.complete("phase_3", "phase", T0, T0 + 5, status="completed")
+    run = tracer.complete(
+        "agents",
+        "scheduler",
+        T0 + 0.5,
+        T0 + 4.5,
+        parent_id=phase,
+        max_parallel_agents=2,
+    )
+    # Lane 1 runs A then B; lane 2 runs C then D. B finishes last.
+    for name, lane, start, end in [
+        ("A", 1, 0.5, 1.5),
+        ("C", 2, 0.5, 2.5),
+        ("D", 2, 2.5, 3.5),
+        ("B", 1, 1.5, 4.5),
+    ]:
+        task = tracer.complete(
+            name,
+            "agent",
+            T0 + start,
+            T0 + end,
+            parent_id=run,
+            tid=lane,
+            subtopic=f"topic {name}",
+            outcome="completed",
+        )
+        if name == "B":
+            tracer.complete("fetch", "fetch", T0 + 2, T0 + 3, parent_id=task, tid=1)
+    with open(session_path / TRACE_FILE, "a") as f:
+        f.write('{"name": "torn", "ph": "X", "ts"')
+
+
+def test_critical_path_follows_the_lane_of_the_last_task(tmp_path):
+    write_trace(tmp_path / "session_1")
+
+    result = critical_path("session_1", str(tmp_path))
+
+    assert result["phases"] == [
+        {"name": "phase_3", "seconds": 5.0, "status": "completed"}
+    ]
+    (run,) = result["scheduler_runs"]
+    assert [t["name"] for t in run["critical_path"]] == ["A", "B"]
+    assert [t["start_offset"] for t in run["critical_path"]] == [0.0, 1.0]
+    assert run["critical_path"][1]["children"] == 1
+    assert run["critical_path_seconds"] == 4.0
+    assert run["critical_path_gaps_seconds"] == 0.0
+    assert (run["tasks"], run["wall_seconds"], run["busy_seconds"]) == (4, 4.0, 7.0)
+    assert run["achieved_parallelism"] == 1.75
+    assert (run["peak_concurrency"], run["utilization"]) == (2, 0.88)
+    assert "splitting subtopic 'topic B'" in run["hint"]
+
+
+def test_missing_trace_is_an_error(tmp_path):
+    result = critical_path("nope", str(tmp_path))
+    assert result["status"] == "error"
@@ -0,0 +1,76 @@
+import json
+import os
+import random
+import subprocess
+import sys
+
+from conftest import SCRIPTS
+from triangulation import triangulate
+
+SUBJECTS = ["GitHub Copilot", "AI code assistants", "Cursor", "Code review bots"]
+VERBS = ["improves", "speeds up", "reduces errors in", "changes"]
+OBJECTS = ["developer productivity", "code review time", "onboarding", "test writing"]
+TAILS = ["", " for large teams", " in enterprise settings", " according to surveys"]
+
+
+def make_sources(count: int = 400):
+    rng = random.Random(7)
+    sources = []
+    for i in range(count):
+        claims = [
+            f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} "
+            f"{rng.choice(OBJECTS)}{rng.choice(TAILS)}"
+            for _ in range(3)
+        ]
+        sources.append(
+            {"id": f"src_{i:04d}", "quality_rating": "ABCDE"[i % 5], "claims": claims}
+        )
+    return sources
+
+
+def run_with_seed(path, seed: str) -> str:
+    code = (
+        "import json, sys; sys.path.insert(0, sys.argv[1]);"
+        "from triangulation import triangulate;"
+        "print(json.dumps(triangulate(json.load(open(sys.argv[2])))))"
+    )
+    env = {**os.environ, "PYTHONHASHSEED": seed}
+    return subprocess.run(
+        [sys.executable, "-c", code, str(SCRIPTS), str(path)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def test_clusters_do_not_depend_on_hash_seed(tmp_path):
+    path = tmp_path / "sources.json"
+    path.write_text(json.dumps(make_sources()), encoding="utf-8")
+    outputs = {run_with_seed(path, seed) for seed in ("1", "2", "3", "4")}
+    assert len(outputs) == 1
+
+
+def test_paraphrases_from_two_sources_are_verified():
+    result = triangulate(
+        [
+            {
+                "id": "a",
+                "quality_rating": "A",
+                "claims": ["Copilot improves developer productivity"],
+            },
+            {
+                "id": "b",
+                "quality_rating": "C",
+                "claims": ["Copilot improves productivity of developers"],
+            },
+        ]
+    )
+    assert [c["sources"] for c in result["verified_claims"]] == [["a", "b"]]
+    assert result["single_source_claims"] == []
+
+
+def test_unrated_sources_are_reported_as_unrated():
+    result = triangulate([{"id": "a", "claims": []}, {"id": "b", "quality_rating": ""}])
+    assert result["source_quality_report"]["unrated"] == 2
+    assert "_rated" not in result["source_quality_report"]